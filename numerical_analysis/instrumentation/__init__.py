@@ -0,0 +1,6 @@
+from numerical_analysis.instrumentation.solver_trace import (
+    SolverTrace,
+    SolverCounters,
+    solver_counters,
+    TracedSolver,
+)
@@ -0,0 +1,167 @@
+import time
+import functools
+import numpy as np
+
+from typing import Callable, List, Optional
+
+
+class SolverCounters:
+    """
+    Totals per solver class over every traced run, meant to be scraped after
+    a batch: runs, non converged runs, iterations, wall time and function
+    evaluations by name.
+    """
+
+    def __init__(self):
+        self._counters = {}
+
+    def add(self, solver, iterations, wall_time, evaluations, converged):
+        counters = self._counters.setdefault(
+            solver,
+            {"runs": 0, "not_converged": 0, "iterations": 0, "wall_time": 0.0, "evaluations": {}},
+        )
+        counters["runs"] += 1
+        counters["not_converged"] += int(not converged)
+        counters["iterations"] += iterations
+        counters["wall_time"] += wall_time
+        for name, count in evaluations.items():
+            counters["evaluations"][name] = counters["evaluations"].get(name, 0) + count
+
+    def snapshot(self):
+        return {
+            solver: dict(counters, evaluations=dict(counters["evaluations"]))
+            for solver, counters in self._counters.items()
+        }
+
+    def reset(self):
+        self._counters.clear()
+
+
+solver_counters = SolverCounters()
+
+
+class SolverTrace:
+    """
+    Per-run record of an iterative solver: the value of its stopping test
+    (residual) and the wall time of every iteration, kept in arrays allocated
+    once for max_iter entries and reused by later runs, plus function
+    evaluation counts. callbacks are called as callback(solver, iteration,
+    residual) after every iteration.
+    """
+
+    def __init__(
+        self,
+        callbacks: Optional[List[Callable]] = None,
+        counters: Optional[SolverCounters] = solver_counters,
+    ):
+        self._callbacks = callbacks if callbacks is not None else []
+        self._counters = counters
+        self._residuals = np.empty(0)
+        self._times = np.empty(0)
+        self._solver = None
+        self._iterations = 0
+        self._evaluations = {}
+        self._converged = None
+
+    @property
+    def solver(self):
+        return self._solver
+
+    @property
+    def iterations(self):
+        return self._iterations
+
+    @property
+    def residuals(self):
+        return self._residuals[: self._iterations]
+
+    @property
+    def iteration_times(self):
+        return self._times[: self._iterations]
+
+    @property
+    def wall_time(self):
+        return self.iteration_times.sum()
+
+    @property
+    def evaluations(self):
+        return dict(self._evaluations)
+
+    @property
+    def function_evaluations(self):
+        return sum(self._evaluations.values())
+
+    @property
+    def converged(self):
+        return self._converged
+
+    def start(self, solver, max_iter):
+        if self._residuals.size < max_iter:
+            self._residuals = np.empty(max_iter)
+            self._times = np.empty(max_iter)
+
+        self._solver = solver
+        self._iterations = 0
+        self._evaluations = {}
+        self._converged = None
+        self._last_time = time.perf_counter()
+
+    def record(self, residual):
+        now = time.perf_counter()
+        i = self._iterations
+        # Blocks of right-hand sides record their worst active column.
+        self._residuals[i] = np.max(residual)
+        self._times[i] = now - self._last_time
+        self._iterations = i + 1
+        self._last_time = now
+
+        for callback in self._callbacks:
+            callback(self._solver, self._iterations, self._residuals[i])
+
+    def count(self, name, evaluations=1):
+        self._evaluations[name] = self._evaluations.get(name, 0) + evaluations
+
+    def counted(self, name, function: Callable):
+        @functools.wraps(function)
+        def _counted(*args, **kwargs):
+            self.count(name)
+            return function(*args, **kwargs)
+
+        return _counted
+
+    def finish(self, converged):
+        self._converged = converged
+
+        if self._counters is not None:
+            self._counters.add(
+                self._solver, self._iterations, self.wall_time, self._evaluations, converged
+            )
+
+
+class TracedSolver:
+    """
+    Tracing hooks shared by the iterative solvers, each one a no-op when the
+    solver was built without a trace.
+    """
+
+    @property
+    def trace(self):
+        return self._trace
+
+    def _counted(self, name, function: Callable):
+        if self._trace is None:
+            return function
+
+        return self._trace.counted(name, function)
+
+    def _start_trace(self):
+        if self._trace is not None:
+            self._trace.start(type(self).__name__, self._max_iter)
+
+    def _record_trace(self, residual):
+        if self._trace is not None:
+            self._trace.record(residual)
+
+    def _finish_trace(self, iterations, failed=False):
+        if self._trace is not None:
+            self._trace.finish(converged=iterations < self._max_iter and not failed)
@@ -5,6 +5,7 @@ from numerical_analysis.pde.pde_equations import (
     BSMStochasticVol,
 )
 from numerical_analysis.pde.finit_difference import (
+    FactorizationCache,
     FinitDifference,
     FTCS,
     BTCS,
@@ -1,23 +1,80 @@
 import sys
 import numpy as np
 
+from collections import OrderedDict
 from typing import Callable, Optional
 from abc import abstractmethod
 
 from numerical_analysis.pde.pde_equations import PDE
 from numerical_analysis.systems_of_equations.linear_systems import SOR
+from numerical_analysis.systems_of_equations.sparse_matrix import CSRMatrix
+from numerical_analysis.systems_of_equations.direct_systems import (
+    Thomas,
+    tridiagonal_solver,
+)
+
+
+class FactorizationCache:
+    def __init__(self, maxsize: int = 32):
+        self._maxsize = maxsize
+        self._factorizations = OrderedDict()
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._factorizations)
+
+    def __contains__(self, key):
+        return key in self._factorizations
+
+    def get(self, key):
+        if key not in self._factorizations:
+            return None
+
+        self._factorizations.move_to_end(key)
+        return self._factorizations[key]
+
+    def put(self, key, factorization):
+        self._factorizations[key] = factorization
+        self._factorizations.move_to_end(key)
+
+        while len(self._factorizations) > self._maxsize:
+            self._factorizations.popitem(last=False)
+
+    def clear(self):
+        self._factorizations.clear()
 
 
 class FinitDifference:
+    factorization_cache = FactorizationCache(maxsize=32)
+
     def __init__(
-        self, pde: PDE, alpha: Callable, beta: Callable, gamma: Callable
+        self,
+        pde: PDE,
+        alpha: Callable,
+        beta: Callable,
+        gamma: Callable,
+        solver: str = "banded",
+        time_dependent: Optional[bool] = None,
     ):
         self._pde = pde
         self._alpha = alpha
         self._beta = beta
         self._gamma = gamma
+        self._solver = solver
         self._grid = self.create_grid()
         self._x_range = np.arange(0, self._pde.max_x + self._pde.dx, self._pde.dx)
+        # None: unknown, the matrix is rebuilt every step and its
+        # factorization looked up in the cache (keyed by its diagonals, so
+        # constant coefficients are factorized once). False skips the
+        # rebuild, True the cache.
+        self._time_dependent = time_dependent
+        self._A_solver = None
+
+        if solver not in ("banded", "sor"):
+            sys.exit("The solver should be 'banded' or 'sor'")
 
     @property
     def pde(self):
@@ -35,6 +92,14 @@ class FinitDifference:
     def gamma(self):
         return self._gamma
 
+    @property
+    def solver(self):
+        return self._solver
+
+    @property
+    def time_dependent(self):
+        return self._time_dependent
+
     @property
     def grid(self):
         return self._grid
@@ -67,6 +132,31 @@ class FinitDifference:
 
         return grid
 
+    def _factorized_solver(self, lower, diag, upper):
+        lower, diag, upper = (np.asarray(d, dtype=float) for d in (lower, diag, upper))
+        key = (
+            type(self).__name__,
+            self._pde.dx,
+            self._pde.dt,
+            lower.tobytes(),
+            diag.tobytes(),
+            upper.tobytes(),
+        )
+        solver = self.factorization_cache.get(key)
+
+        if solver is None:
+            solver = tridiagonal_solver(lower, diag, upper)
+            solver.factorize()
+            self.factorization_cache.put(key, solver)
+
+        return solver
+
+    def _constant_solver(self, x_steps, diagonals: Callable):
+        if self._A_solver is None or self._A_solver.shape[0] != x_steps - 1:
+            self._A_solver = self._factorized_solver(*diagonals())
+
+        return self._A_solver
+
     def index_grid(self, t: Optional[int] = None, x: Optional[int] = None):
         time_range = np.arange(0, self._pde.max_time + self._pde.dt, self._pde.dt)
 
@@ -109,41 +199,82 @@ class BTCS(FinitDifference):
     def iterate(self, grid, i, omega=1.5):
         x_steps = grid.shape[1] - 1
         x0 = grid[i - 1, 1:x_steps]
-        grid[i, 1:x_steps] = SOR(
-            mat=self._A_matrix(x_steps, self._x_range, i), b=x0, omega=omega,
-        ).solve(x0)
+
+        if self._solver == "sor":
+            grid[i, 1:x_steps] = SOR(
+                mat=self._A_matrix(x_steps, self._x_range, i), b=x0, omega=omega,
+            ).solve(x0)
+        elif self._time_dependent is None:
+            grid[i, 1:x_steps] = self._factorized_solver(
+                *self._A_diagonals(x_steps, self._x_range, i)
+            ).solve(x0)
+        elif self._time_dependent:
+            grid[i, 1:x_steps] = tridiagonal_solver(
+                *self._A_diagonals(x_steps, self._x_range, i)
+            ).solve(x0)
+        else:
+            grid[i, 1:x_steps] = self._constant_solver(
+                x_steps, lambda: self._A_diagonals(x_steps, self._x_range, i)
+            ).solve(x0)
 
         return grid[i, :]
 
     def _A_matrix(self, x_steps, x, i):
-        diag = np.diag(self._beta(x, i)[1: x_steps+1])
-        upper_offdiag = np.diag(self._gamma(x, i),1)[1:x_steps+1,1:x_steps+1]
-        lower_offdiag = np.diag(self._alpha(x, i)[1:],-1)[1:,1:]
-        
-        return (diag + upper_offdiag + lower_offdiag)[:(x_steps-1), :(x_steps-1)]
+        lower, diag, upper = self._A_diagonals(x_steps, x, i)
+
+        return CSRMatrix.from_diagonals([lower, diag, upper], [-1, 0, 1], x_steps - 1)
+
+    def _A_diagonals(self, x_steps, x, i):
+        return (
+            self._alpha(x, i)[2:x_steps],
+            self._beta(x, i)[1:x_steps],
+            self._gamma(x, i)[1 : x_steps - 1],
+        )
 
 
 class CrankNicolson(FinitDifference):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._B_solver = None
 
     def iterate(self, grid, i, omega=1.5):
         x_steps = grid.shape[1] - 1
-        b = self._B_matrix(x_steps).dot(grid[i - 1, 1:x_steps])
-        grid[i, 1:x_steps] = SOR(mat=self._A_matrix(x_steps), b=b, omega=omega).solve(b)
+
+        if self._solver == "sor":
+            b = self._B_matrix(x_steps).dot(grid[i - 1, 1:x_steps])
+            grid[i, 1:x_steps] = SOR(mat=self._A_matrix(x_steps), b=b, omega=omega).solve(b)
+        else:
+            # alpha, beta and gamma are constants, so A is factorized once
+            # (or taken from the cache) and B is built once per grid size.
+            if self._B_solver is None or self._B_solver.shape[0] != x_steps - 1:
+                self._B_solver = Thomas(*self._B_diagonals(x_steps))
+            b = self._B_solver.dot(grid[i - 1, 1:x_steps])
+            grid[i, 1:x_steps] = self._constant_solver(
+                x_steps, lambda: self._A_diagonals(x_steps)
+            ).solve(b)
 
         return grid[i, :]
 
+    def _A_diagonals(self, x_steps):
+        return (
+            np.repeat(-self._alpha / 2, x_steps - 2),
+            np.repeat(1 + self._beta, x_steps - 1),
+            np.repeat(-self._gamma / 2, x_steps - 2),
+        )
+
+    def _B_diagonals(self, x_steps):
+        return (
+            np.repeat(self._alpha / 2, x_steps - 2),
+            np.repeat(1 - self._beta, x_steps - 1),
+            np.repeat(self._gamma / 2, x_steps - 2),
+        )
+
     def _A_matrix(self, x_steps):
-        diag = np.diag(np.repeat(1 + self._beta, x_steps - 1))
-        upper_offdiag = np.diag(np.repeat(-self._gamma / 2, x_steps - 2), 1)
-        lower_offdiag = np.diag(np.repeat(-self._alpha / 2, x_steps - 2), -1)
+        lower, diag, upper = self._A_diagonals(x_steps)
 
-        return diag + upper_offdiag + lower_offdiag
+        return CSRMatrix.from_diagonals([lower, diag, upper], [-1, 0, 1], x_steps - 1)
 
     def _B_matrix(self, x_steps):
-        diag = np.diag(np.repeat(1 - self._beta, x_steps - 1))
-        upper_offdiag = np.diag(np.repeat(self._gamma / 2, x_steps - 2), 1)
-        lower_offdiag = np.diag(np.repeat(self._alpha / 2, x_steps - 2), -1)
+        lower, diag, upper = self._B_diagonals(x_steps)
 
-        return diag + upper_offdiag + lower_offdiag
+        return CSRMatrix.from_diagonals([lower, diag, upper], [-1, 0, 1], x_steps - 1)
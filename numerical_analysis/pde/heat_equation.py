@@ -15,6 +15,7 @@ class HeatEquationFTCS(FTCS):
 class HeatEquationBTCS(BTCS):
     def __init__(self, *args, **kwargs):
         self._pde = kwargs["pde"]
+        kwargs.setdefault("time_dependent", False)
         super().__init__(
             alpha=self.pde_lamba, beta=self.pde_beta, gamma=self.pde_lamba, *args, **kwargs
         )
@@ -1,3 +1,29 @@
-from numerical_analysis.sde.sde_equations import SDE, GBM, GBMStochasticVol
+from numerical_analysis.sde.sde_equations import SDE, GBM, GBMStochasticVol, CorrelatedGBM, Heston
 
-from numerical_analysis.sde.numerical_sde import EulerMaruyamaScheme, MilsteinScheme
+from numerical_analysis.sde.numerical_sde import (
+    EulerMaruyamaScheme,
+    MilsteinScheme,
+    DerivativeFreeMilsteinScheme,
+    PlatenWeakScheme,
+    RosslerSRKScheme,
+    AdaptiveMilsteinScheme,
+)
+from numerical_analysis.sde.path_reducers import (
+    PathReducer,
+    TerminalValue,
+    RunningMax,
+    RunningMin,
+    RunningMean,
+    BarrierHit,
+)
+from numerical_analysis.sde.running_moments import RunningMoments
+from numerical_analysis.sde.parallel_monte_carlo import ParallelMonteCarlo
+from numerical_analysis.sde.brownian_increments import BrownianIncrements
+from numerical_analysis.sde.variance_reduction import ControlVariate, MonteCarloEstimate
+from numerical_analysis.sde.quasi_random import (
+    LowDiscrepancySequence,
+    Sobol,
+    Halton,
+    QuasiRandomIncrements,
+)
+from numerical_analysis.sde.multilevel_monte_carlo import MultilevelMonteCarlo, MultilevelEstimate
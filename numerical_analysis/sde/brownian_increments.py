@@ -0,0 +1,155 @@
+import sys
+import math
+import numpy as np
+
+
+class BrownianIncrements:
+    """
+    The Brownian increments of paths paths over steps time steps of size
+    dt. Iterating gives one (paths,) array per step: standard normals are
+    drawn memory_budget bytes (block_steps steps) at a time into a buffer
+    reused for every block, scaled in place by sqrt(dt), and handed out as
+    views of its rows, so they are only valid until the next step.
+
+    seed is passed to np.random.default_rng at the start of every pass: an
+    int or a SeedSequence replays the same increments each time, a Generator
+    keeps drawing new ones. With filename, the first pass also writes the
+    increments to a .npy file, memory mapped and read back by later passes
+    (and by from_file) instead of being drawn again.
+
+    Variance reduction: with antithetic, the second half of the paths is
+    driven by the negated increments of the first half (path i is paired
+    with path i + paths / 2); with moment_matching, every step's increments
+    are shifted and scaled to sample mean 0 and variance dt exactly.
+
+    With dimension d > 1, every step gives a (paths, d) array of increments
+    of d Brownian motions, correlated by the lower triangular factor
+    cholesky (L L^T the correlation matrix) applied to a whole block at once.
+    """
+
+    def __init__(
+        self,
+        dt: float,
+        steps: int,
+        paths: int,
+        seed=None,
+        memory_budget: int = 2**26,
+        filename: str = None,
+        antithetic: bool = False,
+        moment_matching: bool = False,
+        dimension: int = 1,
+        cholesky=None,
+    ):
+        self._dt = dt
+        self._steps = steps
+        self._paths = paths
+        self._seed = np.random.SeedSequence() if seed is None else seed
+        self._block_steps = max(1, min(steps, memory_budget // (8 * paths * dimension)))
+        self._filename = filename
+        self._antithetic = antithetic
+        self._moment_matching = moment_matching
+        self._dimension = dimension
+        self._cholesky = cholesky
+        self._stored = None
+
+        if antithetic and paths % 2 != 0:
+            sys.exit("Antithetic increments need an even number of paths")
+
+    @classmethod
+    def from_file(cls, filename: str, dt: float):
+        stored = np.load(filename, mmap_mode="r")
+        increments = cls(
+            dt=dt,
+            steps=stored.shape[0],
+            paths=stored.shape[1],
+            filename=filename,
+            dimension=stored.shape[2] if stored.ndim == 3 else 1,
+        )
+        increments._stored = stored
+
+        return increments
+
+    @property
+    def dt(self):
+        return self._dt
+
+    @property
+    def steps(self):
+        return self._steps
+
+    @property
+    def paths(self):
+        return self._paths
+
+    @property
+    def block_steps(self):
+        return self._block_steps
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def antithetic(self):
+        return self._antithetic
+
+    @property
+    def moment_matching(self):
+        return self._moment_matching
+
+    @property
+    def dimension(self):
+        return self._dimension
+
+    @property
+    def cholesky(self):
+        return self._cholesky
+
+    def __len__(self):
+        return self._steps
+
+    def __iter__(self):
+        if self._stored is not None:
+            yield from self._stored
+            return
+
+        rng = np.random.default_rng(self._seed)
+        # One (paths,) or (paths, d) array per step.
+        shape = (self._paths,) if self._dimension == 1 else (self._paths, self._dimension)
+        stored = (
+            np.lib.format.open_memmap(
+                self._filename, mode="w+", dtype=float, shape=(self._steps, *shape)
+            )
+            if self._filename is not None
+            else None
+        )
+        block = np.empty((self._block_steps, *shape))
+        half = self._paths // 2
+        if self._antithetic:
+            half_block = np.empty((self._block_steps, half, *shape[1:]))
+        if self._cholesky is not None:
+            correlated = np.empty_like(block)
+
+        for start in range(0, self._steps, self._block_steps):
+            rows = block[: min(self._block_steps, self._steps - start)]
+            if self._antithetic:
+                normals = half_block[: rows.shape[0]]
+                rng.standard_normal(out=normals)
+                rows[:, :half] = normals
+                np.negative(normals, out=rows[:, half:])
+            else:
+                rng.standard_normal(out=rows)
+            if self._moment_matching:
+                rows -= rows.mean(axis=1, keepdims=True)
+                rows /= rows.std(axis=1, keepdims=True)
+            if self._cholesky is not None:
+                rows = np.matmul(rows, self._cholesky.T, out=correlated[: rows.shape[0]])
+            rows *= math.sqrt(self._dt)
+            if stored is not None:
+                stored[start : start + rows.shape[0]] = rows
+
+            yield from rows
+
+        if stored is not None:
+            stored.flush()
+            self._stored = np.load(self._filename, mmap_mode="r")
@@ -0,0 +1,227 @@
+import math
+import warnings
+import numpy as np
+
+from typing import Callable, Dict
+
+from numerical_analysis.sde.sde_equations import SDE
+from numerical_analysis.sde.path_reducers import PathReducer
+from numerical_analysis.sde.running_moments import RunningMoments
+from numerical_analysis.sde.brownian_increments import BrownianIncrements
+from numerical_analysis.sde.variance_reduction import MonteCarloEstimate
+
+
+class MultilevelEstimate(MonteCarloEstimate):
+    """
+    A multilevel Monte Carlo estimate, with the RunningMoments of every
+    level: columns (P_l, P_l - P_{l-1}) of the payoff on the level's paths
+    and the correction to the coarser level (P_0 twice on level 0).
+    """
+
+    def __init__(self, *args, levels=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._levels = levels
+
+    @property
+    def levels(self):
+        return self._levels
+
+    @property
+    def paths_per_level(self):
+        return [level.count for level in self._levels]
+
+
+class MultilevelMonteCarlo:
+    """
+    Multilevel Monte Carlo (Giles, 2008) estimate of E[payoff] at time T:
+    E[P_L] = E[P_0] + sum_l E[P_l - P_{l-1}], level l simulated by scheme
+    (a NumericalSDE class) with coarsest_steps 2^l steps, and P_l - P_{l-1}
+    from the level l and l - 1 paths driven by the same Brownian motion
+    (NumericalSDE.reduce_coupled_paths).
+
+    The corrections' variance falls with the level, so most paths are
+    coarse: each level gets N_l ~ sqrt(V_l / C_l) paths, and levels are added
+    until the estimated bias is below rmse / sqrt(2), which brings the cost
+    of an rmse accurate estimate from O(rmse^-3) (Euler-Maruyama) to
+    O(rmse^-2 log(rmse)^2), or O(rmse^-2) with Milstein. kwargs go to the
+    scheme (e.g. exact=False to discretize an sde with an exact transition).
+    """
+
+    def __init__(
+        self,
+        scheme: type,
+        sde: SDE,
+        coarsest_steps: int = 2,
+        initial_paths: int = 1000,
+        min_levels: int = 3,
+        max_levels: int = 12,
+        chunk_size: int = 100000,
+        seed=None,
+        **kwargs,
+    ):
+        self._scheme = scheme
+        self._sde = sde
+        self._coarsest_steps = coarsest_steps
+        self._initial_paths = initial_paths
+        self._min_levels = min_levels
+        self._max_levels = max_levels
+        self._chunk_size = chunk_size
+        self._seed_sequence = (
+            seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        )
+        self._scheme_kwargs = kwargs
+        self._schemes = {}
+
+    @property
+    def scheme(self):
+        return self._scheme
+
+    @property
+    def sde(self):
+        return self._sde
+
+    @property
+    def coarsest_steps(self):
+        return self._coarsest_steps
+
+    @property
+    def seed_sequence(self):
+        return self._seed_sequence
+
+    def steps(self, level: int):
+        return self._coarsest_steps * 2**level
+
+    def dt(self, level: int):
+        return (self._sde.T - self._sde.t0) / self.steps(level)
+
+    def cost(self, level: int):
+        # Time steps per sample: the fine path, plus the coarse one.
+        return self.steps(level) * (1.5 if level > 0 else 1)
+
+    def _level_scheme(self, level):
+        if level not in self._schemes:
+            self._schemes[level] = self._scheme(
+                sde=self._sde, dt=self.dt(level), number_sim=0, **self._scheme_kwargs
+            )
+        return self._schemes[level]
+
+    def sample_level(
+        self,
+        level: int,
+        paths: int,
+        payoff: Callable,
+        reducers: Dict[str, PathReducer],
+        *args,
+        **kwargs,
+    ):
+        """
+        RunningMoments of (P_l, P_l - P_{l-1}) over paths new paths of the
+        level, simulated chunk_size at a time.
+        """
+        scheme = self._level_scheme(level)
+        moments = RunningMoments()
+
+        for start in range(0, paths, self._chunk_size):
+            size = min(self._chunk_size, paths - start)
+            increments = BrownianIncrements(
+                dt=self.dt(level),
+                steps=self.steps(level),
+                paths=size,
+                seed=self._seed_sequence.spawn(1)[0],
+                dimension=self._sde.dimension,
+                cholesky=self._sde.cholesky,
+            )
+            if level == 0:
+                fine = payoff(scheme.reduce_paths(size, reducers, increments=increments), *args, **kwargs)
+                coarse = np.zeros(size)
+            else:
+                fine_paths, coarse_paths = scheme.reduce_coupled_paths(
+                    size, reducers, increments=increments
+                )
+                fine = payoff(fine_paths, *args, **kwargs)
+                coarse = payoff(coarse_paths, *args, **kwargs)
+            moments.update(np.column_stack([fine, fine - coarse]))
+
+        return moments
+
+    @staticmethod
+    def _rate(values, floor):
+        # Decay rate of values ~ 2^(-rate l) fitted over the levels l >= 1.
+        levels = np.arange(1, len(values))
+        values = np.maximum(np.abs(values[1:]), 1e-300)
+        if levels.size < 2:
+            return floor
+        return max(floor, -np.polyfit(levels, np.log2(values), 1)[0])
+
+    def estimate(
+        self,
+        payoff: Callable,
+        reducers: Dict[str, PathReducer],
+        rmse: float,
+        *args,
+        **kwargs,
+    ):
+        """
+        MLMC estimate of E[payoff] with root mean square error rmse, half
+        of its square for the variance and half for the bias. payoff gets
+        the reducers' results ({name: one value per path}, see
+        NumericalSDE.stream) and returns one value per path. Returns a
+        MultilevelEstimate.
+        """
+        levels = [RunningMoments() for _ in range(self._min_levels)]
+        new_paths = [self._initial_paths] * self._min_levels
+
+        while any(new_paths):
+            for level, paths in enumerate(new_paths):
+                if paths > 0:
+                    levels[level].merge(
+                        self.sample_level(level, paths, payoff, reducers, *args, **kwargs)
+                    )
+
+            means = np.array([abs(level.mean[1]) for level in levels])
+            variances = np.array([level.variance[1] for level in levels])
+            costs = np.array([self.cost(level) for level in range(len(levels))])
+            optimal = self._optimal_paths(variances, costs, rmse)
+            new_paths = [max(0, n - level.count) for n, level in zip(optimal, levels)]
+
+            if any(new_paths):
+                continue
+
+            # Weak error of the finest level, from the last two corrections.
+            alpha = self._rate(means, 0.5)
+            bias = max(means[-1], means[-2] / 2**alpha) / (2**alpha - 1)
+            if bias <= rmse / math.sqrt(2):
+                break
+            if len(levels) == self._max_levels:
+                warnings.warn(
+                    f"Bias {bias} above rmse / sqrt(2) with the maximum {self._max_levels} levels"
+                )
+                break
+
+            # A new level, its variance extrapolated until it is sampled.
+            beta = self._rate(variances, 0.5)
+            levels.append(RunningMoments())
+            variances = np.append(variances, variances[-1] / 2**beta)
+            costs = np.append(costs, self.cost(len(levels) - 1))
+            optimal = self._optimal_paths(variances, costs, rmse)
+            new_paths = [max(0, n - level.count) for n, level in zip(optimal, levels)]
+
+        value = sum(level.mean[1] for level in levels)
+        variance = sum(level.variance[1] / level.count for level in levels)
+        paths = sum(level.count for level in levels)
+
+        return MultilevelEstimate(
+            value,
+            math.sqrt(variance),
+            paths,
+            # Against plain Monte Carlo on the finest grid, over as many paths.
+            levels[-1].variance[0] / paths / variance,
+            levels=levels,
+        )
+
+    @staticmethod
+    def _optimal_paths(variances, costs, rmse):
+        # Minimizes sum(N_l C_l) subject to sum(V_l / N_l) = rmse^2 / 2.
+        return np.ceil(
+            2 / rmse**2 * np.sqrt(variances / costs) * np.sqrt(variances * costs).sum()
+        ).astype(int)
@@ -1,20 +1,92 @@
+import sys
 import math
+import warnings
+import itertools
 import numpy as np
 import matplotlib.pyplot as plt
 
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Callable, Dict
 
 from numerical_analysis.sde.sde_equations import SDE
+from numerical_analysis.sde.path_reducers import PathReducer
+from numerical_analysis.sde.running_moments import RunningMoments
+from numerical_analysis.sde.brownian_increments import BrownianIncrements
+from numerical_analysis.sde.quasi_random import (
+    Sobol,
+    Halton,
+    QuasiRandomIncrements,
+    _hashed_normals,
+)
+from numerical_analysis.sde.variance_reduction import (
+    ControlVariate,
+    MonteCarloEstimate,
+    _PlainEstimator,
+    _AntitheticEstimator,
+    _BatchMeansEstimator,
+    _ControlVariateEstimator,
+)
+
+_QUASI_RANDOM_SEQUENCES = {"sobol": Sobol, "halton": Halton}
 
 
 class NumericalSDE(ABC):
-    def __init__(self, sde: SDE, dt:float, number_sim: float = 1000):
+    """
+    Simulation of number_sim paths of the sde on a grid of step dt. The
+    Brownian increments are drawn from a np.random.Generator seeded by seed
+    (an int or a np.random.SeedSequence, None for fresh entropy), in blocks
+    of memory_budget bytes (see BrownianIncrements).
+
+    With quasi_random ("sobol" or "halton") they come from a low discrepancy
+    sequence instead, one dimension per step, randomized by scramble with
+    seeds drawn from the generator ("default" for the sequence's own, Owen
+    for Sobol and a digital shift for Halton), and turned into paths by
+    construction (see QuasiRandomIncrements). An unscrambled sequence
+    (scramble=None) is the same at every draw, so the draws take its
+    consecutive points instead.
+
+    If the sde has an exact transition (and exact isn't False), it replaces
+    the scheme: the paths are sampled on the grid without discretization
+    bias, and go straight to the end of the grid when only terminal values
+    are needed (reducers that aren't path dependent).
+    """
+
+    def __init__(
+        self,
+        sde: SDE,
+        dt:float,
+        number_sim: float = 1000,
+        seed=None,
+        memory_budget: int = 2**26,
+        quasi_random: str = None,
+        scramble: str = "default",
+        construction: str = "brownian_bridge",
+        exact: bool = True,
+    ):
         self._sde = sde
         self._dt = dt
         self._number_sim = number_sim
+        self._memory_budget = memory_budget
+        self._quasi_random = quasi_random
+        self._scramble = (
+            _QUASI_RANDOM_SEQUENCES[quasi_random].default_scramble
+            if quasi_random in _QUASI_RANDOM_SEQUENCES and scramble == "default"
+            else scramble
+        )
+        # Unscrambled draws skip Sobol's point 0, the corner of the cube
+        # (normals of -6.4 in every dimension).
+        self._next_point = 1
+        self._construction = construction
+        self._exact = exact
         self._steps = self.steps
-        self._simulations = self.simulations_grid()
+        self._simulations = None
+        self._seed_sequence = (
+            seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        )
+        self._rng = np.random.default_rng(self._seed_sequence)
+
+        if quasi_random not in (None, *_QUASI_RANDOM_SEQUENCES):
+            sys.exit("The quasi random sequence should be None, 'sobol' or 'halton'")
 
     @property
     def sde(self):
@@ -24,8 +96,39 @@ class NumericalSDE(ABC):
     def number_sim(self):
         return self._number_sim
 
+    @property
+    def dt(self):
+        return self._dt
+
+    @property
+    def seed_sequence(self):
+        return self._seed_sequence
+
+    @property
+    def rng(self):
+        return self._rng
+
+    @property
+    def quasi_random(self):
+        return self._quasi_random
+
+    @property
+    def scramble(self):
+        return self._scramble
+
+    @property
+    def construction(self):
+        return self._construction
+
+    @property
+    def exact(self):
+        # Whether the paths are sampled from the sde's exact transition.
+        return self._exact and self._sde.has_transition
+
     @property
     def simulations(self):
+        # The full grid only exists after solve(), the streaming methods
+        # never allocate it.
         return self._simulations
 
     @property
@@ -36,45 +139,487 @@ class NumericalSDE(ABC):
     def iterate(self, previous_step, t, brownian_motion, *args, **kwargs):
         raise NotImplementedError()
 
-    def solve(self, *args, **kwargs):
+    def _advance(self, previous_step, t, brownian_motion, dt, *args, **kwargs):
+        # One step of size dt: exact if possible, otherwise the scheme's.
+        if self.exact:
+            return self._sde.transition(previous_step, dt, brownian_motion)
+        if dt != self._dt:
+            kwargs["dt"] = dt
+        return self.iterate(previous_step, t, brownian_motion, *args, **kwargs)
+
+    def _jumps(self, reducers):
+        return self.exact and not any(reducer.path_dependent for reducer in reducers.values())
+
+    def _horizon_increments(self, size, rng, **kwargs):
+        # A single step over the whole grid.
+        return self.brownian_increments(
+            size, rng, steps=1, dt=(self._steps - 1) * self._dt, **kwargs
+        )
+
+    def solve(self, *args, increments: BrownianIncrements = None, **kwargs):
+        """
+        Simulates the whole (number_sim, steps) grid ((number_sim, steps, d)
+        for a d dimensional sde), with the given
+        increments (to replay the same noise with another scheme) or new ones.
+        """
+        increments = self.brownian_increments() if increments is None else increments
+        if increments.steps != self._steps - 1 or increments.paths != self._number_sim:
+            sys.exit(
+                f"The increments should have {self._steps - 1} steps and {self._number_sim} paths"
+            )
         simulations = self.simulations_grid()
         simulations[:, 0] = self._sde.X0
 
-        for step in range(1, self._steps):
-            simulations[:, step] = self.iterate(
-                simulations[:, step - 1], step, self.brownian_motion(), *args, **kwargs
+        for step, brownian_motion in enumerate(increments, start=1):
+            simulations[:, step] = self._advance(
+                simulations[:, step - 1], step, brownian_motion, increments.dt, *args, **kwargs
             )
 
         self._simulations = simulations
         return simulations
 
-    def expected_value(self, function: Callable, *args, **kwargs):
+    def chunk_sizes(self, chunk_size: int = None):
+        chunk_size = self._number_sim if chunk_size is None else chunk_size
+        for start in range(0, self._number_sim, chunk_size):
+            yield min(chunk_size, self._number_sim - start)
+
+    def stream(self, reducers: Dict[str, PathReducer], chunk_size: int = None):
+        """
+        Simulates chunk_size paths at a time keeping only their current
+        values and the reducers' accumulators, O(chunk_size) memory instead
+        of O(number_sim * steps), and yields {name: one value per path} with
+        the reducers' results for every chunk.
+        """
+        for size in self.chunk_sizes(chunk_size):
+            yield self.reduce_paths(size, reducers)
+
+    def reduce_paths(
+        self,
+        size: int,
+        reducers: Dict[str, PathReducer],
+        rng=None,
+        increments: BrownianIncrements = None,
+    ):
+        """
+        Simulates size paths, with the given increments or new ones drawn
+        from rng (the solver's generator by default), and returns the
+        reducers' results.
+        """
+        if increments is None:
+            increments = (
+                self._horizon_increments(size, rng)
+                if self._jumps(reducers)
+                else self.brownian_increments(size, rng)
+            )
+        X = np.full(self._state_shape(size), self._sde.X0, dtype=float)
+        accumulators = {name: reducer.initialize(X) for name, reducer in reducers.items()}
+
+        for step, brownian_motion in enumerate(increments, start=1):
+            X = self._advance(X, step, brownian_motion, increments.dt)
+            for name, reducer in reducers.items():
+                accumulators[name] = reducer.update(accumulators[name], X)
+
+        return {name: reducer.result(accumulators[name]) for name, reducer in reducers.items()}
+
+    def monte_carlo(
+        self,
+        payoff: Callable,
+        reducers: Dict[str, PathReducer],
+        *args,
+        variance_reduction: str = None,
+        control: ControlVariate = None,
+        chunk_size: int = None,
+        atol: float = None,
+        rtol: float = None,
+        level: float = 0.95,
+        max_paths: int = 10**8,
+        **kwargs,
+    ):
+        """
+        Monte Carlo estimate of E[payoff], payoff getting the reducers'
+        results of a chunk of paths ({name: one value per path}, see stream)
+        and returning one value per path. variance_reduction is None,
+        "antithetic", "moment_matching" (the error is estimated from the
+        spread of the chunks, so it needs several) or "control_variate"
+        (with control). Returns a MonteCarloEstimate, with the variance
+        reduction factor achieved.
+
+        With quasi_random every chunk is an independent randomization of the
+        first chunk_size points, and the error is estimated from the spread
+        of the chunks like with moment_matching. The chunks of an unscrambled
+        sequence are its consecutive points, with no error estimate (nan).
+
+        With atol and/or rtol, chunks of chunk_size paths (number_sim by
+        default) are simulated until the half width of the level confidence
+        interval is below atol or rtol |value| (after two chunks at least),
+        up to max_paths paths.
+        """
+        if variance_reduction not in (None, "antithetic", "moment_matching", "control_variate"):
+            sys.exit(
+                "The variance reduction should be None, 'antithetic', 'moment_matching' "
+                "or 'control_variate'"
+            )
+        if (variance_reduction == "control_variate") != (control is not None):
+            sys.exit("A control is needed with (and only with) the control variate")
+        if self._quasi_random is not None and variance_reduction is not None:
+            sys.exit("Quasi random increments don't combine with a variance reduction")
+        sequential = atol is not None or rtol is not None
+        if self._quasi_random is not None and self._scramble is None and sequential:
+            sys.exit("Sequential stopping needs a scrambled quasi random sequence")
+
+        if sequential:
+            chunk_size = self._number_sim if chunk_size is None else chunk_size
+            sizes = itertools.repeat(chunk_size, max(2, max_paths // chunk_size))
+        else:
+            sizes = self.chunk_sizes(chunk_size)
+
+        estimator = self._estimator(variance_reduction, control)
+        # The control replays the increments on its own grid.
+        draw = (
+            self._horizon_increments
+            if control is None and self._jumps(reducers)
+            else self.brownian_increments
+        )
+        for chunk, size in enumerate(sizes, start=1):
+            # A seeded chunk, so the control can replay its increments.
+            increments = draw(
+                size,
+                self._seed_sequence.spawn(1)[0],
+                antithetic=variance_reduction == "antithetic",
+                moment_matching=variance_reduction == "moment_matching",
+            )
+            paths = self.reduce_paths(size, reducers, increments=increments)
+            control_samples = None
+            if control is not None:
+                control_paths = control.scheme.reduce_paths(
+                    size, control.reducers, increments=increments
+                )
+                control_samples = control.payoff(control_paths, *args, **kwargs)
+            estimator.update(payoff(paths, *args, **kwargs), control_samples)
+
+            if sequential and chunk >= 2:
+                estimate = estimator.estimate()
+                precision = max(atol or 0, (rtol or 0) * abs(estimate.value))
+                if estimate.half_width(level) <= precision:
+                    return estimate
+
+        if sequential:
+            warnings.warn(f"Precision not reached with the maximum {max_paths} paths")
+
+        return estimator.estimate()
+
+    def _estimator(self, variance_reduction, control):
+        # Running moments of the chunks' payoffs, O(1) memory in the paths.
+        if variance_reduction == "antithetic":
+            return _AntitheticEstimator()
+        if self._quasi_random is not None and self._scramble is None:
+            # Consecutive points: no independent randomizations to compare.
+            return _PlainEstimator(error=False)
+        if variance_reduction == "moment_matching" or self._quasi_random is not None:
+            return _BatchMeansEstimator()
+        if variance_reduction == "control_variate":
+            return _ControlVariateEstimator(control.mean)
+
+        return _PlainEstimator()
+
+    def reduce_coupled_paths(
+        self,
+        size: int,
+        reducers: Dict[str, PathReducer],
+        rng=None,
+        increments: BrownianIncrements = None,
+    ):
+        """
+        Simulates size paths with step dt and, on the same Brownian motion,
+        with step 2 dt (the increments summed in pairs, an odd last one left
+        out), and returns both reducers' results.
+        """
+        increments = self.brownian_increments(size, rng) if increments is None else increments
+        X = np.full(self._state_shape(size), self._sde.X0, dtype=float)
+        h_X = X.copy()
+        h_brownian_motion = np.zeros(self._state_shape(size))
+        accumulators = {name: reducer.initialize(X) for name, reducer in reducers.items()}
+        h_accumulators = {name: reducer.initialize(X) for name, reducer in reducers.items()}
+
+        for step, brownian_motion in enumerate(increments, start=1):
+            X = self._advance(X, step, brownian_motion, increments.dt)
+            for name, reducer in reducers.items():
+                accumulators[name] = reducer.update(accumulators[name], X)
+
+            if (step % 2) == 0:
+                h_brownian_motion += brownian_motion
+                h_X = self._advance(h_X, step / 2, h_brownian_motion, 2 * increments.dt)
+                for name, reducer in reducers.items():
+                    h_accumulators[name] = reducer.update(h_accumulators[name], h_X)
+            else:
+                # The increments are views of a reused buffer.
+                np.copyto(h_brownian_motion, brownian_motion)
+
+        return (
+            {name: reducer.result(accumulators[name]) for name, reducer in reducers.items()},
+            {name: reducer.result(h_accumulators[name]) for name, reducer in reducers.items()},
+        )
+
+    def _streaming_expected_value(self, function, reducers, chunk_size, *args, **kwargs):
+        # Same Richardson extrapolation as expected_value, with the dt and
+        # 2 dt paths of every chunk reduced on the fly.
+        value = 0.0
+        for size in self.chunk_sizes(chunk_size):
+            paths, h_paths = self.reduce_coupled_paths(size, reducers)
+            half_h_expected_value = function(paths, *args, **kwargs)
+            h_expected_value = function(h_paths, *args, **kwargs)
+            value += (2 * half_h_expected_value - h_expected_value) * size / self._number_sim
+
+        return value
+
+    def expected_value(
+        self,
+        function: Callable,
+        *args,
+        reducers: Dict[str, PathReducer] = None,
+        chunk_size: int = None,
+        **kwargs,
+    ):
+        """
+        Richardson extrapolation 2 E[f(X_dt)] - E[f(X_2dt)] of the average
+        function over the paths. By default function gets the whole
+        (number_sim, steps) grid; with reducers it gets {name: one value per
+        path} for chunks of chunk_size paths (see stream), and the results of
+        the chunks are averaged, so function should be a mean over paths.
+        """
+        if reducers is not None:
+            return self._streaming_expected_value(function, reducers, chunk_size, *args, **kwargs)
+
         half_h_mat = self.simulations_grid()
         h_mat = self.simulations_grid(int(self._steps / 2))
 
         half_h_mat[:, 0] = self._sde.X0
         h_mat[:, 0] = self._sde.X0
+        h_brownian_motion = np.zeros(self._state_shape(self._number_sim))
 
-        for step in range(1, self._steps):
-            brownian_motion = self.brownian_motion()
-            half_h_mat[:, step] = self.iterate(half_h_mat[:, step - 1], step, brownian_motion)
+        for step, brownian_motion in enumerate(self.brownian_increments(), start=1):
+            half_h_mat[:, step] = self._advance(half_h_mat[:, step - 1], step, brownian_motion, self._dt)
 
             if (step % 2) == 0:
                 h_brownian_motion += brownian_motion
-                h_mat[:, int(step / 2)]  = self.iterate(h_mat[:, int(step / 2) - 1], step / 2, h_brownian_motion)
+                h_mat[:, int(step / 2)] = self._advance(
+                    h_mat[:, int(step / 2) - 1], step / 2, h_brownian_motion, 2 * self._dt
+                )
             else:
-                h_brownian_motion = brownian_motion
+                np.copyto(h_brownian_motion, brownian_motion)
 
         half_h_expected_value = function(half_h_mat, *args, **kwargs)
         h_expected_value = function(h_mat, *args, **kwargs)
 
         return 2 * half_h_expected_value - h_expected_value
-    
+
+    def greeks(
+        self,
+        payoff: Callable,
+        parameters=("X0",),
+        *args,
+        payoff_derivative: Callable = None,
+        chunk_size: int = None,
+        **kwargs,
+    ):
+        """
+        E[payoff(X_T)] and its derivatives with respect to parameters ("X0",
+        or the sde's, see SDE.coefficient_derivatives) from one simulation,
+        all on the same paths. payoff (and payoff_derivative) get the
+        terminal values and return one value per path.
+
+        With payoff_derivative the Greeks are pathwise: the tangent processes
+        Y = dX/dp, Y_{n+1} = Y_n + (a_x Y_n + a_p) dt + (b_x Y_n + b_p) dW, are
+        propagated along the paths and E[payoff'(X_T) Y_T] estimated. Without
+        (for a discontinuous payoff, e.g. a digital) they are likelihood
+        ratios E[payoff(X_T) S_T], S_T the derivative of the log density of
+        the path, sum(a_p dW / b + b_p (dW^2 / dt - 1) / b) over the steps.
+
+        With an exact transition that has its derivatives (see
+        SDE.transition_derivatives), the paths jump straight to the end of
+        the grid and the Greeks differentiate the exact transition: no bias,
+        and likelihood ratios as precise on any grid. Otherwise they
+        differentiate the Euler-Maruyama paths on the grid, whatever the
+        scheme; there the likelihood ratios' variance grows like 1 / dt (the
+        X0 score is dW_1 / (b dt) at the first step, the others sum a
+        (dW^2 / dt - 1) / b term per step), so they need more paths on fine
+        grids. Returns {"value": MonteCarloEstimate, parameter:
+        MonteCarloEstimate}.
+        """
+        if self._sde.dimension > 1:
+            sys.exit("The Greeks need a one dimensional sde")
+        exact = self.exact and self._sde.has_transition_derivatives
+        X0 = np.atleast_1d(float(self._sde.X0))
+        # Only the sde's parameters need its coefficient derivatives.
+        coefficients = any(parameter != "X0" for parameter in parameters)
+        if exact or coefficients:
+            derivatives = (
+                self._sde.transition_derivatives(X0, self._dt, np.zeros(1))
+                if exact
+                else self._sde.coefficient_derivatives(X0, self._sde.t0)
+            )
+            if any(parameter != "X0" and parameter not in derivatives for parameter in parameters):
+                sys.exit(f"The parameters should be 'X0' or among {list(derivatives)}")
+
+        moments = RunningMoments()
+        for size in self.chunk_sizes(chunk_size):
+            simulate = self._exact_greeks if exact else self._euler_greeks
+            X, greeks = simulate(size, parameters, payoff_derivative is not None, coefficients)
+            values = payoff(X, *args, **kwargs)
+            weights = (
+                payoff_derivative(X, *args, **kwargs) if payoff_derivative is not None else values
+            )
+            moments.update(np.column_stack([values, *(weights * greeks[p] for p in parameters)]))
+
+        std_errors = moments.std_error
+        return {
+            name: MonteCarloEstimate(moments.mean[column], std_errors[column], moments.count)
+            for column, name in enumerate(["value", *parameters])
+        }
+
+    def _exact_greeks(self, size, parameters, pathwise, coefficients):
+        # One exact transition over the grid, its derivatives as weights.
+        increments = self._horizon_increments(size, None)
+        brownian_motion = next(iter(increments)).copy()
+        X0 = np.full(size, self._sde.X0, dtype=float)
+        X = self._sde.transition(X0, increments.dt, brownian_motion)
+        derivatives = self._sde.transition_derivatives(X0, increments.dt, brownian_motion)
+
+        return X, {parameter: derivatives[parameter][0 if pathwise else 1] for parameter in parameters}
+
+    def _euler_greeks(self, size, parameters, pathwise, coefficients):
+        increments = self.brownian_increments(size)
+        dt = increments.dt
+        X = np.full(size, self._sde.X0, dtype=float)
+        # Tangents start at dX0/dp, scores at 0.
+        greeks = {
+            parameter: np.full(size, float(parameter == "X0" and pathwise))
+            for parameter in parameters
+        }
+
+        for step, brownian_motion in enumerate(increments, start=1):
+            a, b = self._sde.a(X, step), self._sde.b(X, step)
+            a_x, b_x = self._sde.a_derivative(X, step), self._sde.b_derivative(X, step)
+            if coefficients:
+                derivatives = self._sde.coefficient_derivatives(X, step)
+
+            for parameter, greek in greeks.items():
+                if pathwise:
+                    a_p, b_p = (0, 0) if parameter == "X0" else derivatives[parameter]
+                    greek += (a_x * greek + a_p) * dt + (b_x * greek + b_p) * brownian_motion
+                    continue
+                if parameter == "X0":
+                    # Only the first transition depends on X0.
+                    if step > 1:
+                        continue
+                    a_p, b_p = 1 / dt + a_x, b_x
+                else:
+                    a_p, b_p = derivatives[parameter]
+                greek += (a_p * brownian_motion + b_p * (brownian_motion**2 / dt - 1)) / b
+
+            X = X + a * dt + b * brownian_motion
+
+        return X, greeks
+
     def simulations_grid(self, steps: int=None):
-        return np.zeros((self._number_sim, steps if steps is not None else self._steps))
+        return np.zeros(
+            (self._number_sim, steps if steps is not None else self._steps, *self._state_shape(1)[1:])
+        )
+
+    def _state_shape(self, size):
+        # (paths,) for a scalar sde, (paths, d) for a d dimensional one.
+        dimension = self._sde.dimension
+        return (size,) if dimension == 1 else (size, dimension)
+
+    def brownian_increments(
+        self, size: int = None, rng=None, steps: int = None, dt: float = None, **kwargs
+    ):
+        """
+        The increments of one simulation of size paths (number_sim by
+        default) over steps steps of size dt (the grid's by default), drawn
+        from rng (the solver's generator by default). kwargs go to
+        BrownianIncrements (antithetic, moment_matching, ...).
+
+        With quasi_random, the first size points of the sequence scrambled
+        with seeds drawn from rng, or the next size points of the
+        unscrambled sequence.
+        """
+        size = self._number_sim if size is None else size
+        rng = self._rng if rng is None else rng
+        steps = self._steps - 1 if steps is None else steps
+        dt = self._dt if dt is None else dt
+
+        if self._quasi_random is not None:
+            sequence = _QUASI_RANDOM_SEQUENCES[self._quasi_random](
+                steps * self._sde.dimension, scramble=self._scramble, seed=rng
+            )
+            start = 0
+            if self._scramble is None:
+                start, self._next_point = self._next_point, self._next_point + size
+            return QuasiRandomIncrements(
+                sequence,
+                dt,
+                steps,
+                size,
+                start=start,
+                construction=self._construction,
+                dimension=self._sde.dimension,
+                cholesky=self._sde.cholesky,
+            )
+
+        return BrownianIncrements(
+            dt=dt,
+            steps=steps,
+            paths=size,
+            seed=rng,
+            memory_budget=self._memory_budget,
+            dimension=self._sde.dimension,
+            cholesky=self._sde.cholesky,
+            **kwargs,
+        )
+
+    def observe(self, dates, size: int = None, rng=None):
+        """
+        The values of size paths (number_sim by default) at the observation
+        dates, increasing times in (t0, t0 + (steps - 1) dt], as a
+        (size, len(dates)) array ((size, len(dates), d) for a d dimensional
+        sde). With an exact transition the paths jump from date to date, with
+        no grid and no bias; otherwise they are simulated on the grid by the
+        scheme, and read at the grid points nearest the dates.
+        """
+        dates = np.asarray(dates, dtype=float)
+        horizon = (self._steps - 1) * self._dt
+        intervals = np.diff(dates, prepend=self._sde.t0)
+        if (intervals <= 0).any() or dates[-1] - self._sde.t0 > horizon * (1 + 1e-12):
+            sys.exit("The dates should increase within the simulated horizon")
+
+        size = self._number_sim if size is None else size
+        X = np.full(self._state_shape(size), self._sde.X0, dtype=float)
+        values = []
+
+        if self.exact:
+            # Standard normals scaled to each interval.
+            increments = self.brownian_increments(size, rng, steps=dates.size, dt=1)
+            for interval, brownian_motion in zip(intervals, increments):
+                X = self._sde.transition(X, interval, brownian_motion * np.sqrt(interval))
+                values.append(X)
+        else:
+            indices = np.rint((dates - self._sde.t0) / self._dt).astype(int)
+            grid_values = {0: X}
+            for step, brownian_motion in enumerate(self.brownian_increments(size, rng), start=1):
+                X = self.iterate(X, step, brownian_motion)
+                if step in indices:
+                    grid_values[step] = X
+            values = [grid_values[index] for index in indices]
+
+        return np.stack(values, axis=1)
 
-    def brownian_motion(self):
-        return np.random.randn(self._number_sim) * math.sqrt(self._dt)
+    def brownian_motion(self, size: int = None, rng=None):
+        rng = self._rng if rng is None else rng
+        normals = rng.standard_normal(self._state_shape(self._number_sim if size is None else size))
+        if self._sde.cholesky is not None:
+            normals = normals.dot(self._sde.cholesky.T)
+        return normals * math.sqrt(self._dt)
 
     def plot_simulations(self, title):
         x_axis = range(1, self._steps + 1)
@@ -89,10 +634,11 @@ class EulerMaruyamaScheme(NumericalSDE):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def iterate(self, previous_step, t, brownian_motion):
+    def iterate(self, previous_step, t, brownian_motion, dt=None):
+        dt = self._dt if dt is None else dt
         return (
             previous_step
-            + self._sde.a(previous_step, t) * self._dt
+            + self._sde.a(previous_step, t) * dt
             + self._sde.b(previous_step, t) * brownian_motion
         )
 
@@ -101,13 +647,220 @@ class MilsteinScheme(EulerMaruyamaScheme):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def iterate(self, previous_step, t, brownian_motion):
-        euler = EulerMaruyamaScheme.iterate(self, previous_step, t, brownian_motion)
-        milstein = (
+    def iterate(self, previous_step, t, brownian_motion, dt=None):
+        dt = self._dt if dt is None else dt
+        euler = EulerMaruyamaScheme.iterate(self, previous_step, t, brownian_motion, dt)
+
+        return euler + self._correction(previous_step, t, brownian_motion, dt)
+
+    def _correction(self, previous_step, t, brownian_motion, dt):
+        # Milstein minus Euler-Maruyama.
+        return (
             0.5
             * self._sde.b(previous_step, t)
             * self._sde.b_derivative(previous_step, t)
-            * (brownian_motion ** 2 - self._dt)
+            * (brownian_motion ** 2 - dt)
+        )
+
+
+class DerivativeFreeMilsteinScheme(NumericalSDE):
+    """
+    Platen's explicit strong order 1.0 scheme: Milstein with b b' replaced
+    by the difference quotient of b at the support value
+    Y = X + a dt + b sqrt(dt), so no b_derivative is needed.
+
+    For a d dimensional sde the noise is taken as diagonal (b_i depending
+    on X_i only), as with MilsteinScheme.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def iterate(self, previous_step, t, brownian_motion, dt=None):
+        dt = self._dt if dt is None else dt
+        a = self._sde.a(previous_step, t)
+        b = self._sde.b(previous_step, t)
+        support = previous_step + a * dt + b * np.sqrt(dt)
+
+        return (
+            previous_step
+            + a * dt
+            + b * brownian_motion
+            + (self._sde.b(support, t) - b) * (brownian_motion**2 - dt) / (2 * np.sqrt(dt))
         )
 
-        return euler + milstein
+
+class PlatenWeakScheme(NumericalSDE):
+    """
+    Platen's explicit weak order 2.0 scheme (Kloeden and Platen, 15.1.1):
+    E[f(X_T)] has an O(dt^2) bias for smooth f, against O(dt) for
+    Euler-Maruyama and Milstein, with two drift and three diffusion
+    evaluations per step and no derivatives.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def iterate(self, previous_step, t, brownian_motion, dt=None):
+        dt = self._dt if dt is None else dt
+        a = self._sde.a(previous_step, t)
+        b = self._sde.b(previous_step, t)
+        support = previous_step + a * dt
+        b_up = self._sde.b(support + b * np.sqrt(dt), t)
+        b_down = self._sde.b(support - b * np.sqrt(dt), t)
+
+        return (
+            previous_step
+            + (self._sde.a(support + b * brownian_motion, t) + a) * dt / 2
+            + (b_up + b_down + 2 * b) * brownian_motion / 4
+            + (b_up - b_down) * (brownian_motion**2 - dt) / (4 * np.sqrt(dt))
+        )
+
+
+class RosslerSRKScheme(NumericalSDE):
+    """
+    Rößler's stochastic Runge-Kutta scheme SRI2 (2010): strong order 1.0,
+    and order 2.0 for the drift (Heun), from three diffusion evaluations at
+    the stages X + a dt +- b I_11 / sqrt(dt), I_11 = (dW^2 - dt) / 2 the
+    iterated Ito integral, with no derivatives.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def iterate(self, previous_step, t, brownian_motion, dt=None):
+        dt = self._dt if dt is None else dt
+        a = self._sde.a(previous_step, t)
+        b = self._sde.b(previous_step, t)
+        support = previous_step + a * dt
+        stage = b * (brownian_motion**2 - dt) / (2 * np.sqrt(dt))
+
+        return (
+            previous_step
+            + (a + self._sde.a(support, t)) * dt / 2
+            + b * brownian_motion
+            + (self._sde.b(support + stage, t) - self._sde.b(support - stage, t)) * np.sqrt(dt) / 2
+        )
+
+
+class AdaptiveMilsteinScheme(MilsteinScheme):
+    """
+    Milstein with its own step sizes for every path within each step dt of
+    the grid. The Milstein correction b b' / 2 (dW^2 - h), the difference
+    with Euler-Maruyama, has conditional standard deviation |b b'| h /
+    sqrt(2), known before the step: each step is the longest one keeping it
+    below tol (1 + |X|), down to dt / 2^max_depth. The pending increment is
+    split with the Brownian bridge (a Brownian tree), so the paths' noise is
+    the same whatever the steps, and the pieces are merged back when the
+    step may grow.
+
+    The bridge draws are a hash of the increment being split, so the paths
+    only depend on their increments: replays, chunks and workers give the
+    same ones. evaluations counts the drift and diffusion evaluations (one
+    per step) of the last solve.
+    """
+
+    def __init__(self, *args, tol: float = 1e-3, max_depth: int = 20, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tol = tol
+        self._max_depth = max_depth
+        self._evaluations = 0
+
+    @property
+    def tol(self):
+        return self._tol
+
+    @property
+    def max_depth(self):
+        return self._max_depth
+
+    @property
+    def evaluations(self):
+        return self._evaluations
+
+    def _split(self, h, dW):
+        # Brownian bridge: the increment over the first half given the one
+        # over the whole piece.
+        noise = _hashed_normals(dW)
+        if self._sde.cholesky is not None:
+            noise = noise.dot(self._sde.cholesky.T)
+        first = dW / 2 + np.sqrt(h / 4).reshape(-1, *[1] * (dW.ndim - 1)) * noise
+
+        return first, dW - first
+
+    def _allowed_step(self, X, b, b_derivative):
+        # Longest h with |b b'| h / sqrt(2) <= tol (1 + |X|) for all components.
+        allowed = self._tol * (1 + np.abs(X)) * np.sqrt(2) / np.maximum(np.abs(b * b_derivative), 1e-300)
+        return allowed.min(axis=tuple(range(1, allowed.ndim))) if allowed.ndim > 1 else allowed
+
+    def solve(self, *args, increments: BrownianIncrements = None, **kwargs):
+        # Counted per path by iterate, the scheme itself stays unchanged
+        # while simulating.
+        evaluations = np.zeros(self._number_sim, dtype=int)
+        simulations = super().solve(*args, increments=increments, evaluations=evaluations, **kwargs)
+        self._evaluations = int(evaluations.sum())
+
+        return simulations
+
+    def iterate(self, previous_step, t, brownian_motion, dt=None, evaluations=None):
+        dt = self._dt if dt is None else dt
+        X = np.array(previous_step, dtype=float)
+        size, shape = X.shape[0], X.shape[1:]
+        column = (-1, *[1] * len(shape))
+        # A stack of (step, increment) pieces left in [t - dt, t] per path,
+        # the next one on top.
+        stack_h = np.zeros((size, self._max_depth + 1))
+        stack_dW = np.zeros((size, self._max_depth + 1, *shape))
+        stack_h[:, 0] = dt
+        stack_dW[:, 0] = brownian_motion
+        depth = np.ones(size, dtype=int)
+        elapsed = np.zeros(size)
+
+        while True:
+            paths = np.flatnonzero(depth > 0)
+            if paths.size == 0:
+                break
+            X_paths = X[paths]
+            # The grid's step index t (as the fixed grid schemes get it),
+            # plus the fraction of dt already covered.
+            s = (t + elapsed[paths] / dt).reshape(column)
+            b = self._sde.b(X_paths, s)
+            b_derivative = np.broadcast_to(self._sde.b_derivative(X_paths, s), b.shape).copy()
+            allowed = self._allowed_step(X_paths, b, b_derivative)
+            if evaluations is not None:
+                evaluations[paths] += 1
+
+            while True:
+                top = depth[paths] - 1
+                h = stack_h[paths, top]
+                split = (h > allowed * (1 + 1e-9)) & (depth[paths] <= self._max_depth)
+                if not split.any():
+                    break
+                split_paths, top, h = paths[split], top[split], h[split]
+                first, second = self._split(h, stack_dW[split_paths, top])
+                stack_h[split_paths, top] = stack_h[split_paths, top + 1] = h / 2
+                stack_dW[split_paths, top] = second
+                stack_dW[split_paths, top + 1] = first
+                depth[split_paths] += 1
+
+            dW = stack_dW[paths, top]
+            h_column = h.reshape(column)
+            X[paths] = (
+                X_paths
+                + self._sde.a(X_paths, s) * h_column
+                + b * dW
+                + 0.5 * b * b_derivative * (dW**2 - h_column)
+            )
+            elapsed[paths] += h
+            depth[paths] -= 1
+
+            # Merge the next two pieces if the step may grow that much.
+            paths, allowed = paths[depth[paths] >= 2], allowed[depth[paths] >= 2]
+            top = depth[paths] - 1
+            merge = stack_h[paths, top] + stack_h[paths, top - 1] <= allowed * (1 + 1e-9)
+            paths, top = paths[merge], top[merge]
+            stack_h[paths, top - 1] += stack_h[paths, top]
+            stack_dW[paths, top - 1] += stack_dW[paths, top]
+            depth[paths] -= 1
+
+        return X
@@ -0,0 +1,91 @@
+import os
+import sys
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict
+
+from numerical_analysis.sde.numerical_sde import NumericalSDE
+from numerical_analysis.sde.path_reducers import PathReducer
+from numerical_analysis.sde.running_moments import RunningMoments
+
+
+def _run_chunk(scheme, size, reducers, seed_sequence, payoff, args, kwargs):
+    rng = np.random.default_rng(seed_sequence)
+    paths = scheme.reduce_paths(size, reducers, rng)
+
+    return RunningMoments().update(payoff(paths, *args, **kwargs))
+
+
+class ParallelMonteCarlo:
+    """
+    Monte Carlo estimate of E[payoff] over the paths of scheme, split in
+    chunks of chunk_size paths run by a pool of workers: threads by default
+    (NumPy releases the GIL in the vectorized steps) or processes (the
+    scheme, reducers and payoff must then be picklable).
+
+    Chunk i always draws from the i-th SeedSequence spawned from the
+    scheme's seed, and the chunks' moments are merged in chunk order, so the
+    result is bit for bit the same for any number of workers.
+    """
+
+    def __init__(
+        self,
+        scheme: NumericalSDE,
+        chunk_size: int = 10000,
+        workers: int = None,
+        executor: str = "thread",
+    ):
+        self._scheme = scheme
+        self._chunk_size = chunk_size
+        self._workers = os.cpu_count() if workers is None else workers
+        self._executor = executor
+
+        if executor not in ("thread", "process"):
+            sys.exit("The executor should be 'thread' or 'process'")
+        if scheme.quasi_random is not None and scheme.scramble is None:
+            sys.exit("The chunks of an unscrambled quasi random sequence aren't independent")
+
+    @property
+    def scheme(self):
+        return self._scheme
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @property
+    def executor(self):
+        return self._executor
+
+    def run(self, payoff: Callable, reducers: Dict[str, PathReducer], *args, **kwargs):
+        """
+        payoff gets the reducers' results of a chunk ({name: one value per
+        path}, see NumericalSDE.stream) and returns one value per path, or
+        an (paths, m) array for several payoffs at once. Returns their
+        RunningMoments: mean, variance and standard error.
+        """
+        sizes = list(self._scheme.chunk_sizes(self._chunk_size))
+        seed_sequences = self._scheme.seed_sequence.spawn(len(sizes))
+        pool = ThreadPoolExecutor if self._executor == "thread" else ProcessPoolExecutor
+
+        with pool(max_workers=self._workers) as executor:
+            chunks = executor.map(
+                _run_chunk,
+                [self._scheme] * len(sizes),
+                sizes,
+                [reducers] * len(sizes),
+                seed_sequences,
+                [payoff] * len(sizes),
+                [args] * len(sizes),
+                [kwargs] * len(sizes),
+            )
+            moments = RunningMoments()
+            for chunk in chunks:
+                moments.merge(chunk)
+
+        return moments
@@ -0,0 +1,104 @@
+import sys
+import numpy as np
+
+from abc import ABC, abstractmethod
+
+
+class PathReducer(ABC):
+    """
+    Statistic of each simulated path accumulated step by step, so the paths
+    don't need to be stored: initialize(X) gets the starting values, update
+    the values after every step, and result returns one value per path
+    (per path and component, for a d dimensional state). The accumulator is
+    passed around, so a reducer can be shared between simulations. A reducer
+    that only needs the terminal values isn't path_dependent, so an exact
+    transition can jump straight to them.
+    """
+
+    path_dependent = True
+
+    @abstractmethod
+    def initialize(self, X):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def update(self, accumulator, X):
+        raise NotImplementedError()
+
+    def result(self, accumulator):
+        return accumulator
+
+
+class TerminalValue(PathReducer):
+    path_dependent = False
+
+    def initialize(self, X):
+        return X.copy()
+
+    def update(self, accumulator, X):
+        return X
+
+
+class RunningMax(PathReducer):
+    def initialize(self, X):
+        return X.copy()
+
+    def update(self, accumulator, X):
+        return np.maximum(accumulator, X, out=accumulator)
+
+
+class RunningMin(PathReducer):
+    def initialize(self, X):
+        return X.copy()
+
+    def update(self, accumulator, X):
+        return np.minimum(accumulator, X, out=accumulator)
+
+
+class RunningMean(PathReducer):
+    """
+    Average of each path over the time grid, starting value included (the
+    arithmetic average of an Asian option).
+    """
+
+    def initialize(self, X):
+        return {"sum": X.copy(), "count": 1}
+
+    def update(self, accumulator, X):
+        accumulator["sum"] += X
+        accumulator["count"] += 1
+        return accumulator
+
+    def result(self, accumulator):
+        return accumulator["sum"] / accumulator["count"]
+
+
+class BarrierHit(PathReducer):
+    """
+    Whether each path touched the barrier on the time grid, from below
+    (direction="up") or from above (direction="down").
+    """
+
+    def __init__(self, level: float, direction: str = "up"):
+        self._level = level
+        self._direction = direction
+
+        if direction not in ("up", "down"):
+            sys.exit("The direction should be 'up' or 'down'")
+
+    @property
+    def level(self):
+        return self._level
+
+    @property
+    def direction(self):
+        return self._direction
+
+    def _hit(self, X):
+        return X >= self._level if self._direction == "up" else X <= self._level
+
+    def initialize(self, X):
+        return self._hit(X)
+
+    def update(self, accumulator, X):
+        return np.logical_or(accumulator, self._hit(X), out=accumulator)
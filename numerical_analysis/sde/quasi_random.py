@@ -0,0 +1,378 @@
+import sys
+import math
+import numpy as np
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from numerical_analysis.sde._sobol_direction_numbers import DIRECTION_NUMBERS
+
+_BITS = 32
+
+
+def _mix(x):
+    # Murmur3 finalizer: a bijection of uint32 with good avalanche.
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(0x85EBCA6B)
+    x ^= x >> np.uint32(13)
+    x *= np.uint32(0xC2B2AE35)
+    x ^= x >> np.uint32(16)
+    return x
+
+
+def _reverse_bits(x):
+    x = ((x >> np.uint32(1)) & np.uint32(0x55555555)) | ((x & np.uint32(0x55555555)) << np.uint32(1))
+    x = ((x >> np.uint32(2)) & np.uint32(0x33333333)) | ((x & np.uint32(0x33333333)) << np.uint32(2))
+    x = ((x >> np.uint32(4)) & np.uint32(0x0F0F0F0F)) | ((x & np.uint32(0x0F0F0F0F)) << np.uint32(4))
+    x = ((x >> np.uint32(8)) & np.uint32(0x00FF00FF)) | ((x & np.uint32(0x00FF00FF)) << np.uint32(8))
+    return (x >> np.uint32(16)) | (x << np.uint32(16))
+
+
+def _owen_scramble(x, seed):
+    # Hash based nested uniform scrambling (Burley, "Practical hash-based
+    # Owen scrambling", 2020): with the bits reversed, each bit is flipped
+    # by a hash of the bits above it (Laine-Karras permutation).
+    x = _reverse_bits(x)
+    x += seed
+    x ^= x * np.uint32(0x6C50B47C)
+    x ^= x * np.uint32(0xB82F1E52)
+    x ^= x * np.uint32(0xC7AFE638)
+    x ^= x * np.uint32(0x8D22F6E6)
+    return _reverse_bits(x)
+
+
+def inverse_normal_cdf(u):
+    """
+    Acklam's rational approximation of the standard normal quantile,
+    relative error below 1.15e-9 on (0, 1).
+    """
+    a = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
+         1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00)
+    b = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
+         6.680131188771972e01, -1.328068155288572e01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
+         -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00,
+         3.754408661907416e00)
+
+    u = np.asarray(u, dtype=float)
+    tail = np.minimum(u, 1 - u)
+    z = np.empty(u.shape)
+
+    central = tail >= 0.02425
+    q = u[central] - 0.5
+    r = q * q
+    z[central] = (
+        (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q
+        / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    )
+
+    q = np.sqrt(-2 * np.log(tail[~central]))
+    lower = (
+        (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5])
+        / ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    )
+    z[~central] = np.where(u[~central] < 0.5, lower, -lower)
+
+    return z
+
+
+def _splitmix64(x):
+    # SplitMix64 finalizer: a bijection of uint64 with good avalanche.
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _hashed_normals(x):
+    """
+    Pseudo-random standard normals, a hash of the bits of each entry of the
+    float array x (and of its column), so they only depend on x.
+    """
+    x = np.ascontiguousarray(x, dtype=float)
+    bits = x.view(np.uint64)
+    if x.ndim > 1:
+        bits = bits ^ _splitmix64(np.arange(x.shape[1], dtype=np.uint64))
+    u = ((_splitmix64(bits) >> np.uint64(11)).astype(float) + 0.5) / 2.0**53
+    return inverse_normal_cdf(u)
+
+
+@lru_cache(maxsize=None)
+def _direction_integers(dimension):
+    # V_k = m_k 2^(32 - k) from the table's initial m_1..m_s, then
+    # V_k = V_{k-s} ^ (V_{k-s} >> s) ^ a_1 V_{k-1} ^ ... ^ a_{s-1} V_{k-s+1}
+    # with the primitive polynomial x^s + a_1 x^(s-1) + ... + 1.
+    directions = np.zeros((dimension, _BITS), dtype=np.uint32)
+    directions[0] = [1 << (_BITS - 1 - k) for k in range(_BITS)]
+
+    for j in range(1, dimension):
+        polynomial, m = DIRECTION_NUMBERS[j - 1]
+        s = polynomial.bit_length() - 1
+        v = [m[k] << (_BITS - 1 - k) for k in range(min(s, _BITS))]
+        for k in range(s, _BITS):
+            value = v[k - s] ^ (v[k - s] >> s)
+            for i in range(1, s):
+                if (polynomial >> (s - i)) & 1:
+                    value ^= v[k - i]
+            v.append(value)
+        directions[j] = v
+
+    directions.setflags(write=False)
+    return directions
+
+
+@lru_cache(maxsize=None)
+def _pca_factor(steps, dt):
+    # A with A A^T = min(t_i, t_j), columns by decreasing eigenvalue.
+    t = np.arange(1, steps + 1) * dt
+    eigenvalues, eigenvectors = np.linalg.eigh(np.minimum.outer(t, t))
+    factor = eigenvectors[:, ::-1] * np.sqrt(np.maximum(eigenvalues[::-1], 0))
+    factor.setflags(write=False)
+    return factor
+
+
+class LowDiscrepancySequence(ABC):
+    """
+    Points of a low discrepancy sequence in (0, 1)^dimension. A scrambled
+    sequence is randomized by seed (int, SeedSequence or Generator): each
+    randomization is as well distributed as the original, and independent
+    randomizations give independent estimates (randomized quasi-Monte
+    Carlo), from which the error is estimated.
+    """
+
+    def __init__(self, dimension: int, scramble: str = None, seed=None):
+        self._dimension = dimension
+        self._scramble = scramble
+        rng = np.random.default_rng(seed)
+        self._seeds = rng.integers(0, 2**_BITS, size=dimension, dtype=np.uint32)
+
+    @property
+    def dimension(self):
+        return self._dimension
+
+    @property
+    def scramble(self):
+        return self._scramble
+
+    @abstractmethod
+    def points(self, start: int, n: int):
+        raise NotImplementedError()
+
+
+class Sobol(LowDiscrepancySequence):
+    """
+    Sobol sequence with Joe and Kuo's direction numbers, points taken in
+    Gray code order, scrambled by a random digital shift ("digital_shift")
+    or nested uniform scrambling ("owen"). The points are the centres of
+    their 2^-32 cells, so never 0.
+
+    Beyond the 1024 dimensions of the table, coordinates are hashed
+    pseudo-random numbers: with the Brownian bridge (or PCA) construction,
+    those are the finest details of the paths.
+    """
+
+    default_scramble = "owen"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self._scramble not in (None, "digital_shift", "owen"):
+            sys.exit("The scramble should be None, 'digital_shift' or 'owen'")
+
+        self._sobol_dimension = min(self._dimension, len(DIRECTION_NUMBERS) + 1)
+        self._directions = _direction_integers(self._sobol_dimension)
+
+    def points(self, start, n):
+        index = np.arange(start, start + n, dtype=np.uint64)
+        gray = index ^ (index >> np.uint64(1))
+        x = np.zeros((n, self._sobol_dimension), dtype=np.uint32)
+
+        for k in range(int(gray.max(initial=0)).bit_length()):
+            bit = ((gray >> np.uint64(k)) & np.uint64(1)).astype(bool)
+            x[bit] ^= self._directions[:, k]
+
+        if self._dimension > self._sobol_dimension:
+            dimensions = np.arange(self._sobol_dimension, self._dimension, dtype=np.uint32)
+            padding = _mix(
+                index.astype(np.uint32)[:, None] * np.uint32(0x9E3779B9)
+                ^ _mix(dimensions + self._seeds[self._sobol_dimension :])
+            )
+            x = np.hstack([x, padding])
+
+        seeds = self._seeds[: x.shape[1]]
+        if self._scramble == "digital_shift":
+            x ^= seeds
+        elif self._scramble == "owen":
+            x = _owen_scramble(x, seeds)
+
+        return (x + 0.5) / 2.0**_BITS
+
+
+def _primes(n):
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+class Halton(LowDiscrepancySequence):
+    """
+    Halton sequence: the radical inverse of the point index (from 1) in the
+    j-th prime base for coordinate j, scrambled by a random digit shift in
+    each base ("digital_shift"). Its high dimensions are strongly
+    correlated, so it is best with the Brownian bridge construction.
+    """
+
+    default_scramble = "digital_shift"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self._scramble not in (None, "digital_shift"):
+            sys.exit("The scramble should be None or 'digital_shift'")
+
+        self._bases = _primes(self._dimension)
+        # Scrambled points get every digit down to 2^-32, with its shift.
+        self._shifts = [
+            np.random.default_rng(int(seed)).integers(base, size=math.ceil(_BITS / math.log2(base)))
+            for base, seed in zip(self._bases, self._seeds)
+        ]
+
+    def points(self, start, n):
+        index = np.arange(start + 1, start + n + 1)
+        x = np.zeros((n, self._dimension))
+
+        for j, (base, shifts) in enumerate(zip(self._bases, self._shifts)):
+            remaining = index.copy()
+            scale = 1.0 / base
+            for shift in shifts:
+                if self._scramble is None and not remaining.any():
+                    break
+                digit = remaining % base
+                if self._scramble == "digital_shift":
+                    digit = (digit + shift) % base
+                x[:, j] += digit * scale
+                remaining //= base
+                scale /= base
+
+        return np.clip(x, 2**-_BITS, 1 - 2**-_BITS)
+
+
+class QuasiRandomIncrements:
+    """
+    Brownian increments driven by the points start to start + paths of a
+    low discrepancy sequence of dimension steps, one point per path, with
+    the same iteration interface as BrownianIncrements.
+
+    construction orders the dimensions by importance: "brownian_bridge"
+    uses the first coordinate for W_T, then the midpoints of the intervals,
+    "pca" the eigenvectors of the covariance min(t_i, t_j) by decreasing
+    eigenvalue, and "incremental" the increments in time order.
+
+    With dimension d > 1 the sequence has steps * d dimensions, the d
+    Brownian motions taking d consecutive coordinates at every stage of the
+    construction, and the paths are correlated by cholesky (see
+    BrownianIncrements).
+    """
+
+    def __init__(
+        self,
+        sequence: LowDiscrepancySequence,
+        dt: float,
+        steps: int,
+        paths: int,
+        start: int = 0,
+        construction: str = "brownian_bridge",
+        dimension: int = 1,
+        cholesky=None,
+    ):
+        self._sequence = sequence
+        self._dt = dt
+        self._steps = steps
+        self._paths = paths
+        self._start = start
+        self._construction = construction
+        self._dimension = dimension
+        self._cholesky = cholesky
+
+        if construction not in ("brownian_bridge", "pca", "incremental"):
+            sys.exit("The construction should be 'brownian_bridge', 'pca' or 'incremental'")
+        if sequence.dimension != steps * dimension:
+            sys.exit("The sequence should have one dimension per step and Brownian motion")
+
+    @property
+    def sequence(self):
+        return self._sequence
+
+    @property
+    def dt(self):
+        return self._dt
+
+    @property
+    def steps(self):
+        return self._steps
+
+    @property
+    def paths(self):
+        return self._paths
+
+    @property
+    def construction(self):
+        return self._construction
+
+    @property
+    def dimension(self):
+        return self._dimension
+
+    def __len__(self):
+        return self._steps
+
+    def _bridge_plan(self):
+        # (point, left, right) in construction order, the index 0 being
+        # W_0 = 0: the last point, then the midpoints breadth first.
+        plan = [(self._steps, 0, None)]
+        intervals = [(0, self._steps)]
+        while intervals:
+            left, right = intervals.pop(0)
+            if right - left > 1:
+                middle = (left + right) // 2
+                plan.append((middle, left, right))
+                intervals += [(left, middle), (middle, right)]
+        return plan
+
+    def _brownian_motion(self, normals):
+        dt = self._dt
+
+        if self._construction == "incremental":
+            return np.cumsum(normals * math.sqrt(dt), axis=0)
+
+        if self._construction == "pca":
+            return np.tensordot(_pca_factor(self._steps, dt), normals, axes=1)
+
+        W = np.zeros((self._steps + 1, *normals.shape[1:]))
+        for z, (point, left, right) in zip(normals, self._bridge_plan()):
+            if right is None:
+                W[point] = math.sqrt(point * dt) * z
+                continue
+            weight = (point - left) / (right - left)
+            std = math.sqrt((point - left) * (right - point) / (right - left) * dt)
+            W[point] = (1 - weight) * W[left] + weight * W[right] + std * z
+
+        return W[1:]
+
+    def __iter__(self):
+        points = self._sequence.points(self._start, self._paths)
+        if self._dimension == 1:
+            normals = inverse_normal_cdf(points.T)
+        else:
+            normals = inverse_normal_cdf(
+                points.reshape(self._paths, self._steps, self._dimension).transpose(1, 0, 2)
+            )
+        W = self._brownian_motion(normals)
+        if self._cholesky is not None:
+            W = np.matmul(W, self._cholesky.T)
+        increments = np.diff(W, axis=0, prepend=np.zeros((1, *W.shape[1:])))
+
+        yield from increments
@@ -0,0 +1,71 @@
+import numpy as np
+
+from numerical_analysis.sde.quasi_random import inverse_normal_cdf
+
+
+class RunningMoments:
+    """
+    Count, mean and sum of squared deviations (M2) of a stream of samples,
+    updated a batch at a time and merged with Chan et al.'s pairwise
+    formulas, which stay accurate where sum(x^2) - n mean^2 cancels. The
+    samples are indexed by their first axis, so several statistics can be
+    tracked at once.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def variance(self):
+        # Sample variance (n - 1 degrees of freedom), nan shaped like the
+        # statistics until there are two samples.
+        return self._m2 / (self._count - 1) if self._count > 1 else np.nan * self._m2
+
+    @property
+    def std_error(self):
+        return np.sqrt(self.variance / self._count)
+
+    def confidence_interval(self, level: float = 0.95):
+        half_width = inverse_normal_cdf(0.5 + level / 2) * self.std_error
+        return self._mean - half_width, self._mean + half_width
+
+    @classmethod
+    def from_moments(cls, count, mean, m2=0.0):
+        # With m2 = 0, count samples equal to mean: a batch mean weighted by
+        # the batch size.
+        moments = cls()
+        moments._count, moments._mean, moments._m2 = count, mean, m2
+        return moments
+
+    def update(self, samples):
+        samples = np.asarray(samples, dtype=float)
+        mean = samples.mean(axis=0)
+
+        return self.merge(
+            RunningMoments.from_moments(samples.shape[0], mean, ((samples - mean) ** 2).sum(axis=0))
+        )
+
+    def merge(self, other: "RunningMoments"):
+        count = self._count + other._count
+        if other._count == 0:
+            return self
+        if self._count == 0:
+            self._count, self._mean, self._m2 = other._count, other._mean, other._m2
+            return self
+
+        delta = other._mean - self._mean
+        self._mean = self._mean + delta * other._count / count
+        self._m2 = self._m2 + other._m2 + delta**2 * self._count * other._count / count
+        self._count = count
+
+        return self
@@ -1,3 +1,4 @@
+import sys
 import math
 import numpy as np
 
@@ -5,7 +6,23 @@ from abc import ABC, abstractmethod
 from typing import Callable
 
 
+def _normal_cdf(x):
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
 class SDE(ABC):
+    """
+    dX = a(X, t) dt + b(X, t) dW. With an array X0 of d components, X is a
+    (paths, d) array, a and b return (paths, d) arrays (component i of the
+    diffusion multiplies dW_i) and correlation is the d x d correlation
+    matrix of the Brownian motions, whose Cholesky factor is computed once.
+
+    A time homogeneous sde whose transition is known in closed form
+    overrides transition, which NumericalSDE then uses instead of its scheme.
+    One whose coefficients' derivatives with respect to its parameters are
+    known overrides coefficient_derivatives, for NumericalSDE.greeks.
+    """
+
     def __init__(
         self,
         a: Callable,
@@ -13,12 +30,20 @@ class SDE(ABC):
         X0: float,
         T: float,
         t0: float = 0,
+        correlation=None,
     ):
         self._a = a
         self._b = b
         self._X0 = X0
         self._t0 = t0
         self._T = T
+        self._correlation = None if correlation is None else np.asarray(correlation, dtype=float)
+        self._cholesky = None
+
+        if self._correlation is not None:
+            if self._correlation.shape != (self.dimension, self.dimension):
+                sys.exit("The correlation matrix should be d x d, d the dimension of X0")
+            self._cholesky = np.linalg.cholesky(self._correlation)
 
     @property
     def a(self):
@@ -40,10 +65,57 @@ class SDE(ABC):
     def t0(self):
         return self._t0
 
+    @property
+    def dimension(self):
+        return np.size(self._X0)
+
+    @property
+    def correlation(self):
+        return self._correlation
+
+    @property
+    def cholesky(self):
+        # Lower triangular L with L L^T = correlation (None if uncorrelated).
+        return self._cholesky
+
     @abstractmethod
     def b_derivative(self, X, t):
         return NotImplementedError()
 
+    def a_derivative(self, X, t):
+        # Central difference, for the sdes that don't override it.
+        h = np.cbrt(np.finfo(float).eps) * np.maximum(1, np.abs(X))
+        return (self._a(X + h, t) - self._a(X - h, t)) / (2 * h)
+
+    def coefficient_derivatives(self, X, t):
+        """
+        {parameter: (da/dp, db/dp)} at X for every parameter p of the
+        coefficients.
+        """
+        raise NotImplementedError()
+
+    @property
+    def has_transition(self):
+        return type(self).transition is not SDE.transition
+
+    def transition(self, X, dt, brownian_motion):
+        """
+        Exact X_{t + dt} given X_t and the Brownian increment over dt.
+        """
+        raise NotImplementedError()
+
+    @property
+    def has_transition_derivatives(self):
+        return type(self).transition_derivatives is not SDE.transition_derivatives
+
+    def transition_derivatives(self, X, dt, brownian_motion):
+        """
+        {parameter: (dX_{t + dt}/dp, d log p(X_{t + dt} | X_t)/dp)} for the
+        exact transition, with "X0" the derivatives with respect to X_t: the
+        pathwise and likelihood ratio weights of NumericalSDE.greeks.
+        """
+        raise NotImplementedError()
+
 
 class GBM(SDE):
     def __init__(self, mu: float, sigma: float, *args, **kwargs):
@@ -65,9 +137,45 @@ class GBM(SDE):
     def sigma_func(self, X, t):
         return self._sigma * X
 
+    def a_derivative(self, X, t):
+        return self._mu
+
     def b_derivative(self, X, t):
         return self._sigma
 
+    def coefficient_derivatives(self, X, t):
+        return {"mu": (X, 0), "sigma": (0, X)}
+
+    def transition(self, X, dt, brownian_motion):
+        return X * np.exp((self._mu - self._sigma**2 / 2) * dt + self._sigma * brownian_motion)
+
+    def transition_derivatives(self, X, dt, brownian_motion):
+        # log X_{t + dt} is normal, of mean log X_t + (mu - sigma^2 / 2) dt
+        # and variance sigma^2 dt, so the scores are polynomials in W.
+        W = brownian_motion
+        X_next = self.transition(X, dt, W)
+        return {
+            "X0": (X_next / X, W / (X * self._sigma * dt)),
+            "mu": (X_next * dt, W / self._sigma),
+            "sigma": (X_next * (W - self._sigma * dt), (W**2 - dt) / (self._sigma * dt) - W),
+        }
+
+    def mean(self, t: float):
+        # X_t is log-normal: X0 exp((mu - sigma^2 / 2) (t - t0) + sigma W).
+        return self._X0 * math.exp(self._mu * (t - self._t0))
+
+    def call_expectation(self, K: float, t: float):
+        """
+        Undiscounted E[max(X_t - K, 0)] (Black-Scholes with rate mu).
+        """
+        tau = t - self._t0
+        d1 = (math.log(self._X0 / K) + (self._mu + self._sigma**2 / 2) * tau) / (
+            self._sigma * math.sqrt(tau)
+        )
+        d2 = d1 - self._sigma * math.sqrt(tau)
+
+        return self.mean(t) * _normal_cdf(d1) - K * _normal_cdf(d2)
+
 
 class GBMStochasticVol(SDE):
     def __init__(
@@ -111,3 +219,105 @@ class GBMStochasticVol(SDE):
             * np.sin((2 * math.pi * X) / self._K)
             * ((2 * math.pi) / self._K)
         ) * X + self.sigma_func(X,t) / X
+
+    def a_derivative(self, X, t):
+        return self._mu
+
+    def coefficient_derivatives(self, X, t):
+        return {
+            "mu": (X, 0),
+            "sigma0": (0, X),
+            "sigma1": (
+                0,
+                np.cos((2 * math.pi * X) / self._K) * np.sin((2 * math.pi * t) / self._K) * X,
+            ),
+        }
+
+
+class CorrelatedGBM(SDE):
+    """
+    d assets dX_i = mu_i X_i dt + sigma_i X_i dW_i, the Brownian motions
+    correlated by correlation: a basket.
+    """
+
+    def __init__(self, mu, sigma, *args, **kwargs):
+        self._mu = np.asarray(mu, dtype=float)
+        self._sigma = np.asarray(sigma, dtype=float)
+        super().__init__(a=self.mu_func, b=self.sigma_func, *args, **kwargs)
+
+    @property
+    def mu(self):
+        return self._mu
+
+    @property
+    def sigma(self):
+        return self._sigma
+
+    def mu_func(self, X, t):
+        return self._mu * X
+
+    def sigma_func(self, X, t):
+        return self._sigma * X
+
+    def b_derivative(self, X, t):
+        return np.broadcast_to(self._sigma, np.shape(X))
+
+    def transition(self, X, dt, brownian_motion):
+        return X * np.exp((self._mu - self._sigma**2 / 2) * dt + self._sigma * brownian_motion)
+
+
+class Heston(SDE):
+    """
+    Stochastic volatility X = (S, v): dS = mu S dt + sqrt(v) S dW_1,
+    dv = kappa (theta - v) dt + xi sqrt(v) dW_2 with corr(dW_1, dW_2) = rho.
+    The discretized variance can go negative, so the coefficients use
+    max(v, 0) (full truncation).
+    """
+
+    def __init__(self, mu, kappa, theta, xi, rho, *args, **kwargs):
+        self._mu = mu
+        self._kappa = kappa
+        self._theta = theta
+        self._xi = xi
+        self._rho = rho
+        super().__init__(
+            a=self.mu_func, b=self.sigma_func, *args, correlation=[[1, rho], [rho, 1]], **kwargs
+        )
+
+    @property
+    def mu(self):
+        return self._mu
+
+    @property
+    def kappa(self):
+        return self._kappa
+
+    @property
+    def theta(self):
+        return self._theta
+
+    @property
+    def xi(self):
+        return self._xi
+
+    @property
+    def rho(self):
+        return self._rho
+
+    def mu_func(self, X, t):
+        v = np.maximum(X[:, 1], 0)
+        return np.column_stack([self._mu * X[:, 0], self._kappa * (self._theta - v)])
+
+    def sigma_func(self, X, t):
+        volatility = np.sqrt(np.maximum(X[:, 1], 0))
+        return np.column_stack([volatility * X[:, 0], self._xi * volatility])
+
+    def b_derivative(self, X, t):
+        # Diagonal terms d b_i / d X_i only.
+        volatility = np.sqrt(np.maximum(X[:, 1], 0))
+        return np.column_stack(
+            [
+                volatility,
+                np.divide(self._xi, 2 * volatility, out=np.zeros_like(volatility), where=volatility > 0),
+            ]
+        )
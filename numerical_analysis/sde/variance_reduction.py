@@ -0,0 +1,191 @@
+import numpy as np
+
+from typing import Callable, Dict
+
+from numerical_analysis.sde.path_reducers import PathReducer
+from numerical_analysis.sde.quasi_random import inverse_normal_cdf
+from numerical_analysis.sde.running_moments import RunningMoments
+
+
+class ControlVariate:
+    """
+    A payoff of the paths of another scheme, driven by the same Brownian
+    increments as the estimated one, whose expectation mean is known: e.g. a
+    GBM with the constant volatility sigma0 of a GBMStochasticVol, with
+    mean=GBM.call_expectation(K, T). A scheme with discretization bias
+    carries it into the estimate, O(dt) for Euler-Maruyama.
+    """
+
+    def __init__(
+        self,
+        scheme,
+        payoff: Callable,
+        mean: float,
+        reducers: Dict[str, PathReducer],
+    ):
+        self._scheme = scheme
+        self._payoff = payoff
+        self._mean = mean
+        self._reducers = reducers
+
+    @property
+    def scheme(self):
+        return self._scheme
+
+    @property
+    def payoff(self):
+        return self._payoff
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def reducers(self):
+        return self._reducers
+
+
+class MonteCarloEstimate:
+    """
+    A Monte Carlo estimate with its standard error, and the variance
+    reduction factor achieved: the variance of the plain estimator over the
+    same number of paths divided by the variance of this one.
+    """
+
+    def __init__(self, value, std_error, paths, variance_reduction_factor=1.0):
+        self._value = value
+        self._std_error = std_error
+        self._paths = paths
+        self._variance_reduction_factor = variance_reduction_factor
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def std_error(self):
+        return self._std_error
+
+    @property
+    def paths(self):
+        return self._paths
+
+    @property
+    def variance_reduction_factor(self):
+        return self._variance_reduction_factor
+
+    def half_width(self, level: float = 0.95):
+        # Of the normal confidence interval, nan without a standard error.
+        return float(inverse_normal_cdf(0.5 + level / 2)) * self._std_error
+
+    def confidence_interval(self, level: float = 0.95):
+        half_width = self.half_width(level)
+        return self._value - half_width, self._value + half_width
+
+    def __float__(self):
+        return float(self._value)
+
+    def __repr__(self):
+        return (
+            f"MonteCarloEstimate(value={self._value}, std_error={self._std_error}, "
+            f"paths={self._paths}, variance_reduction_factor={self._variance_reduction_factor})"
+        )
+
+
+class _PlainEstimator:
+    """
+    Running moments of the payoff samples, chunk after chunk. Without error
+    (consecutive points of an unscrambled quasi random sequence) only the
+    mean is meaningful.
+    """
+
+    def __init__(self, error: bool = True):
+        self._error = error
+        self._samples = RunningMoments()
+
+    def update(self, samples, control_samples=None):
+        self._samples.update(samples)
+
+    def estimate(self):
+        if not self._error:
+            return MonteCarloEstimate(self._samples.mean, np.nan, self._samples.count, np.nan)
+        return MonteCarloEstimate(self._samples.mean, self._samples.std_error, self._samples.count)
+
+
+class _AntitheticEstimator:
+    # Path i and i + size / 2 of every chunk are an antithetic pair, the
+    # pairs' means are independent.
+
+    def __init__(self):
+        self._samples = RunningMoments()
+        self._pairs = RunningMoments()
+
+    def update(self, samples, control_samples=None):
+        half = samples.size // 2
+        self._samples.update(samples)
+        self._pairs.update((samples[:half] + samples[half:]) / 2)
+
+    def estimate(self):
+        return MonteCarloEstimate(
+            self._pairs.mean,
+            self._pairs.std_error,
+            2 * self._pairs.count,
+            self._samples.variance / (2 * self._pairs.variance),
+        )
+
+
+class _BatchMeansEstimator:
+    # Moment matched (or quasi random) paths aren't independent within a
+    # chunk, only the chunk means are: the error is estimated from their
+    # spread, each weighted by its chunk's size (nan with a single chunk).
+
+    def __init__(self):
+        self._samples = RunningMoments()
+        self._means = RunningMoments()
+        self._chunks = 0
+
+    def update(self, samples, control_samples=None):
+        self._samples.update(samples)
+        self._means.merge(RunningMoments.from_moments(samples.size, samples.mean()))
+        self._chunks += 1
+
+    def estimate(self):
+        value, paths = self._samples.mean, self._samples.count
+        if self._chunks < 2:
+            return MonteCarloEstimate(value, np.nan, paths, np.nan)
+
+        # Sum of size (mean - value)^2 over the chunks, per degree of freedom.
+        means_variance = self._means.variance * (paths - 1) / (self._chunks - 1)
+        return MonteCarloEstimate(
+            value, np.sqrt(means_variance / paths), paths, self._samples.variance / means_variance
+        )
+
+
+class _ControlVariateEstimator:
+    # Y - beta (C - E[C]) with the variance minimizing beta = cov(Y, C) / var(C),
+    # which reduces the variance by 1 / (1 - corr(Y, C)^2). The running
+    # moments of (Y, C, Y + C, Y - C) give cov(Y, C) by polarization.
+
+    def __init__(self, control_mean):
+        self._control_mean = control_mean
+        self._samples = RunningMoments()
+
+    def update(self, samples, control_samples=None):
+        self._samples.update(
+            np.column_stack(
+                [samples, control_samples, samples + control_samples, samples - control_samples]
+            )
+        )
+
+    def estimate(self):
+        mean, variance = self._samples.mean, self._samples.variance
+        covariance = (variance[2] - variance[3]) / 4
+        beta = covariance / variance[1]
+        controlled_variance = variance[0] - beta * covariance
+
+        return MonteCarloEstimate(
+            mean[0] - beta * (mean[1] - self._control_mean),
+            np.sqrt(controlled_variance / self._samples.count),
+            self._samples.count,
+            variance[0] / controlled_variance,
+        )
@@ -1 +1,14 @@
-from numerical_analysis.solution_of_equations.fixpoint_methods import NewtonRaphson, Secant
\ No newline at end of file
+from numerical_analysis.solution_of_equations.fixpoint_methods import (
+    NewtonRaphson,
+    Secant,
+    Halley,
+    Steffensen,
+    Aitken,
+)
+from numerical_analysis.solution_of_equations.bracketing_methods import (
+    BracketingMethods,
+    Bisection,
+    Illinois,
+    Ridder,
+    Brent,
+)
@@ -0,0 +1,223 @@
+import sys
+import warnings
+import numpy as np
+
+from numerical_analysis.solution_of_equations.fixpoint_methods import FixPointMethods
+
+
+class BracketingMethods(FixPointMethods):
+    """
+    Root finding inside a bracket [a, b] where the function changes sign,
+    solved with solve(a, b, *args). Every iteration keeps a sign change
+    inside the bracket, so the methods converge whatever the function, and
+    they stop when the bracket is narrower than tol (or the root is hit).
+    a and b can be arrays of brackets, as x0 in FixPointMethods: those
+    without a sign change are solved as nan, with a warning, instead of
+    stopping the whole batch.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def solve(self, a, b, *args, **kwargs):
+        shape = np.broadcast_shapes(np.shape(a), np.shape(b), *(np.shape(arg) for arg in args))
+        if shape:
+            a = np.broadcast_to(np.asarray(a, dtype=float), shape)
+        self._upper = np.broadcast_to(np.asarray(b, dtype=float), shape).ravel()
+
+        solution = super().solve(a, *args, **kwargs)
+
+        return solution if shape else float(solution)
+
+    def _bracket(self, x0):
+        a, b = x0, self._upper if np.ndim(x0) > 0 else self._upper[0]
+        fa, fb = self._call(self._function, a), self._call(self._function, b)
+
+        invalid = np.sign(fa) * np.sign(fb) > 0
+        if np.ndim(x0) == 0 and invalid:
+            sys.exit("The function should have opposite signs at the ends of the bracket")
+        if np.any(invalid):
+            warnings.warn(f"{invalid.sum()} brackets without a sign change, their solution is nan")
+            a, b = np.where(invalid, np.nan, a), np.where(invalid, np.nan, b)
+            fa, fb = np.where(invalid, np.nan, fa), np.where(invalid, np.nan, fb)
+
+        return a, b, fa, fb
+
+    def _step_size(self, previous_x, params):
+        return params["width"]
+
+
+class Bisection(BracketingMethods):
+    """
+    Halves the bracket at every iteration: log2((b - a) / tol) iterations,
+    one function evaluation each.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, x0):
+        a, b, fa, fb = self._bracket(x0)
+        return {"a": a, "b": b, "fa": fa, "x": a, "width": np.abs(b - a)}
+
+    def iterate(self, params):
+        a, b, fa = params["a"], params["b"], params["fa"]
+        x = (a + b) / 2
+        fx = self._call(self._function, x)
+        left = np.sign(fx) == np.sign(fa)
+
+        params["a"], params["fa"] = np.where(left, x, a), np.where(left, fx, fa)
+        params["b"] = np.where(left, b, x)
+        params["x"] = x
+        params["width"] = np.where(fx == 0, 0, np.abs(params["b"] - params["a"]))
+
+        return params
+
+
+class Illinois(BracketingMethods):
+    """
+    Regula falsi that halves the function value kept at the end of the
+    bracket which is not replaced, so both ends move towards the root
+    (superlinear convergence, where plain regula falsi can stall on one end).
+
+    Near multiple roots it can still be slow, so after three iterations that
+    don't halve the bracket it bisects: at most 4 log2((b - a) / tol)
+    iterations.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, x0):
+        a, b, fa, fb = self._bracket(x0)
+        return {
+            "a": a,
+            "b": b,
+            "fa": fa,
+            "fb": fb,
+            "x": b,
+            "width": np.abs(b - a),
+            "stalled": np.zeros(np.shape(a), dtype=int),
+        }
+
+    def iterate(self, params):
+        a, b, fa, fb = params["a"], params["b"], params["fa"], params["fb"]
+        bisect = params["stalled"] >= 3
+        x = np.where(bisect, (a + b) / 2, (a * fb - b * fa) / (fb - fa))
+        fx = self._call(self._function, x)
+        sign_change = np.sign(fx) != np.sign(fb)
+
+        params["a"] = np.where(sign_change, b, a)
+        params["fa"] = np.where(sign_change, fb, np.where(bisect, fa, fa / 2))
+        params["b"], params["fb"], params["x"] = x, fx, x
+        width = np.where(fx == 0, 0, np.abs(x - params["a"]))
+        params["stalled"] = np.where(width > params["width"] / 2, params["stalled"] + 1, 0)
+        params["width"] = width
+
+        return params
+
+
+class Ridder(BracketingMethods):
+    """
+    Ridders' method: the function at a, (a + b) / 2 and b is made linear by
+    an exponential factor, whose root is the new estimate. Quadratic
+    convergence with two function evaluations per iteration.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, x0):
+        a, b, fa, fb = self._bracket(x0)
+        return {"a": a, "b": b, "fa": fa, "fb": fb, "x": b, "width": np.abs(b - a)}
+
+    def iterate(self, params):
+        a, b, fa, fb = params["a"], params["b"], params["fa"], params["fb"]
+        m = (a + b) / 2
+        fm = self._call(self._function, m)
+        s = np.sqrt(fm**2 - fa * fb)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.where(s == 0, m, m + (m - a) * np.sign(fa - fb) * fm / s)
+        fx = self._call(self._function, x)
+
+        # The new bracket is the narrowest sign change among a, m, x and b.
+        m_x = np.sign(fm) != np.sign(fx)
+        a_x = np.sign(fa) != np.sign(fx)
+        params["a"] = np.where(m_x, m, np.where(a_x, a, x))
+        params["fa"] = np.where(m_x, fm, np.where(a_x, fa, fx))
+        params["b"] = np.where(m_x | a_x, x, b)
+        params["fb"] = np.where(m_x | a_x, fx, fb)
+        params["x"] = x
+        params["width"] = np.where(fx == 0, 0, np.abs(params["b"] - params["a"]))
+
+        return params
+
+
+class Brent(BracketingMethods):
+    """
+    Brent's method: inverse quadratic interpolation (or secant) steps when
+    they stay well inside the bracket and shrink it fast enough, bisection
+    otherwise. As fast as the secant method on smooth functions and never
+    much slower than bisection.
+
+    b is the best estimate and c the other end of the bracket.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, x0):
+        a, b, fa, fb = self._bracket(x0)
+        params = {"a": a, "b": b, "c": b, "fa": fa, "fb": fb, "fc": fb}
+        params["d"] = params["e"] = b - a
+
+        return self._contrapoint(params)
+
+    def _contrapoint(self, params):
+        # c is moved to keep the sign change in [b, c], then b and c are
+        # swapped if c is the better estimate.
+        a, b, c, fa, fb, fc = (params[key] for key in ("a", "b", "c", "fa", "fb", "fc"))
+
+        same_sign = np.sign(fb) == np.sign(fc)
+        c, fc = np.where(same_sign, a, c), np.where(same_sign, fa, fc)
+        params["d"] = np.where(same_sign, b - a, params["d"])
+        params["e"] = np.where(same_sign, b - a, params["e"])
+
+        swap = np.abs(fc) < np.abs(fb)
+        params["a"], params["fa"] = np.where(swap, b, a), np.where(swap, fb, fa)
+        params["b"], params["fb"] = np.where(swap, c, b), np.where(swap, fc, fb)
+        params["c"], params["fc"] = np.where(swap, b, c), np.where(swap, fb, fc)
+        params["x"] = params["b"]
+        params["width"] = np.where(params["fb"] == 0, 0, np.abs(params["c"] - params["b"]))
+
+        return params
+
+    def iterate(self, params):
+        a, b, c, fa, fb, fc, d, e = (
+            params[key] for key in ("a", "b", "c", "fa", "fb", "fc", "d", "e")
+        )
+        tol = 2 * np.finfo(float).eps * np.abs(b) + 0.5 * self._tol
+        xm = 0.5 * (c - b)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = fb / fa
+            q, r = fa / fc, fb / fc
+            secant = a == c
+            p = np.where(secant, 2 * xm * s, s * (2 * xm * q * (q - r) - (b - a) * (r - 1)))
+            q = np.where(secant, 1 - s, (q - 1) * (r - 1) * (s - 1))
+            q = np.where(p > 0, -q, q)
+            p = np.abs(p)
+
+            interpolate = (
+                (np.abs(e) >= tol)
+                & (np.abs(fa) > np.abs(fb))
+                & (2 * p < np.minimum(3 * xm * q - np.abs(tol * q), np.abs(e * q)))
+            )
+            params["e"] = np.where(interpolate, d, xm)
+            d = params["d"] = np.where(interpolate, p / q, xm)
+
+        params["a"], params["fa"] = b, fb
+        params["b"] = b + np.where(np.abs(d) > tol, d, np.copysign(tol, xm))
+        params["fb"] = self._call(self._function, params["b"])
+
+        return self._contrapoint(params)
@@ -1,9 +1,42 @@
+import sys
+import warnings
+import numpy as np
+
 from abc import ABC, abstractmethod
 
-class FixPointMethods(ABC):
-    def __init__(self, function, tol=10**-4, max_iter=1000):
+from numerical_analysis.instrumentation.solver_trace import TracedSolver
+
+
+def _divide(numerator, denominator, residual):
+    # Where the denominator vanishes: 0 if the residual does too (the
+    # iteration has converged), nan otherwise (a failed step, the denominator
+    # can vanish away from a root). Scalars stay scalars.
+    zero = np.where(residual == 0, 0.0, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quotient = np.where(denominator == 0, zero, np.divide(numerator, denominator))
+
+    return quotient if quotient.ndim else float(quotient)
+
+
+class FixPointMethods(TracedSolver, ABC):
+    """
+    Root finding by iterating x_{k+1} = g(x_k) until |x_{k+1} - x_k| <= tol.
+
+    solve(x0, *args) calls function(x, *args). x0 can also be an array of
+    starting points, one independent equation each, with args holding
+    arrays of per equation parameters (scalars are shared): function (and
+    derivative) are then called on arrays, and the elements that converge
+    leave the iteration state along with their parameters, so every
+    iteration only evaluates the equations still active.
+
+    A non-finite step (a vanishing derivative, an overflow) is a failure,
+    not convergence: the solution is nan, with a warning.
+    """
+
+    def __init__(self, function, tol=10**-4, max_iter=1000, trace=None):
 
-        self._function = function
+        self._trace = trace
+        self._function = self._counted("function", function)
         self._tol = tol
         self._max_iter = max_iter
 
@@ -27,35 +60,90 @@ class FixPointMethods(ABC):
     def iterate(self, params) -> float:
         raise NotImplementedError()
 
+    def _call(self, function, x):
+        return function(x, *self._args)
+
     def solve(self, x0, *args, **kwargs):
+        if np.ndim(x0) > 0:
+            return self._solve_batch(x0, args)
+
         i = 0
+        self._args = args
+        self._start_trace()
         params = self.initialize(x0)
         continue_iterate = True
+        failures = 0
         while i < self._max_iter and continue_iterate:
             previous_x = params["x"]
             params = self.iterate(params)
-            continue_iterate = self._stopping_condition(previous_x, params["x"])
+            step = self._step_size(previous_x, params)
+            continue_iterate = self._stopping_condition(step)
             i += 1
 
-        self._warning(i)
+            if not np.isfinite(step):
+                failures = 1
+                params["x"] = np.nan
+                break
+
+        self._warning(i, failures)
 
         return params["x"]
 
-    def _stopping_condition(self, x, new_x):
-        return abs(x - new_x) > self._tol
+    def _solve_batch(self, x0, args):
+        i = 0
+        self._start_trace()
+        x0 = np.asarray(x0, dtype=float)
+        self._args = tuple(
+            np.broadcast_to(arg, x0.shape).ravel() if np.ndim(arg) > 0 else arg for arg in args
+        )
+        params = self.initialize(x0.ravel().copy())
+        solution = np.empty(x0.size)
+        active = np.arange(x0.size)
+        failures = 0
 
-    def _warning(self, iterations):
-        if iterations == self._max_iter:
-            import warnings
+        while i < self._max_iter and active.size > 0:
+            previous_x = params["x"]
+            params = self.iterate(params)
+            step = self._step_size(previous_x, params)
+            failed = ~np.isfinite(step)
+            continue_iterate = self._stopping_condition(step) & ~failed
+            i += 1
 
-            message = f"Algorithm did converge in {self._max_iter} iterations"
+            if not continue_iterate.all():
+                failures += failed.sum()
+                params["x"][failed] = np.nan
+                solution[active[~continue_iterate]] = params["x"][~continue_iterate]
+                active = active[continue_iterate]
+                params = {key: value[continue_iterate] for key, value in params.items()}
+                self._args = tuple(
+                    arg[continue_iterate] if np.ndim(arg) > 0 else arg for arg in self._args
+                )
+
+        solution[active] = params["x"]
+        self._warning(i, failures)
+
+        return solution.reshape(x0.shape)
+
+    def _step_size(self, previous_x, params):
+        return np.abs(params["x"] - previous_x)
+
+    def _stopping_condition(self, step):
+        self._record_trace(step)
+        return step > self._tol
+
+    def _warning(self, iterations, failures=0):
+        self._finish_trace(iterations, failed=failures > 0)
+        if iterations == self._max_iter:
+            message = f"Algorithm did not converge in {self._max_iter} iterations"
             warnings.warn(message)
+        if failures:
+            warnings.warn(f"{failures} equations failed with a non-finite step, their solution is nan")
 
 
 class NewtonRaphson(FixPointMethods):
     def __init__(self, derivative, *args, **kwargs):
-        self._derivative = derivative
         super().__init__(*args, **kwargs)
+        self._derivative = self._counted("derivative", derivative)
 
     @property
     def derivative(self):
@@ -65,8 +153,10 @@ class NewtonRaphson(FixPointMethods):
         return {"x": x0}
 
     def iterate(self, params):
-        x = params["x"] - self._function(params["x"]) / self._derivative(params["x"])
-        return {"x": x}
+        x = params["x"]
+        params["x"] = x - self._call(self._function, x) / self._call(self._derivative, x)
+
+        return params
 
 
 class Secant(FixPointMethods):
@@ -74,12 +164,122 @@ class Secant(FixPointMethods):
         super().__init__(*args, **kwargs)
 
     def initialize(self, x0):
-        x1 = x0 * 1.1
-        return {"x0": x0, "x": x1, "q0": self._function(x0), "q1": self._function(x1)}
+        # The second point is a 10% step from x0, at least 0.1 so it doesn't
+        # coincide with x0 = 0.
+        x1 = x0 + 0.1 * np.maximum(np.abs(x0), 1)
+        return {
+            "x0": x0,
+            "x": x1,
+            "q0": self._call(self._function, x0),
+            "q1": self._call(self._function, x1),
+        }
+
+    def iterate(self, params):
+        x = params["x"] - _divide(
+            params["q1"] * (params["x"] - params["x0"]), params["q1"] - params["q0"], params["q1"]
+        )
+        params["x0"], params["q0"] = params["x"], params["q1"]
+        params["x"], params["q1"] = x, self._call(self._function, x)
+
+        return params
+
+
+class Halley(FixPointMethods):
+    """
+    x - 2 f f' / (2 f'^2 - f f''): cubic convergence to simple roots, with
+    the second derivative.
+    """
+
+    def __init__(self, derivative, second_derivative, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._derivative = self._counted("derivative", derivative)
+        self._second_derivative = self._counted("second_derivative", second_derivative)
+
+    @property
+    def derivative(self):
+        return self._derivative
+
+    @property
+    def second_derivative(self):
+        return self._second_derivative
+
+    def initialize(self, x0):
+        return {"x": x0}
 
     def iterate(self, params):
-        x = params["x"] - params["q1"] * (params["x"] - params["x0"]) / (
-            params["q1"] - params["q0"]
+        x = params["x"]
+        f = self._call(self._function, x)
+        derivative = self._call(self._derivative, x)
+        second_derivative = self._call(self._second_derivative, x)
+        params["x"] = x - _divide(
+            2 * f * derivative, 2 * derivative**2 - f * second_derivative, f
         )
 
-        return {"x": x, "x0": params["x"], "q0": params["q1"], "q1": self._function(x)}
+        return params
+
+
+class Steffensen(FixPointMethods):
+    """
+    Newton's method with f' replaced by (f(x + f(x)) - f(x)) / f(x):
+    quadratic convergence without derivatives, two evaluations per iteration.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, x0):
+        return {"x": x0}
+
+    def iterate(self, params):
+        x = params["x"]
+        f = self._call(self._function, x)
+        # f below the resolution of x (x + f == x) leaves a zero denominator
+        # at a root to machine precision.
+        params["x"] = x - _divide(f**2, self._call(self._function, x + f) - f, (x + f) - x)
+
+        return params
+
+
+class Aitken(FixPointMethods):
+    """
+    Aitken's delta squared acceleration of a fixed point iteration
+    x_{k+1} = g(x_k): every iteration takes two steps of g and restarts from
+    the extrapolated x2 - (x2 - x1)^2 / (x2 - 2 x1 + x0), which turns a
+    linearly convergent g into a quadratically convergent iteration.
+
+    method is either the map g or a FixPointMethods, whose step from x (its
+    initialize then iterate) is used as g. Bracketing methods step from a
+    bracket, not a point, so they can't be wrapped.
+    """
+
+    def __init__(self, method, *args, **kwargs):
+        self._method = method
+
+        # Imported here, bracketing_methods builds on this module.
+        from numerical_analysis.solution_of_equations.bracketing_methods import BracketingMethods
+
+        if isinstance(method, BracketingMethods):
+            sys.exit("Aitken needs a fixed point method, bracketing methods don't step from a point")
+
+        if isinstance(method, FixPointMethods):
+
+            def method(x, *args):
+                self._method._args = args
+                return self._method.iterate(self._method.initialize(x))["x"]
+
+        super().__init__(method, *args, **kwargs)
+
+    @property
+    def method(self):
+        return self._method
+
+    def initialize(self, x0):
+        return {"x": x0}
+
+    def iterate(self, params):
+        x0 = params["x"]
+        x1 = self._call(self._function, x0)
+        x2 = self._call(self._function, x1)
+        params["x"] = x2 - _divide((x2 - x1) ** 2, x2 - 2 * x1 + x0, x1 - x0)
+
+        return params
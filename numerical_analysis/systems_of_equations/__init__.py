@@ -1,3 +1,30 @@
 from numerical_analysis.systems_of_equations.equations_system import EquationsSystems
-from numerical_analysis.systems_of_equations.linear_systems import GaussSeidel, Jacobi, SOR
-from numerical_analysis.systems_of_equations.nonlinear_systems import Newtons
\ No newline at end of file
+from numerical_analysis.systems_of_equations.linear_systems import (
+    GaussSeidel,
+    Jacobi,
+    WeightedJacobi,
+    SOR,
+)
+from numerical_analysis.systems_of_equations.nonlinear_systems import Newtons
+from numerical_analysis.systems_of_equations.direct_systems import (
+    DirectSystems,
+    LU,
+    BandedSystems,
+    Thomas,
+    BandedLU,
+    tridiagonal_solver,
+)
+from numerical_analysis.systems_of_equations.sparse_matrix import CSRMatrix
+from numerical_analysis.systems_of_equations.jacobians import FiniteDifferenceJacobian
+from numerical_analysis.systems_of_equations.krylov_methods import (
+    KrylovMethods,
+    ConjugateGradient,
+    GMRES,
+    BiCGSTAB,
+)
+from numerical_analysis.systems_of_equations.preconditioners import (
+    Preconditioner,
+    JacobiPreconditioner,
+    SSORPreconditioner,
+    ILUPreconditioner,
+)
@@ -0,0 +1,277 @@
+import sys
+import numpy as np
+
+from abc import ABC, abstractmethod
+
+
+class DirectSystems(ABC):
+    def __init__(self):
+        self._factorized = False
+
+    @property
+    def factorized(self):
+        return self._factorized
+
+    @abstractmethod
+    def factorize(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _substitute(self, b):
+        raise NotImplementedError()
+
+    def solve(self, b):
+        if not self._factorized:
+            self.factorize()
+
+        return self._substitute(np.array(b, dtype=float))
+
+
+class LU(DirectSystems):
+    def __init__(self, mat):
+        super().__init__()
+        self._mat = np.asarray(mat, dtype=float)
+        self._n = self._mat.shape[0]
+
+        if self._mat.shape[0] != self._mat.shape[1]:
+            sys.exit("The matrix is not squared")
+
+    @property
+    def mat(self):
+        return self._mat
+
+    @property
+    def shape(self):
+        return self._mat.shape
+
+    def dot(self, x):
+        return self._mat.dot(x)
+
+    def factorize(self):
+        lu = self._mat.copy()
+        pivots = np.arange(self._n)
+
+        for k in range(self._n):
+            p = k + int(np.argmax(np.abs(lu[k:, k])))
+            if lu[p, k] == 0:
+                sys.exit("The matrix is singular")
+            if p != k:
+                lu[[k, p]] = lu[[p, k]]
+                pivots[[k, p]] = pivots[[p, k]]
+            lu[k + 1 :, k] /= lu[k, k]
+            lu[k + 1 :, k + 1 :] -= np.outer(lu[k + 1 :, k], lu[k, k + 1 :])
+
+        self._lu = lu
+        self._pivots = pivots
+        self._factorized = True
+
+    def _substitute(self, b):
+        lu = self._lu
+        b = b[self._pivots]
+
+        for i in range(1, self._n):
+            b[i] -= lu[i, :i].dot(b[:i])
+
+        for i in range(self._n - 1, -1, -1):
+            b[i] = (b[i] - lu[i, (i + 1) :].dot(b[(i + 1) :])) / lu[i, i]
+
+        return b
+
+
+class BandedSystems(DirectSystems):
+    """
+    Banded matrix stored by diagonals: bands[ku + i - j, j] = A[i, j], for
+    the kl sub-diagonals and ku super-diagonals of A (LAPACK "ab" layout).
+    """
+
+    def __init__(self, bands, kl, ku):
+        super().__init__()
+        self._bands = np.asarray(bands, dtype=float)
+        self._kl = kl
+        self._ku = ku
+        self._n = self._bands.shape[1]
+
+        if self._bands.shape[0] != kl + ku + 1:
+            sys.exit("The bands don't match the lower and upper bandwidths")
+
+    @property
+    def bands(self):
+        return self._bands
+
+    @property
+    def kl(self):
+        return self._kl
+
+    @property
+    def ku(self):
+        return self._ku
+
+    @property
+    def shape(self):
+        return (self._n, self._n)
+
+    def _diagonals(self):
+        # Bands beyond the matrix (kl or ku >= n) are empty.
+        return range(max(-self._kl, -(self._n - 1)), min(self._ku, self._n - 1) + 1)
+
+    def dot(self, x):
+        x = np.asarray(x, dtype=float)
+        y = np.zeros(x.shape)
+        columns = (slice(None),) + (None,) * (x.ndim - 1)
+
+        for k in self._diagonals():
+            band = self._bands[self._ku - k][columns]
+            if k >= 0:
+                y[: self._n - k] += band[k:] * x[k:]
+            else:
+                y[-k:] += band[: self._n + k] * x[: self._n + k]
+
+        return y
+
+    def to_dense(self):
+        mat = np.zeros((self._n, self._n))
+        for k in self._diagonals():
+            band = self._bands[self._ku - k]
+            mat += np.diag(band[k:] if k >= 0 else band[: self._n + k], k)
+
+        return mat
+
+
+class Thomas(BandedSystems):
+    def __init__(self, lower, diag, upper):
+        diag = np.asarray(diag, dtype=float)
+        bands = np.zeros((3, diag.size))
+        bands[0, 1:] = upper
+        bands[1] = diag
+        bands[2, :-1] = lower
+        super().__init__(bands=bands, kl=1, ku=1)
+
+    @property
+    def lower(self):
+        return self._bands[2, :-1]
+
+    @property
+    def diag(self):
+        return self._bands[1]
+
+    @property
+    def upper(self):
+        return self._bands[0, 1:]
+
+    def factorize(self):
+        lower, diag, upper = self.lower, self.diag, self.upper
+        pivots = np.empty(self._n)
+        ratios = np.empty(self._n - 1)
+
+        pivots[0] = diag[0]
+        for i in range(1, self._n):
+            if pivots[i - 1] == 0:
+                sys.exit("Zero pivot found, the system should be solved with BandedLU")
+            ratios[i - 1] = upper[i - 1] / pivots[i - 1]
+            pivots[i] = diag[i] - lower[i - 1] * ratios[i - 1]
+
+        if pivots[-1] == 0:
+            sys.exit("Zero pivot found, the system should be solved with BandedLU")
+
+        self._inverse_pivots = 1 / pivots
+        self._ratios = ratios
+        self._factorized = True
+
+    def _substitute(self, b):
+        lower = self.lower
+        b[0] *= self._inverse_pivots[0]
+        for i in range(1, self._n):
+            b[i] = (b[i] - lower[i - 1] * b[i - 1]) * self._inverse_pivots[i]
+
+        for i in range(self._n - 2, -1, -1):
+            b[i] -= self._ratios[i] * b[i + 1]
+
+        return b
+
+
+class BandedLU(BandedSystems):
+    """
+    LU factorization with partial pivoting that keeps the band storage: row
+    interchanges widen U to kl + ku super-diagonals, so the factors are
+    stored in a (2 * kl + ku + 1, n) array.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def factorize(self):
+        n, kl, ku = self._n, self._kl, self._ku
+        kv = kl + ku
+        lu = np.zeros((2 * kl + ku + 1, n))
+        lu[kl:] = self._bands
+        pivots = np.arange(n)
+
+        ju = 0
+        for j in range(n):
+            km = min(kl, n - 1 - j)
+            jp = int(np.argmax(np.abs(lu[kv : kv + km + 1, j])))
+            if lu[kv + jp, j] == 0:
+                sys.exit("The matrix is singular")
+
+            pivots[j] = j + jp
+            ju = max(ju, min(j + ku + jp, n - 1))
+            columns = np.arange(j, ju + 1)
+
+            if jp != 0:
+                row_j = lu[kv + j - columns, columns]
+                lu[kv + j - columns, columns] = lu[kv + j + jp - columns, columns]
+                lu[kv + j + jp - columns, columns] = row_j
+
+            if km > 0:
+                lu[kv + 1 : kv + km + 1, j] /= lu[kv, j]
+                if ju > j:
+                    rows = np.arange(j + 1, j + km + 1)[:, None]
+                    columns = columns[None, 1:]
+                    lu[kv + rows - columns, columns] -= (
+                        lu[kv + 1 : kv + km + 1, j][:, None] * lu[kv + j - columns, columns]
+                    )
+
+        self._lu = lu
+        self._pivots = pivots
+        self._factorized = True
+
+    def _substitute(self, b):
+        n, kl, ku = self._n, self._kl, self._ku
+        kv = kl + ku
+        lu = self._lu
+
+        for j in range(n):
+            p = self._pivots[j]
+            if p != j:
+                b[[j, p]] = b[[p, j]]
+            km = min(kl, n - 1 - j)
+            if km > 0:
+                b[j + 1 : j + km + 1] -= np.multiply.outer(lu[kv + 1 : kv + km + 1, j], b[j])
+
+        for j in range(n - 1, -1, -1):
+            b[j] /= lu[kv, j]
+            top = max(0, j - kv)
+            if top < j:
+                b[top:j] -= np.multiply.outer(lu[kv + top - j : kv, j], b[j])
+
+        return b
+
+
+def tridiagonal_solver(lower, diag, upper):
+    """
+    Thomas algorithm when the matrix is diagonally dominant (where it is
+    stable without pivoting), pivoted banded LU otherwise.
+    """
+    lower = np.asarray(lower, dtype=float)
+    diag = np.asarray(diag, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+
+    off_diagonal = np.zeros(diag.size)
+    off_diagonal[1:] += np.abs(lower)
+    off_diagonal[:-1] += np.abs(upper)
+
+    if np.all(np.abs(diag) >= off_diagonal) and np.all(diag != 0):
+        return Thomas(lower, diag, upper)
+
+    thomas = Thomas(lower, diag, upper)
+    return BandedLU(bands=thomas.bands, kl=1, ku=1)
@@ -1,16 +1,20 @@
 import warnings
 import numpy as np
-           
 
-class EquationsSystems:
+from numerical_analysis.instrumentation.solver_trace import TracedSolver
+
+
+class EquationsSystems(TracedSolver):
     def __init__(
             self, 
             tol=10**-3, 
-            max_iter=1000
+            max_iter=1000,
+            trace=None,
         ):
         
         self._tol = tol
         self._max_iter = max_iter
+        self._trace = trace
     
     @property
     def tol(self):
@@ -21,13 +25,15 @@ class EquationsSystems:
         return self._max_iter
         
     def _l2_norm(self, xi, x0):
-        return np.sqrt(sum((xi - x0)**2))
+        return np.sqrt(np.sum((xi - x0)**2, axis=0))
     
     def _stopping_condition(self, xi, x0):
         norm = self._l2_norm(xi, x0)
+        self._record_trace(norm)
         return norm > self._tol
     
     def _warning(self, iterations):
+        self._finish_trace(iterations)
         if iterations==self._max_iter:
-            message = f"Algorithm did converge in {self._max_iter} iterations"
+            message = f"Algorithm did not converge in {self._max_iter} iterations"
             warnings.warn(message)
@@ -0,0 +1,95 @@
+import numpy as np
+
+from numerical_analysis.systems_of_equations.sparse_matrix import CSRMatrix
+
+
+def _column_colors(sparsity):
+    # Greedy colouring of the columns: two columns get the same colour only
+    # if no row has nonzeros in both, so all the columns of a colour can be
+    # perturbed together. Banded patterns need kl + ku + 1 colours.
+    if not isinstance(sparsity, CSRMatrix):
+        sparsity = CSRMatrix.from_dense(np.asarray(sparsity, dtype=float))
+
+    rows, columns, _ = sparsity.to_coo()
+    by_column = CSRMatrix.from_coo(columns, rows, np.ones(rows.size), sparsity.shape)
+    n = sparsity.shape[1]
+    row_indptr = sparsity.indptr.tolist()
+    column_indptr = by_column.indptr.tolist()
+    colors = np.full(n, -1)
+
+    for j in range(n):
+        used = set()
+        for i in by_column.indices[column_indptr[j] : column_indptr[j + 1]].tolist():
+            used.update(colors[sparsity.indices[row_indptr[i] : row_indptr[i + 1]]].tolist())
+        color = 0
+        while color in used:
+            color += 1
+        colors[j] = color
+
+    return colors, rows, columns
+
+
+class FiniteDifferenceJacobian:
+    """
+    Forward difference approximation of the Jacobian of F_mat, one column
+    (J[:, j] ~ (F(X + h_j e_j) - F(X)) / h_j) per function evaluation.
+
+    With a sparsity pattern (boolean array or CSRMatrix), columns that don't
+    share a row are perturbed together, so a tridiagonal Jacobian costs 3
+    evaluations whatever its size. With vectorized=True, F_mat takes an
+    (n, m) array of points (one per column) and every perturbed point is
+    evaluated in a single call.
+    """
+
+    def __init__(self, F_mat, sparsity=None, vectorized=False, step=None):
+        self._F_mat = F_mat
+        self._vectorized = vectorized
+        self._step = np.sqrt(np.finfo(float).eps) if step is None else step
+        self._sparsity = sparsity
+
+        if sparsity is not None:
+            self._colors, self._rows, self._columns = _column_colors(sparsity)
+
+    @property
+    def sparsity(self):
+        return self._sparsity
+
+    @property
+    def vectorized(self):
+        return self._vectorized
+
+    @property
+    def step(self):
+        return self._step
+
+    def _perturbations(self, X):
+        h = self._step * np.maximum(np.abs(X), 1)
+        # Exactly representable steps: (X + h) - X == h.
+        h = (X + h) - X
+
+        if self._sparsity is None:
+            return h, np.diag(h)
+
+        return h, np.where(self._colors == np.arange(self._colors.max() + 1)[:, None], h, 0).T
+
+    def __call__(self, X, F=None):
+        X = np.asarray(X, dtype=float)
+        F = self._F_mat(X) if F is None else F
+        h, perturbations = self._perturbations(X)
+
+        if self._vectorized:
+            differences = self._F_mat(X[:, None] + perturbations) - F[:, None]
+        else:
+            differences = np.column_stack(
+                [self._F_mat(X + perturbations[:, c]) - F for c in range(perturbations.shape[1])]
+            )
+
+        if self._sparsity is None:
+            return differences / h
+
+        jacobian = np.zeros((F.size, X.size))
+        jacobian[self._rows, self._columns] = (
+            differences[self._rows, self._colors[self._columns]] / h[self._columns]
+        )
+
+        return jacobian
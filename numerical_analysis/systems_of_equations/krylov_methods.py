@@ -0,0 +1,251 @@
+import numpy as np
+
+from abc import abstractmethod
+
+from numerical_analysis.systems_of_equations.linear_systems import LinearSystems
+
+
+def _dot(x, y):
+    return np.sum(x * y, axis=0)
+
+
+def _norm(x):
+    return np.sqrt(_dot(x, x))
+
+
+class KrylovMethods(LinearSystems):
+    """
+    Krylov subspace solvers. Unlike the stationary methods, they stop when
+    the residual satisfies ||b - A x|| <= tol * ||b||. mat can be a matrix
+    (dense or CSRMatrix) or a callable x -> A x, and preconditioner a
+    Preconditioner or any callable r -> z ~ A^-1 r.
+
+    The iteration state holds (n, k) blocks, one column per right-hand side,
+    and every array in it is indexed by column on its last axis so converged
+    columns can be dropped from all of them at once.
+    """
+
+    def __init__(self, *args, preconditioner=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._preconditioner = preconditioner
+
+    @property
+    def preconditioner(self):
+        return self._preconditioner
+
+    def _precondition(self, r):
+        if self._preconditioner is None:
+            return r.copy()
+
+        if not hasattr(self._preconditioner, "apply"):
+            return np.column_stack(
+                [self._preconditioner(r[:, j]) for j in range(r.shape[1])]
+            )
+
+        return self._preconditioner(r)
+
+    def _residual_condition(self, state):
+        return state["residual_norm"] > self._tol * state["b_norm"]
+
+    def _solution(self, state, columns):
+        return state["x"][:, columns]
+
+    @abstractmethod
+    def initialize(self, x0, b) -> dict:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def iterate(self, state) -> dict:
+        raise NotImplementedError()
+
+    def solve(self, x0):
+        i = 0
+        self._start_trace()
+        x0, b, vector = self._blocks(x0, dtype=float)
+        state = self.initialize(x0, np.asarray(b, dtype=float))
+        solution = np.empty_like(x0)
+        columns = np.arange(x0.shape[1])
+
+        while True:
+            continue_iterate = self._residual_condition(state)
+            if not continue_iterate.all():
+                solution[:, columns[~continue_iterate]] = self._solution(state, ~continue_iterate)
+                columns = columns[continue_iterate]
+                state = {
+                    key: value[..., continue_iterate] if isinstance(value, np.ndarray) else value
+                    for key, value in state.items()
+                }
+
+            if i == self._max_iter or columns.size == 0:
+                break
+
+            state = self.iterate(state)
+            self._record_trace(state["residual_norm"])
+            i += 1
+
+        solution[:, columns] = self._solution(state, np.ones(columns.size, dtype=bool))
+        self._warning(i)
+
+        return solution[:, 0] if vector else solution
+
+
+class ConjugateGradient(KrylovMethods):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, x0, b):
+        r = b - self._matvec(x0)
+        z = self._precondition(r)
+
+        return {
+            "x": x0,
+            "b_norm": _norm(b),
+            "r": r,
+            "p": z,
+            "rz": _dot(r, z),
+            "residual_norm": _norm(r),
+        }
+
+    def iterate(self, state):
+        x, r, p = state["x"], state["r"], state["p"]
+        Ap = self._matvec(p)
+        alpha = state["rz"] / _dot(p, Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        z = self._precondition(r)
+        rz = _dot(r, z)
+        p *= rz / state["rz"]
+        p += z
+
+        state.update(rz=rz, residual_norm=_norm(r))
+        return state
+
+
+class BiCGSTAB(KrylovMethods):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, x0, b):
+        r = b - self._matvec(x0)
+        ones = np.ones(x0.shape[1])
+
+        return {
+            "x": x0,
+            "b_norm": _norm(b),
+            "r": r,
+            "r_hat": r.copy(),
+            "p": np.zeros(x0.shape),
+            "v": np.zeros(x0.shape),
+            "rho": ones,
+            "alpha": ones,
+            "omega": ones,
+            "residual_norm": _norm(r),
+        }
+
+    def iterate(self, state):
+        x, r, r_hat, p, v = state["x"], state["r"], state["r_hat"], state["p"], state["v"]
+
+        rho = _dot(r_hat, r)
+        beta = (rho / state["rho"]) * (state["alpha"] / state["omega"])
+        p -= state["omega"] * v
+        p *= beta
+        p += r
+        p_hat = self._precondition(p)
+        v[:] = self._matvec(p_hat)
+        alpha = rho / _dot(r_hat, v)
+        x += alpha * p_hat
+        r -= alpha * v
+
+        # Columns whose half step already converged skip the stabilizing
+        # step (omega = 0), they leave the block before the next iteration.
+        half_step_converged = _norm(r) <= self._tol * state["b_norm"]
+        s_hat = self._precondition(r)
+        t = self._matvec(s_hat)
+        tt = _dot(t, t)
+        omega = np.divide(
+            _dot(t, r), tt, out=np.zeros_like(tt), where=(tt > 0) & ~half_step_converged
+        )
+        x += omega * s_hat
+        r -= omega * t
+
+        state.update(rho=rho, alpha=alpha, omega=omega, residual_norm=_norm(r))
+        return state
+
+
+class GMRES(KrylovMethods):
+    """
+    Right-preconditioned GMRES restarted every `restart` iterations. Each
+    iteration adds one Arnoldi vector; the least squares problem is kept
+    triangular with Givens rotations so its residual is known at every step.
+    """
+
+    def __init__(self, *args, restart=30, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._restart = min(restart, self._n)
+
+    @property
+    def restart(self):
+        return self._restart
+
+    def initialize(self, x0, b):
+        m, k = self._restart, x0.shape[1]
+        state = {
+            "x": x0,
+            "b": b,
+            "b_norm": _norm(b),
+            "V": np.zeros((m + 1, self._n, k)),
+            "Z": np.zeros((m, self._n, k)),
+            "H": np.zeros((m + 1, m, k)),
+            "cs": np.zeros((m, k)),
+            "sn": np.zeros((m, k)),
+            "g": np.zeros((m + 1, k)),
+        }
+
+        return self._restart_cycle(state)
+
+    def _restart_cycle(self, state):
+        r = state["b"] - self._matvec(state["x"])
+        beta = _norm(r)
+        np.divide(r, beta, out=state["V"][0], where=beta > 0)
+        state["g"][:] = 0
+        state["g"][0] = beta
+        state.update(j=0, residual_norm=beta)
+
+        return state
+
+    def _solution(self, state, columns):
+        j, H, g = state["j"], state["H"][..., columns], state["g"][..., columns]
+        y = np.zeros((j, H.shape[-1]))
+        for i in range(j - 1, -1, -1):
+            y[i] = (g[i] - np.sum(H[i, (i + 1) : j] * y[(i + 1) :], axis=0)) / H[i, i]
+
+        return state["x"][:, columns] + np.einsum("jnk,jk->nk", state["Z"][:j, :, columns], y)
+
+    def iterate(self, state):
+        j, V, H, cs, sn, g = state["j"], state["V"], state["H"], state["cs"], state["sn"], state["g"]
+
+        state["Z"][j] = self._precondition(V[j])
+        w = self._matvec(state["Z"][j])
+        for i in range(j + 1):
+            H[i, j] = _dot(w, V[i])
+            w -= H[i, j] * V[i]
+        H[j + 1, j] = _norm(w)
+        np.divide(w, H[j + 1, j], out=V[j + 1], where=H[j + 1, j] > 0)
+
+        for i in range(j):
+            H[i, j], H[i + 1, j] = (
+                cs[i] * H[i, j] + sn[i] * H[i + 1, j],
+                -sn[i] * H[i, j] + cs[i] * H[i + 1, j],
+            )
+        denominator = np.hypot(H[j, j], H[j + 1, j])
+        cs[j], sn[j] = H[j, j] / denominator, H[j + 1, j] / denominator
+        H[j, j], H[j + 1, j] = denominator, 0.0
+        g[j], g[j + 1] = cs[j] * g[j], -sn[j] * g[j]
+
+        state.update(j=j + 1, residual_norm=np.abs(g[j + 1]))
+
+        if state["j"] == self._restart:
+            state["x"] = self._solution(state, np.ones(state["x"].shape[1], dtype=bool))
+            self._restart_cycle(state)
+
+        return state
@@ -3,6 +3,14 @@ import sys
 
 from abc import abstractmethod
 from numerical_analysis.systems_of_equations.equations_system import EquationsSystems
+from numerical_analysis.systems_of_equations.sparse_matrix import CSRMatrix
+
+
+def _columns(v, x):
+    # Reshape a per-row vector so it broadcasts against x, a vector or an
+    # (n, k) block of right-hand sides.
+    return v.reshape(v.shape + (1,) * (np.ndim(x) - 1))
+
 
 class LinearSystems(EquationsSystems):
     def __init__(
@@ -16,10 +24,15 @@ class LinearSystems(EquationsSystems):
 
         self._mat = mat
         self._b = b
-        self._n = self._mat.shape[0]
-        
-        if mat.shape[0] != mat.shape[1]:
-            sys.exit("The matrix is not squared")
+
+        # A callable mat is a matrix-free operator x -> A x.
+        if callable(mat):
+            self._n = np.shape(b)[0]
+        else:
+            self._n = self._mat.shape[0]
+
+            if mat.shape[0] != mat.shape[1]:
+                sys.exit("The matrix is not squared")
     
     @property
     def mat(self):
@@ -37,62 +50,232 @@ class LinearSystems(EquationsSystems):
     def max_iter(self):
         return self._max_iter
     
+    def _matvec(self, x):
+        if self._trace is not None:
+            self._trace.count("matvec", np.shape(x)[1] if np.ndim(x) == 2 else 1)
+
+        # Matrix-free operators are applied column by column to blocks.
+        if callable(self._mat):
+            if np.ndim(x) == 1:
+                return np.asarray(self._mat(x), dtype=float)
+            return np.column_stack([self._mat(x[:, j]) for j in range(x.shape[1])])
+
+        return self._mat.dot(x)
+
+    def _blocks(self, x0, dtype=None):
+        # b and x0 are vectors or (n, k) blocks with one column per system;
+        # a vector is broadcast over the columns of the other.
+        x0 = np.asarray(x0, dtype=dtype)
+        b = np.asarray(self._b)
+        k = max(x0.shape[1:] + b.shape[1:] + (1,))
+
+        X = np.array(np.broadcast_to(x0.reshape(self._n, -1), (self._n, k)))
+        B = np.broadcast_to(b.reshape(self._n, -1), (self._n, k))
+
+        return X, B, x0.ndim == 1 and b.ndim == 1
+
     @abstractmethod
-    def iterate(self, x0, xi):
+    def iterate(self, x0, xi, b=None):
         raise NotImplementedError()
     
     def solve(self, x0):
         i = 0
-        continue_iterate = True
+        self._start_trace()
+        # All the right-hand sides are iterated together as an (n, k) block;
+        # a column leaves the block as soon as it meets the stopping condition.
+        # The two work buffers are swapped between iterations, the caller's x0
+        # is never written.
+        x0, b, vector = self._blocks(x0, dtype=float)
         xi = x0.copy()
-        while i < self._max_iter and continue_iterate:
-            xi = self.iterate(x0, xi)
+        solution = np.empty_like(x0)
+        columns = np.arange(x0.shape[1])
+        while i < self._max_iter and columns.size:
+            xi = self.iterate(x0, xi, b)
             continue_iterate = self._stopping_condition(xi, x0)
             i += 1
-            x0 = xi.copy()
-        
+            x0, xi = xi, x0
+
+            if not continue_iterate.all():
+                solution[:, columns[~continue_iterate]] = x0[:, ~continue_iterate]
+                columns = columns[continue_iterate]
+                x0, xi, b = x0[:, continue_iterate], xi[:, continue_iterate], b[:, continue_iterate]
+
+        solution[:, columns] = x0
         self._warning(i)
-        
-        return xi
+
+        return solution[:, 0] if vector else solution
 
 class Jacobi(LinearSystems):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        
-    def iterate(self, x0, xi):
-        for i in range(self._n):
-            xi[i] = 1/self._mat[i,i] * (
-                sum(np.delete((x0 * - self._mat[i,]), i)) + self._b[i]
-            )
-                
+        self._omega = 1
+        diag = self._mat.diagonal()
+        self._inverse_diag = 1 / diag
+
+        if isinstance(self._mat, CSRMatrix):
+            self._off_diag = self._mat.off_diagonal()
+        else:
+            self._off_diag = self._mat - np.diag(diag)
+
+    @property
+    def inverse_diag(self):
+        return self._inverse_diag
+
+    def iterate(self, x0, xi, b=None):
+        b = self._b if b is None else b
+        if isinstance(self._off_diag, CSRMatrix):
+            self._off_diag.dot(x0, out=xi)
+        else:
+            np.matmul(self._off_diag, x0, out=xi)
+        np.subtract(b, xi, out=xi)
+        np.multiply(_columns(self._inverse_diag, xi), xi, out=xi)
+
+        if self._omega != 1:
+            xi -= x0
+            xi *= self._omega
+            xi += x0
+
         return xi
-    
 
-class SOR(LinearSystems):
+
+class WeightedJacobi(Jacobi):
     def __init__(self, omega, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._omega = omega
 
+        if (omega <= 0) | (omega > 1):
+            sys.exit("Omega should be between 0 and 1")
+
+    @property
+    def omega(self):
+        return self._omega
+
+
+class SOR(LinearSystems):
+    def __init__(self, omega, *args, ordering="natural", **kwargs):
+        super().__init__(*args, **kwargs)
+        self._omega = omega
+        self._ordering = ordering
+
         if (omega < 0) | (omega > 2):
             sys.exit("Omega should be between 0 and 2")
 
+        if ordering not in ("natural", "symmetric", "multicolor"):
+            sys.exit("The ordering should be 'natural', 'symmetric' or 'multicolor'")
+
+        self._inverse_diag = 1 / self._mat.diagonal()
+
+        if isinstance(self._mat, CSRMatrix):
+            self._off_diag = self._mat.off_diagonal()
+        elif ordering == "multicolor":
+            self._off_diag = CSRMatrix.from_dense(self._mat).off_diagonal()
+        else:
+            self._lower = np.tril(self._mat, -1)
+            self._upper = np.triu(self._mat, 1)
+
+        if ordering == "multicolor":
+            self._colors = self._color_classes()
+
     @property
     def omega(self):
         return self._omega
-    
-    def iterate(self, x0, xi):
+
+    @property
+    def ordering(self):
+        return self._ordering
+
+    def iterate(self, x0, xi, b=None):
+        b = self._b if b is None else b
+
+        if self._ordering == "multicolor":
+            return self._multicolor_iterate(x0, xi, b)
+
+        if isinstance(self._mat, CSRMatrix):
+            xi[:] = x0
+            self._sparse_sweep(xi, b, range(self._n))
+            if self._ordering == "symmetric":
+                self._sparse_sweep(xi, b, range(self._n - 1, -1, -1))
+
+            return xi
+
+        upper_x0 = self._upper.dot(x0)
         for i in range(self._n):
-            xi[i] = (1-self._omega) * x0[i] + (self._omega/self._mat[i,i]) * (
-                -sum((xi * self._mat[i,])[:i]) -sum((x0 * self._mat[i,])[(i+1):]) 
-                + self._b[i]
+            xi[i] = (1 - self._omega) * x0[i] + self._omega * self._inverse_diag[i] * (
+                b[i] - self._lower[i, :i].dot(xi[:i]) - upper_x0[i]
             )
-        
+
+        if self._ordering == "symmetric":
+            lower_xi = self._lower.dot(xi)
+            for i in range(self._n - 1, -1, -1):
+                xi[i] = (1 - self._omega) * xi[i] + self._omega * self._inverse_diag[i] * (
+                    b[i] - lower_xi[i] - self._upper[i, (i + 1) :].dot(xi[(i + 1) :])
+                )
+
+        return xi
+
+    def _sparse_sweep(self, xi, b, rows):
+        # In place over a single vector: the rows already visited hold the
+        # new iterate, the others the previous one.
+        data, indices = self._off_diag.data, self._off_diag.indices
+        indptr = self._off_diag.indptr.tolist()
+        for i in rows:
+            start, end = indptr[i], indptr[i + 1]
+            xi[i] = (1 - self._omega) * xi[i] + self._omega * self._inverse_diag[i] * (
+                b[i] - data[start:end].dot(xi[indices[start:end]])
+            )
+
+    def _multicolor_iterate(self, x0, xi, b):
+        xi[:] = x0
+        for rows, off_diag in self._colors:
+            inverse_diag = _columns(self._inverse_diag[rows], xi)
+            xi[rows] = (1 - self._omega) * xi[rows] + self._omega * inverse_diag * (
+                b[rows] - off_diag.dot(xi)
+            )
+
         return xi
 
+    def _color_classes(self):
+        # Greedy colouring of the matrix graph: unknowns of the same colour
+        # don't appear in each other's equations, so a whole colour class is
+        # updated at once. Stencil matrices give the red-black ordering.
+        rows, columns, values = self._off_diag.to_coo()
+        neighbours = CSRMatrix.from_coo(
+            np.concatenate([rows, columns]),
+            np.concatenate([columns, rows]),
+            np.ones(2 * rows.size),
+            self._mat.shape,
+        )
+        indptr = neighbours.indptr.tolist()
+        colors = np.full(self._n, -1)
+
+        for i in range(self._n):
+            used = set(colors[neighbours.indices[indptr[i] : indptr[i + 1]]].tolist())
+            color = 0
+            while color in used:
+                color += 1
+            colors[i] = color
+
+        local_index = np.empty(self._n, dtype=np.intp)
+        color_classes = []
+        for color in range(colors.max() + 1):
+            class_rows = np.flatnonzero(colors == color)
+            local_index[class_rows] = np.arange(class_rows.size)
+            in_class = colors[rows] == color
+            off_diag = CSRMatrix.from_coo(
+                local_index[rows[in_class]],
+                columns[in_class],
+                values[in_class],
+                (class_rows.size, self._n),
+            )
+            color_classes.append((class_rows, off_diag))
+
+        return color_classes
+
+
 class GaussSeidel(LinearSystems):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, ordering="natural", **kwargs):
         super().__init__(*args, **kwargs)
-        self._sor = SOR(mat=self._mat, b=self._b, omega=1)
+        self._sor = SOR(mat=self._mat, b=self._b, omega=1, ordering=ordering)
     
-    def iterate(self, x0, xi):    
-        return self._sor.iterate(x0, xi)    
+    def iterate(self, x0, xi, b=None):
+        return self._sor.iterate(x0, xi, b)
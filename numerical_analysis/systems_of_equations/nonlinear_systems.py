@@ -1,42 +1,223 @@
+import sys
+import numpy as np
+
 from numerical_analysis.systems_of_equations.linear_systems import GaussSeidel
+from numerical_analysis.systems_of_equations.krylov_methods import GMRES
+from numerical_analysis.systems_of_equations.direct_systems import LU
+from numerical_analysis.systems_of_equations.jacobians import FiniteDifferenceJacobian
 from numerical_analysis.systems_of_equations.equations_system import EquationsSystems
 
 class NonLinearSystems(EquationsSystems):
     def __init__(
-            self, 
+            self,
             F_mat,
-            *args, 
+            *args,
             **kwargs,
         ):
         super().__init__(*args, **kwargs)
-        self._F_mat = F_mat
-        
+        self._F_mat = self._counted("F_mat", F_mat)
+
     @property
     def F_mat(self):
         return self._F_mat
-    
+
 
 
 class Newtons(NonLinearSystems):
-    def __init__(self, jacobian, *args, **kwargs):
-        self._jacobian = jacobian
+    """
+    Newton's method for F(X) = 0, where each step solves J(X) s = -F(X):
+
+    - "direct": LU factorization of the Jacobian at every step.
+    - "inexact": GMRES to the relative tolerance eta_k (Eisenstat-Walker),
+      loose far from the root and tightening as ||F|| decreases, never above
+      forcing_term.
+    - "chord": the Jacobian at the starting point is factorized once and
+      reused for every step.
+    - "shamanskii": the Jacobian is factorized again every reuse_steps steps.
+    - "gauss_seidel": the Gauss-Seidel inner solve.
+    - "broyden_good" / "broyden_bad": the inverse of the first Jacobian is
+      kept and corrected by Broyden's rank one updates, so later steps need
+      no Jacobian at all.
+
+    Without a jacobian, it is approximated by finite differences
+    (FiniteDifferenceJacobian, see its sparsity and vectorized options), and
+    "inexact" becomes matrix free: GMRES only needs J v, approximated by
+    (F(X + h v) - F(X)) / h, one F_mat evaluation per GMRES iteration.
+
+    With line_search, the step is halved (at most max_backtracks times) until
+    ||F|| decreases enough (Armijo condition).
+    """
+
+    def __init__(
+        self,
+        jacobian=None,
+        *args,
+        sparsity=None,
+        vectorized=False,
+        method="direct",
+        reuse_steps=3,
+        forcing_term=0.5,
+        line_search=False,
+        max_backtracks=10,
+        **kwargs
+    ):
         super().__init__(*args, **kwargs)
-    
+        self._finite_differences = jacobian is None
+        if self._finite_differences:
+            jacobian = FiniteDifferenceJacobian(
+                self._F_mat, sparsity=sparsity, vectorized=vectorized
+            )
+        self._jacobian = self._counted("jacobian", jacobian)
+        self._method = method
+        self._reuse_steps = reuse_steps
+        self._forcing_term = forcing_term
+        self._line_search = line_search
+        self._max_backtracks = max_backtracks
+
+        if method not in (
+            "direct", "inexact", "chord", "shamanskii", "gauss_seidel", "broyden_good", "broyden_bad"
+        ):
+            sys.exit(
+                "The method should be 'direct', 'inexact', 'chord', 'shamanskii', "
+                "'gauss_seidel', 'broyden_good' or 'broyden_bad'"
+            )
+
     @property
     def jacobian(self):
         return self._jacobian
 
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def line_search(self):
+        return self._line_search
+
+    def _jacobian_at(self, X, F):
+        # The finite differences reuse F(X) instead of evaluating it again.
+        if self._finite_differences:
+            return self._jacobian(X, F)
+
+        return self._jacobian(X)
+
+    def _directional_derivative(self, X, F):
+        def _jacobian_dot(v):
+            v_norm = np.linalg.norm(v)
+            if v_norm == 0:
+                return np.zeros(F.shape)
+            h = np.sqrt(np.finfo(float).eps) * (1 + np.linalg.norm(X)) / v_norm
+
+            return (self._F_mat(X + h * v) - F) / h
+
+        return _jacobian_dot
+
+    def _step(self, X, F, i):
+        if self._method == "gauss_seidel":
+            return GaussSeidel(self._jacobian_at(X, F), -F).solve(X)
+
+        if self._method == "inexact":
+            mat = (
+                self._directional_derivative(X, F)
+                if self._finite_differences
+                else self._jacobian_at(X, F)
+            )
+            return GMRES(mat, -F, tol=self._eta(F)).solve(np.zeros(F.shape))
+
+        if self._method in ("broyden_good", "broyden_bad"):
+            if self._inverse_jacobian is None:
+                self._inverse_jacobian = LU(self._jacobian_at(X, F)).solve(np.eye(F.size))
+
+            return -self._inverse_jacobian.dot(F)
+
+        if (
+            self._method == "direct"
+            or self._factorization is None
+            or self._method == "shamanskii" and i % self._reuse_steps == 0
+        ):
+            self._factorization = LU(self._jacobian_at(X, F))
+
+        return self._factorization.solve(-F)
+
+    def _eta(self, F):
+        # Eisenstat-Walker choice 2, with their safeguard against the forcing
+        # term dropping too fast, and Kelley's against oversolving once ||F||
+        # is near the tolerance (where the finite difference J v is noise).
+        F_norm = np.linalg.norm(F)
+        if self._previous_F_norm is None:
+            eta = self._forcing_term
+        else:
+            eta = 0.9 * (F_norm / self._previous_F_norm) ** 2
+            if 0.9 * self._eta_k**2 > 0.1:
+                eta = max(eta, 0.9 * self._eta_k**2)
+            if F_norm > 0:
+                eta = max(eta, 0.5 * self._tol / F_norm)
+
+        self._eta_k = min(eta, self._forcing_term)
+        self._previous_F_norm = F_norm
+
+        return self._eta_k
+
+    def _broyden_update(self, s, y):
+        # Sherman-Morrison form of the updates of the Jacobian B, applied to
+        # H = B^-1: "good" updates B += (y - B s) s^T / s^T s, "bad" updates
+        # H += (s - H y) y^T / y^T y directly.
+        H = self._inverse_jacobian
+        correction = s - H.dot(y)
+
+        if self._method == "broyden_good":
+            sH = s.dot(H)
+            denominator = sH.dot(y)
+            if denominator != 0:
+                H += np.outer(correction, sH) / denominator
+        else:
+            denominator = y.dot(y)
+            if denominator != 0:
+                H += np.outer(correction, y) / denominator
+
+    def _update(self, X, step, F):
+        Xi = X + step
+        Fi = self._F_mat(Xi)
+
+        if self._line_search:
+            # Steps already below tol are left alone: there ||F|| is at
+            # rounding level and can't be expected to decrease.
+            F_norm = np.linalg.norm(F)
+            step_norm = np.linalg.norm(step)
+            damping = 1.0
+            backtracks = 0
+            while (
+                np.linalg.norm(Fi) > (1 - 10**-4 * damping) * F_norm
+                and damping * step_norm > self._tol
+                and backtracks < self._max_backtracks
+            ):
+                damping /= 2
+                Xi = X + damping * step
+                Fi = self._F_mat(Xi)
+                backtracks += 1
+
+        return Xi, Fi
+
     def solve(self, X):
         i = 0
         continue_iterate = True
-        
+        self._start_trace()
+        self._factorization = None
+        self._previous_F_norm = None
+        self._inverse_jacobian = None
+        X = np.asarray(X, dtype=float)
+        F = self._F_mat(X)
+
         while i < self._max_iter and continue_iterate:
-            solution = GaussSeidel(self._jacobian(X), -self._F_mat(X)).solve(X)
-            Xi = solution + X
+            step = self._step(X, F, i)
+            Xi, Fi = self._update(X, step, F)
+            if self._inverse_jacobian is not None:
+                self._broyden_update(Xi - X, Fi - F)
+            F = Fi
             continue_iterate = self._stopping_condition(Xi, X)
             i += 1
-            X = Xi.copy()
-        
+            X = Xi
+
         self._warning(i)
-        
-        return Xi
\ No newline at end of file
+
+        return X
@@ -0,0 +1,103 @@
+import sys
+import numpy as np
+
+from abc import ABC, abstractmethod
+
+from numerical_analysis.systems_of_equations.linear_systems import Jacobi, SOR, _columns
+from numerical_analysis.systems_of_equations.sparse_matrix import CSRMatrix
+
+
+class Preconditioner(ABC):
+    """
+    Approximate inverse of the system matrix: apply(r) returns z ~ A^-1 r.
+    """
+
+    @abstractmethod
+    def apply(self, r):
+        raise NotImplementedError()
+
+    def __call__(self, r):
+        return self.apply(r)
+
+
+class JacobiPreconditioner(Preconditioner):
+    def __init__(self, mat):
+        self._jacobi = Jacobi(mat, b=np.zeros(mat.shape[0]))
+
+    def apply(self, r):
+        return _columns(self._jacobi.inverse_diag, r) * r
+
+
+class SSORPreconditioner(Preconditioner):
+    def __init__(self, mat, omega=1.0):
+        # One symmetric SOR sweep started at zero applies the inverse of the
+        # SSOR splitting matrix, which is symmetric when mat is (so it can be
+        # used with ConjugateGradient).
+        self._sor = SOR(
+            mat=mat, b=np.zeros(mat.shape[0]), omega=omega, ordering="symmetric"
+        )
+
+    @property
+    def omega(self):
+        return self._sor.omega
+
+    def apply(self, r):
+        return self._sor.iterate(np.zeros(r.shape), np.empty(r.shape), b=r)
+
+
+class ILUPreconditioner(Preconditioner):
+    """
+    Incomplete LU factorization without fill-in, ILU(0): L and U keep the
+    sparsity pattern of the matrix.
+    """
+
+    def __init__(self, mat):
+        self._csr = mat if isinstance(mat, CSRMatrix) else CSRMatrix.from_dense(mat)
+        self._factorize()
+
+    def _factorize(self):
+        n = self._csr.shape[0]
+        indices = self._csr.indices.tolist()
+        indptr = self._csr.indptr.tolist()
+        data = self._csr.data.tolist()
+        diag_position = []
+
+        for i in range(n):
+            row = indices[indptr[i] : indptr[i + 1]]
+            if i not in row:
+                sys.exit("ILU(0) needs every diagonal entry in the sparsity pattern")
+            diag_position.append(indptr[i] + row.index(i))
+
+        for i in range(n):
+            position = {indices[p]: p for p in range(indptr[i], indptr[i + 1])}
+            for p in range(indptr[i], diag_position[i]):
+                k = indices[p]
+                if data[diag_position[k]] == 0:
+                    sys.exit("Zero pivot found in the incomplete factorization")
+                data[p] /= data[diag_position[k]]
+                for q in range(diag_position[k] + 1, indptr[k + 1]):
+                    target = position.get(indices[q])
+                    if target is not None:
+                        data[target] -= data[p] * data[q]
+
+        self._data = np.array(data)
+        self._indices = self._csr.indices
+        self._indptr = indptr
+        self._diag_position = diag_position
+
+    def apply(self, r):
+        data, indices, indptr = self._data, self._indices, self._indptr
+        z = np.array(r, dtype=float)
+        n = z.shape[0]
+
+        for i in range(n):
+            start, end = indptr[i], self._diag_position[i]
+            z[i] -= data[start:end].dot(z[indices[start:end]])
+
+        for i in range(n - 1, -1, -1):
+            start, end = self._diag_position[i] + 1, indptr[i + 1]
+            z[i] = (z[i] - data[start:end].dot(z[indices[start:end]])) / data[
+                self._diag_position[i]
+            ]
+
+        return z
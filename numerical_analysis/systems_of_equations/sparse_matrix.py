@@ -0,0 +1,130 @@
+import sys
+import numpy as np
+
+
+class CSRMatrix:
+    """
+    Compressed sparse row matrix: the nonzeros of row i are
+    data[indptr[i]:indptr[i+1]], in the columns indices[indptr[i]:indptr[i+1]].
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self._data = np.asarray(data, dtype=float)
+        self._indices = np.asarray(indices, dtype=np.intp)
+        self._indptr = np.asarray(indptr, dtype=np.intp)
+        self._shape = tuple(shape)
+
+        if self._indptr.size != self._shape[0] + 1:
+            sys.exit("indptr should have one entry per row plus one")
+
+        if self._data.size != self._indices.size:
+            sys.exit("data and indices should have the same size")
+
+        self._rows = np.repeat(np.arange(self._shape[0]), np.diff(self._indptr))
+        self._nonempty_rows = np.diff(self._indptr) > 0
+
+    @classmethod
+    def from_coo(cls, rows, columns, values, shape):
+        rows = np.asarray(rows, dtype=np.intp)
+        columns = np.asarray(columns, dtype=np.intp)
+        values = np.asarray(values, dtype=float)
+
+        # Sort by (row, column) and add up repeated entries.
+        keys, inverse = np.unique(rows * shape[1] + columns, return_inverse=True)
+        data = np.bincount(inverse.ravel(), weights=values, minlength=keys.size)
+        indptr = np.zeros(shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(keys // shape[1], minlength=shape[0]), out=indptr[1:])
+
+        return cls(data=data, indices=keys % shape[1], indptr=indptr, shape=shape)
+
+    @classmethod
+    def from_dense(cls, mat):
+        mat = np.asarray(mat)
+        rows, columns = np.nonzero(mat)
+
+        return cls.from_coo(rows, columns, mat[rows, columns], mat.shape)
+
+    @classmethod
+    def from_diagonals(cls, diagonals, offsets, n):
+        # Same convention as np.diag: the diagonal with offset k has n - |k|
+        # entries, scalars are repeated along the diagonal.
+        rows, columns, values = [], [], []
+        for diagonal, k in zip(diagonals, offsets):
+            row = np.arange(max(0, -k), min(n, n - k))
+            rows.append(row)
+            columns.append(row + k)
+            values.append(np.broadcast_to(np.asarray(diagonal, dtype=float), row.shape))
+
+        return cls.from_coo(
+            np.concatenate(rows), np.concatenate(columns), np.concatenate(values), (n, n)
+        )
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def indices(self):
+        return self._indices
+
+    @property
+    def indptr(self):
+        return self._indptr
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def nnz(self):
+        return self._data.size
+
+    def dot(self, x, out=None):
+        x = np.asarray(x)
+        result_shape = (self._shape[0],) + x.shape[1:]
+
+        if self.nnz == 0:
+            result = np.zeros(result_shape)
+        else:
+            data = self._data.reshape((-1,) + (1,) * (x.ndim - 1))
+            products = data * x[self._indices]
+            starts = self._indptr[:-1]
+            if self._nonempty_rows.all():
+                result = np.add.reduceat(products, starts, axis=0)
+            else:
+                result = np.zeros(result_shape)
+                result[self._nonempty_rows] = np.add.reduceat(
+                    products, starts[self._nonempty_rows], axis=0
+                )
+
+        if out is None:
+            return result
+
+        out[...] = result
+        return out
+
+    def diagonal(self):
+        diag = np.zeros(min(self._shape))
+        on_diagonal = self._rows == self._indices
+        diag[self._rows[on_diagonal]] = self._data[on_diagonal]
+
+        return diag
+
+    def off_diagonal(self):
+        off_diagonal = self._rows != self._indices
+
+        return CSRMatrix.from_coo(
+            self._rows[off_diagonal],
+            self._indices[off_diagonal],
+            self._data[off_diagonal],
+            self._shape,
+        )
+
+    def to_coo(self):
+        return self._rows, self._indices, self._data
+
+    def to_dense(self):
+        mat = np.zeros(self._shape)
+        mat[self._rows, self._indices] = self._data
+
+        return mat
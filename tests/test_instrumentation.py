@@ -0,0 +1,58 @@
+import math
+import pytest
+import numpy as np
+
+from numerical_analysis.instrumentation import SolverTrace, SolverCounters
+from numerical_analysis.solution_of_equations import NewtonRaphson, Secant
+from numerical_analysis.systems_of_equations import Jacobi, GMRES
+
+
+@pytest.fixture
+def inputs():
+    mat = np.array(
+        [[10, -1, 2, 0], [-1, 11, -1, 3], [2, -1, 10, -1], [0, 3, -1, 8]], dtype=float
+    )
+    b = np.array([6, 25, -11, 15])
+    x0 = np.array([0.0, 0.0, 0.0, 0.0])
+
+    return {"mat": mat, "b": b, "x0": x0}
+
+
+def test_linear_systems_trace(inputs):
+    counters = SolverCounters()
+    calls = []
+    trace = SolverTrace(callbacks=[lambda *args: calls.append(args)], counters=counters)
+    Jacobi(inputs["mat"], inputs["b"], trace=trace).solve(inputs["x0"])
+
+    assert trace.converged
+    assert trace.iterations == len(calls) == trace.residuals.size
+    assert trace.residuals[-1] <= 10**-3 < trace.residuals[0]
+    assert np.all(trace.iteration_times >= 0)
+    assert counters.snapshot()["Jacobi"]["iterations"] == trace.iterations
+
+    gmres = GMRES(inputs["mat"], inputs["b"], tol=10**-10, trace=trace)
+    gmres.solve(inputs["x0"])
+
+    assert trace.evaluations["matvec"] > trace.iterations
+    assert counters.snapshot()["GMRES"]["runs"] == 1
+
+
+def test_fix_point_methods_trace():
+    trace = SolverTrace(counters=None)
+    newton = NewtonRaphson(
+        function=lambda x: math.cos(x) - x,
+        derivative=lambda x: -math.sin(x) - 1,
+        trace=trace,
+    )
+    newton.solve(math.pi / 4)
+
+    assert trace.evaluations == {"function": trace.iterations, "derivative": trace.iterations}
+
+    Secant(lambda x: math.cos(x) - x, trace=trace).solve(0.1)
+
+    assert trace.function_evaluations == trace.iterations + 2
+
+
+def test_not_converged_warning():
+    with pytest.warns(UserWarning, match="did not converge"):
+        Secant(lambda x: x**2 + 1, max_iter=5).solve(0.1)
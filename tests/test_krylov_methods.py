@@ -0,0 +1,91 @@
+import pytest
+import numpy as np
+
+from numerical_analysis.systems_of_equations import (
+    ConjugateGradient,
+    GMRES,
+    BiCGSTAB,
+    JacobiPreconditioner,
+    SSORPreconditioner,
+    ILUPreconditioner,
+    CSRMatrix,
+)
+
+
+@pytest.fixture
+def inputs():
+    mat = np.array(
+        [[10, -1, 2, 0], [-1, 11, -1, 3], [2, -1, 10, -1], [0, 3, -1, 8]], dtype=float
+    )
+    b = np.array([6, 25, -11, 15])
+    x0 = np.array([0.0, 0.0, 0.0, 0.0])
+
+    return {"mat": mat, "b": b, "x0": x0}
+
+
+@pytest.fixture
+def convection_diffusion():
+    nx = 10
+    n = nx * nx
+    horizontal = np.tile(np.append(np.repeat(1.0, nx - 1), 0.0), nx)[:-1]
+    mat = CSRMatrix.from_diagonals(
+        [np.repeat(-1.2, n - nx), -1.1 * horizontal, np.repeat(4.0, n), -0.9 * horizontal, np.repeat(-0.8, n - nx)],
+        [-nx, -1, 0, 1, nx],
+        n,
+    )
+    b = np.linspace(-1, 1, n)
+
+    return {"mat": mat, "b": b, "x0": np.zeros(n)}
+
+
+@pytest.mark.parametrize("solver", [ConjugateGradient, GMRES, BiCGSTAB])
+def test_krylov_methods(inputs, solver):
+    solution = solver(inputs["mat"], inputs["b"], tol=10**-10).solve(inputs["x0"])
+    expected = np.array([1.0, 2.0, -1.0, 1.0])
+
+    assert np.allclose(solution, expected)
+
+
+def test_conjugate_gradient_matrix_free(inputs):
+    mat = inputs["mat"]
+    solution = ConjugateGradient(
+        lambda x: mat.dot(x),
+        inputs["b"],
+        preconditioner=SSORPreconditioner(mat, omega=1.2),
+        tol=10**-10,
+    ).solve(inputs["x0"])
+
+    assert np.allclose(solution, np.array([1.0, 2.0, -1.0, 1.0]))
+
+
+@pytest.mark.parametrize("preconditioner", [JacobiPreconditioner, SSORPreconditioner, ILUPreconditioner])
+@pytest.mark.parametrize("solver", [GMRES, BiCGSTAB])
+def test_preconditioned_krylov_methods(convection_diffusion, solver, preconditioner):
+    mat = convection_diffusion["mat"]
+    solution = solver(
+        mat, convection_diffusion["b"], preconditioner=preconditioner(mat), tol=10**-10
+    ).solve(convection_diffusion["x0"])
+    expected = np.linalg.solve(mat.to_dense(), convection_diffusion["b"])
+
+    assert np.allclose(solution, expected)
+
+
+def test_gmres_restart(convection_diffusion):
+    mat = convection_diffusion["mat"]
+    gmres = GMRES(mat, convection_diffusion["b"], restart=5, tol=10**-10)
+    solution = gmres.solve(convection_diffusion["x0"])
+
+    assert np.allclose(mat.dot(solution), convection_diffusion["b"])
+
+
+@pytest.mark.parametrize("solver", [ConjugateGradient, GMRES, BiCGSTAB])
+def test_block_right_hand_sides(convection_diffusion, solver):
+    mat = convection_diffusion["mat"]
+    if solver is ConjugateGradient:
+        mat = CSRMatrix.from_dense((mat.to_dense() + mat.to_dense().T) / 2)
+    b = np.column_stack([convection_diffusion["b"], np.ones(mat.shape[0]), np.zeros(mat.shape[0])])
+    x0 = np.zeros(b.shape)
+    solution = solver(mat, b, preconditioner=ILUPreconditioner(mat), tol=10**-10).solve(x0)
+
+    assert np.allclose(solution, np.linalg.solve(mat.to_dense(), b))
+    assert np.allclose(solution[:, 0], solver(mat, b[:, 0], tol=10**-10).solve(x0[:, 0]))
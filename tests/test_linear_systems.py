@@ -1,7 +1,16 @@
 import pytest
 import numpy as np
 
-from numerical_analysis.systems_of_equations import Jacobi, GaussSeidel, SOR
+from numerical_analysis.systems_of_equations import (
+    Jacobi,
+    WeightedJacobi,
+    GaussSeidel,
+    SOR,
+    Thomas,
+    BandedLU,
+    tridiagonal_solver,
+    CSRMatrix,
+)
 
 
 @pytest.fixture
@@ -34,8 +43,146 @@ def test_gauss_seidel(inputs):
 def test_sor():
     mat = np.array([[4, 3, 0], [3, 4, -1], [0, -1, 4]], dtype=float)
     b = np.array([24, 30, -24])
-    sor = SOR(mat=mat, b=b, omega=1.25)
+    sor = SOR(mat=mat, b=b, omega=1.25, tol=10**-8)
     solution = sor.solve(np.array([1, 1, 1]))
     expected = np.array([3, 4, -5])
 
     assert np.allclose(solution, expected)
+
+
+def test_thomas():
+    mat = np.array([[4, -1, 0, 0], [-1, 4, -1, 0], [0, -1, 4, -1], [0, 0, -1, 3]], dtype=float)
+    b = np.array([2, 4, 6, 8], dtype=float)
+    thomas = Thomas(lower=[-1, -1, -1], diag=[4, 4, 4, 3], upper=[-1, -1, -1])
+
+    assert np.allclose(thomas.solve(b), np.linalg.solve(mat, b))
+    assert np.allclose(thomas.dot(b), mat.dot(b))
+
+
+def test_banded_lu():
+    mat = np.array(
+        [[0, 2, 1, 0, 0], [1, 0, 3, 1, 0], [0, 4, 1, 2, 1], [0, 0, 1, 0, 2], [0, 0, 0, 3, 1]],
+        dtype=float,
+    )
+    bands = np.array(
+        [
+            [0, 0, 1, 1, 1],
+            [0, 2, 3, 2, 2],
+            [0, 0, 1, 0, 1],
+            [1, 4, 1, 3, 0],
+        ]
+    )
+    b = np.array([1, 2, 3, 4, 5], dtype=float)
+    banded_lu = BandedLU(bands=bands, kl=1, ku=2)
+
+    assert np.allclose(banded_lu.to_dense(), mat)
+    assert np.allclose(banded_lu.solve(b), np.linalg.solve(mat, b))
+
+
+def test_tridiagonal_solver():
+    solver = tridiagonal_solver(lower=[1, 1], diag=[0, 1, 1], upper=[1, 1])
+
+    assert isinstance(solver, BandedLU)
+    assert np.allclose(solver.solve([1, 2, 3]), [-1, 1, 2])
+
+
+def test_multicolor_sor():
+    mat = np.array([[4, 3, 0], [3, 4, -1], [0, -1, 4]], dtype=float)
+    b = np.array([24, 30, -24])
+    sor = SOR(mat=mat, b=b, omega=1.25, ordering="multicolor", tol=10**-8)
+    solution = sor.solve(np.array([1.0, 1.0, 1.0]))
+
+    assert len(sor._colors) == 2
+    assert np.allclose(solution, np.array([3, 4, -5]))
+
+
+def test_multicolor_gauss_seidel(inputs):
+    gauss_seidel = GaussSeidel(inputs["mat"], inputs["b"], ordering="multicolor", tol=10**-8)
+    solution = gauss_seidel.solve(inputs["x0"])
+
+    assert np.allclose(solution, np.linalg.solve(inputs["mat"], inputs["b"]))
+
+
+def test_weighted_jacobi(inputs):
+    weighted_jacobi = WeightedJacobi(omega=0.8, mat=inputs["mat"], b=inputs["b"], tol=10**-8)
+    solution = weighted_jacobi.solve(inputs["x0"])
+
+    assert np.allclose(solution, np.linalg.solve(inputs["mat"], inputs["b"]))
+    assert np.all(inputs["x0"] == 0)
+
+
+@pytest.fixture
+def laplacian():
+    nx = 6
+    n = nx * nx
+    horizontal = np.tile(np.append(np.repeat(-1.0, nx - 1), 0.0), nx)[:-1]
+    mat = CSRMatrix.from_diagonals(
+        [np.repeat(-1.0, n - nx), horizontal, np.repeat(4.0, n), horizontal, np.repeat(-1.0, n - nx)],
+        [-nx, -1, 0, 1, nx],
+        n,
+    )
+    b = np.ones(n)
+
+    return {"mat": mat, "b": b, "x0": np.zeros(n)}
+
+
+def test_csr_matrix():
+    mat = np.array([[1, 0, 2], [0, 0, 0], [3, 4, 0]], dtype=float)
+    x = np.array([[1, 2], [3, 4], [5, 6]], dtype=float)
+    csr = CSRMatrix.from_dense(mat)
+
+    assert csr.nnz == 4
+    assert np.allclose(csr.to_dense(), mat)
+    assert np.allclose(csr.dot(x), mat.dot(x))
+    assert np.allclose(csr.dot(x[:, 0]), mat.dot(x[:, 0]))
+    assert np.allclose(csr.diagonal(), [1, 0, 0])
+    assert np.allclose(csr.off_diagonal().to_dense(), [[0, 0, 2], [0, 0, 0], [3, 4, 0]])
+
+
+@pytest.mark.parametrize(
+    "solver",
+    [
+        lambda mat, b: Jacobi(mat, b, tol=10**-8),
+        lambda mat, b: GaussSeidel(mat, b, tol=10**-8),
+        lambda mat, b: SOR(mat=mat, b=b, omega=1.3, tol=10**-8),
+        lambda mat, b: SOR(mat=mat, b=b, omega=1.3, ordering="multicolor", tol=10**-8),
+    ],
+)
+def test_sparse_solvers(laplacian, solver):
+    solution = solver(laplacian["mat"], laplacian["b"]).solve(laplacian["x0"])
+    expected = np.linalg.solve(laplacian["mat"].to_dense(), laplacian["b"])
+
+    assert np.allclose(solution, expected, atol=10**-6)
+
+
+@pytest.mark.parametrize("solver", [Jacobi, GaussSeidel])
+def test_integer_initial_guess(inputs, solver):
+    solution = solver(inputs["mat"], inputs["b"], tol=10**-8).solve(np.array([0, 0, 0, 0]))
+
+    assert solution.dtype == float
+    assert np.allclose(solution, np.linalg.solve(inputs["mat"], inputs["b"]))
+
+
+@pytest.mark.parametrize("solver", [Jacobi, GaussSeidel])
+def test_block_right_hand_sides(inputs, solver):
+    b = np.column_stack([inputs["b"], 2 * inputs["b"], np.zeros(4)])
+    solution = solver(inputs["mat"], b, tol=10**-8).solve(inputs["x0"])
+
+    assert solution.shape == (4, 3)
+    assert np.allclose(solution, np.linalg.solve(inputs["mat"], b))
+
+
+def test_banded_wider_than_matrix():
+    # kl and ku beyond n - 1: the extra bands are empty.
+    mat = np.array([[4, 1, 2], [1, 5, 1], [2, 1, 6]], dtype=float)
+    kl = ku = 4
+    bands = np.zeros((kl + ku + 1, 3))
+    for i in range(3):
+        for j in range(3):
+            bands[ku + i - j, j] = mat[i, j]
+    banded_lu = BandedLU(bands=bands, kl=kl, ku=ku)
+    x = np.array([1.0, -2.0, 3.0])
+
+    assert np.allclose(banded_lu.dot(x), mat @ x)
+    assert np.allclose(banded_lu.to_dense(), mat)
+    assert np.allclose(banded_lu.solve(mat @ x), x)
@@ -2,7 +2,8 @@ import math
 import pytest
 import numpy as np
 
-from numerical_analysis.systems_of_equations import Newtons
+from numerical_analysis.systems_of_equations import Newtons, FiniteDifferenceJacobian
+from numerical_analysis.instrumentation import SolverTrace
 
 
 @pytest.fixture
@@ -52,3 +53,87 @@ def test_newtons(inputs):
     expected = np.array([0.5000, -0.00, -0.5236])
 
     assert np.allclose(solution.round(4), expected)
+
+
+@pytest.mark.parametrize("method", ["direct", "inexact", "chord", "shamanskii", "gauss_seidel"])
+@pytest.mark.parametrize("line_search", [False, True])
+def test_newtons_methods(inputs, method, line_search):
+    newtons = Newtons(
+        F_mat=inputs["F_mat"],
+        jacobian=inputs["J"],
+        method=method,
+        line_search=line_search,
+        tol=10**-8,
+    )
+    solution = newtons.solve(inputs["X"])
+    expected = np.array([0.5000, -0.00, -0.5236])
+
+    assert np.allclose(solution.round(4), expected)
+
+
+@pytest.mark.parametrize(
+    "method", ["direct", "inexact", "chord", "broyden_good", "broyden_bad"]
+)
+def test_newtons_without_jacobian(inputs, method):
+    newtons = Newtons(F_mat=inputs["F_mat"], method=method, tol=10**-8)
+    solution = newtons.solve(inputs["X"])
+    expected = np.array([0.5000, -0.00, -0.5236])
+
+    assert np.allclose(solution.round(4), expected)
+
+
+@pytest.fixture
+def tridiagonal_system():
+    # Discretized u'' = 0.1 exp(u) - 0.01, F accepts one point or an (n, m)
+    # block of points.
+    n = 20
+
+    def F_mat(U):
+        padded = np.pad(U, [(1, 1)] + [(0, 0)] * (U.ndim - 1))
+        return (
+            2 * padded[1:-1] - padded[:-2] - padded[2:] + 0.1 * np.exp(padded[1:-1]) - 0.01
+        )
+
+    def jacobian(U):
+        return 2 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1) + np.diag(0.1 * np.exp(U))
+
+    sparsity = np.abs(np.subtract.outer(np.arange(n), np.arange(n))) <= 1
+
+    return {"F_mat": F_mat, "J": jacobian, "sparsity": sparsity, "n": n}
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_finite_difference_jacobian(tridiagonal_system, sparse, vectorized):
+    calls = []
+
+    def F_mat(U):
+        calls.append(U.shape)
+        return tridiagonal_system["F_mat"](U)
+
+    n = tridiagonal_system["n"]
+    jacobian = FiniteDifferenceJacobian(
+        F_mat,
+        sparsity=tridiagonal_system["sparsity"] if sparse else None,
+        vectorized=vectorized,
+    )
+    U = np.linspace(0, 1, n)
+    F = F_mat(U)
+    calls.clear()
+
+    assert np.allclose(jacobian(U, F), tridiagonal_system["J"](U), atol=10**-6)
+    assert len(calls) == (1 if vectorized else 3 if sparse else n)
+
+
+def test_newtons_sparse_finite_differences(tridiagonal_system):
+    trace = SolverTrace(counters=None)
+    newtons = Newtons(
+        F_mat=tridiagonal_system["F_mat"],
+        sparsity=tridiagonal_system["sparsity"],
+        tol=10**-10,
+        trace=trace,
+    )
+    solution = newtons.solve(np.zeros(tridiagonal_system["n"]))
+
+    assert np.allclose(tridiagonal_system["F_mat"](solution), 0)
+    assert trace.evaluations["F_mat"] == 4 * trace.iterations + 1
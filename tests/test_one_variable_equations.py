@@ -1,7 +1,19 @@
 import pytest
 import math
+import numpy as np
 
-from numerical_analysis.solution_of_equations import NewtonRaphson, Secant
+from numerical_analysis.instrumentation import SolverTrace
+from numerical_analysis.solution_of_equations import (
+    NewtonRaphson,
+    Secant,
+    Bisection,
+    Illinois,
+    Ridder,
+    Brent,
+    Halley,
+    Steffensen,
+    Aitken,
+)
 
 
 def func(x):
@@ -24,3 +36,161 @@ def test_secant():
     solution = secant.solve(0.1)
 
     assert round(solution, 5) == 0.73909
+
+
+@pytest.mark.parametrize("method", ["newton_raphson", "secant"])
+def test_batch_solve(method):
+    # x^3 = a for a whole grid of a, a solved alongside its own x.
+    a = np.linspace(1, 100, 1000).reshape(10, 100)
+
+    def func(x, a):
+        return x**3 - a
+
+    def derivative_func(x, a):
+        return 3 * x**2
+
+    if method == "newton_raphson":
+        solver = NewtonRaphson(function=func, derivative=derivative_func, tol=10**-10)
+    else:
+        solver = Secant(func, tol=10**-10)
+    solution = solver.solve(np.ones(a.shape), a)
+
+    assert solution.shape == a.shape
+    assert np.allclose(solution, np.cbrt(a))
+
+
+@pytest.mark.parametrize("method", [Bisection, Illinois, Ridder, Brent])
+def test_bracketing_methods(method):
+    solution = method(func, tol=10**-8).solve(0, 2)
+
+    assert round(solution, 5) == 0.73909
+
+
+@pytest.mark.parametrize("method", [Bisection, Illinois, Ridder, Brent])
+def test_bracketing_methods_multiple_root(method):
+    # Secant steps crawl towards a root of multiplicity 9, the bracketing
+    # methods stay within a small multiple of the bisection iterations.
+    trace = SolverTrace(counters=None)
+    solution = method(lambda x: x**9, tol=10**-10, trace=trace).solve(-1, 0.5)
+
+    assert abs(solution) < 10**-10
+    assert trace.iterations < 4 * math.log2(1.5 / 10**-10)
+
+
+@pytest.mark.parametrize("method", [Bisection, Illinois, Ridder, Brent])
+def test_bracketing_methods_batch(method):
+    a = np.linspace(1, 100, 1000)
+    solution = method(lambda x, a: x**3 - a, tol=10**-10).solve(0, 10, a)
+
+    assert np.allclose(solution, np.cbrt(a))
+
+
+def test_secant_from_zero():
+    solution = Secant(func).solve(0)
+
+    assert round(solution, 5) == 0.73909
+
+
+def test_halley():
+    halley = Halley(
+        function=func,
+        derivative=derivative_func,
+        second_derivative=lambda x: -math.cos(x),
+    )
+    solution = halley.solve(math.pi / 4)
+
+    assert round(solution, 5) == 0.73909
+
+
+def test_steffensen():
+    steffensen = Steffensen(func)
+    solution = steffensen.solve(math.pi / 4)
+
+    assert round(solution, 5) == 0.73909
+
+
+@pytest.mark.parametrize(
+    "method", [math.cos, Secant(func), NewtonRaphson(function=func, derivative=derivative_func)]
+)
+def test_aitken(method):
+    trace = SolverTrace(counters=None)
+    aitken = Aitken(method, tol=10**-10, trace=trace)
+    solution = aitken.solve(1.0)
+
+    assert round(solution, 5) == 0.73909
+    # x = cos(x) converges linearly, in about 60 iterations to 10^-10.
+    assert trace.iterations <= 5
+
+
+@pytest.mark.parametrize("method", ["halley", "steffensen", "aitken"])
+def test_higher_order_batch(method):
+    a = np.linspace(1, 100, 1000)
+
+    def func(x, a):
+        return x**3 - a
+
+    if method == "halley":
+        solver = Halley(
+            lambda x, a: 3 * x**2, lambda x, a: 6 * x, func, tol=10**-10
+        )
+    elif method == "steffensen":
+        solver = Steffensen(lambda x, a: x**3 / a - 1, tol=10**-10)
+    else:
+        solver = Aitken(lambda x, a: x - (x**3 - a) / (3 * a ** (2 / 3)), tol=10**-10)
+    solution = solver.solve(0.8 * np.cbrt(a), a)
+
+    assert np.allclose(solution, np.cbrt(a))
+
+
+def test_batch_non_finite_step():
+    # f'(0) = 0: the first element fails, the others still converge.
+    trace = SolverTrace(counters=None)
+    newton = NewtonRaphson(function=lambda x: x**2 - 2, derivative=lambda x: 2 * x, trace=trace)
+    with pytest.warns(UserWarning, match="1 equations"):
+        with np.errstate(divide="ignore"):
+            solution = newton.solve(np.array([0.0, 1.0, 3.0]))
+
+    assert np.isnan(solution[0])
+    assert np.allclose(solution[1:], math.sqrt(2))
+    assert not trace.converged
+
+    with pytest.warns(UserWarning, match="1 equations"):
+        with np.errstate(over="ignore", invalid="ignore"):
+            solution = Secant(lambda x: x**2 - 2).solve(np.array([1e308, 1.0]))
+    assert np.isnan(solution[0]) and np.isclose(solution[1], math.sqrt(2))
+
+
+@pytest.mark.parametrize("method", [Bisection, Illinois, Ridder, Brent])
+def test_bracketing_methods_batch_invalid_bracket(method):
+    # x^3 = -8 has no root in [0, 3]: nan there, the others are solved.
+    a = np.array([1.0, -8.0, 27.0])
+    with pytest.warns(UserWarning, match="1 equations"), pytest.warns(UserWarning, match="1 brackets"):
+        solution = method(lambda x, a: x**3 - a, tol=10**-10).solve(0, np.array([2.0, 3.0, 4.0]), a)
+
+    assert np.isnan(solution[1])
+    assert np.allclose(solution[[0, 2]], [1, 3])
+
+
+def test_aitken_bracketing_method():
+    with pytest.raises(SystemExit):
+        Aitken(Brent(func))
+
+
+def test_secant_flat_secant():
+    # f(-0.05) = f(0.05): the first secant is flat, away from a root.
+    with pytest.warns(UserWarning, match="non-finite step"):
+        assert math.isnan(Secant(lambda x: x**2 - 2).solve(-0.05))
+    with pytest.warns(UserWarning, match="1 equations"):
+        solution = Secant(lambda x: x**2 - 2).solve(np.array([-0.05, 1.0]))
+    assert np.isnan(solution[0]) and np.isclose(solution[1], math.sqrt(2))
+
+
+def test_vanishing_denominator_away_from_root():
+    # Halley on x^3 + 2 at 1: 2 f'^2 = f f'' = 18 with f = 3. Steffensen on
+    # x^2 - 3 at 1: f(x + f) = f(-1) = f(1) = -2, the denominator is 0.
+    halley = Halley(lambda x: 3 * x**2, lambda x: 6 * x, lambda x: x**3 + 2)
+    steffensen = Steffensen(lambda x: x**2 - 3)
+    for solver in (halley, steffensen):
+        with pytest.warns(UserWarning, match="non-finite step"):
+            solution = solver.solve(np.array([1.0, 2.0]))
+        assert np.isnan(solution[0]) and abs(solver.function(solution[1])) < 10**-8
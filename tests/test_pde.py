@@ -51,6 +51,14 @@ def test_ftcs(inputs):
 def test_btcs(inputs):
     btcs = pde.BTCS(pde=inputs["pde"], alpha=inputs["lambda_btcs"], beta=inputs["lambda_btcs"], gamma=inputs["lambda_btcs"])
 
+    result = btcs.solve()
+    expected = np.array([[10.0, 1.0, 10.0], [10.0, 2.0, 10.0], [10.0, 4.0, 10.0]])
+
+    assert np.allclose(result, expected)
+
+def test_btcs_sor(inputs):
+    btcs = pde.BTCS(pde=inputs["pde"], alpha=inputs["lambda_btcs"], beta=inputs["lambda_btcs"], gamma=inputs["lambda_btcs"], solver="sor")
+
     result = btcs.solve()
     expected = np.array([[10.0, 1.0, 10.0], [10.0, 1.99975586, 10.0], [10.0, 3.99975583, 10.0]])
 
@@ -111,15 +119,15 @@ def test_heat_eq_btcs(inputs):
         [
             [
                 0.0,
-                0.00285615,
-                0.005363,
-                0.00733564,
-                0.00855342,
-                0.00899017,
-                0.00848975,
-                0.00729119,
-                0.00523461,
-                0.00293977,
+                0.00289802,
+                0.00551236,
+                0.00758711,
+                0.00891918,
+                0.00937818,
+                0.00891918,
+                0.00758711,
+                0.00551236,
+                0.00289802,
                 0.0,
             ]
         ]
@@ -130,6 +138,14 @@ def test_heat_eq_btcs(inputs):
 def test_crank_nicolson(inputs):
     cn = pde.CrankNicolson(pde=inputs["pde"], alpha=0.5, beta=0.5, gamma=0.5)
 
+    result = cn.solve()
+    expected = np.array([[10.0, 1.0, 10.0], [10.0, 1 / 3, 10.0], [10.0, 1 / 9, 10.0]])
+
+    assert np.allclose(result, expected)
+
+def test_crank_nicolson_sor(inputs):
+    cn = pde.CrankNicolson(pde=inputs["pde"], alpha=0.5, beta=0.5, gamma=0.5, solver="sor")
+
     result = cn.solve()
     expected = np.array([[10.0, 1.0, 10.0], [10.0, 0.33300781, 10.0], [10.0, 0.11121941, 10.0]])
 
@@ -151,15 +167,15 @@ def test_heat_eq_crank_nicolson(inputs):
         [
             [
                 0.0,
-                0.00231826,
-                0.00438468,
-                0.00602165,
-                0.00707747,
-                0.0074481,
-                0.00709388,
-                0.00604495,
-                0.00438122,
-                0.00226464,
+                0.00230512,
+                0.00438461,
+                0.00603489,
+                0.00709444,
+                0.00745954,
+                0.00709444,
+                0.00603489,
+                0.00438461,
+                0.00230512,
                 0.0,
             ]
         ]
@@ -221,4 +237,45 @@ def test_black_scholes_sv_ftcs(inputs):
     sv_ftcs = pde.BlackScholesFTCS(pde=bsm_sv)
     sv_ftcs.solve()
     result = sv_ftcs.index_grid(t=0.5, x=14)
-    assert round(result[0], 2) == 4.51
\ No newline at end of file
+    assert round(result[0], 2) == 4.51
+
+def test_factorization_cache(inputs):
+    pde.FinitDifference.factorization_cache.clear()
+    heat_equation = pde.HeatEquation(
+        alpha=1.0,
+        max_time=1.0,
+        max_x=1.0,
+        dx=0.1,
+        dt=0.01,
+        boundary_conditions=(0, 0),
+        initial_condition=inputs["function"])
+    heat_cn = pde.HeatEquationCN(pde=heat_equation)
+    heat_cn.solve()
+
+    heat_equation._initial_condition = np.vectorize(lambda x: 2 * math.sin(math.pi * x))
+    heat_cn_twice = pde.HeatEquationCN(pde=heat_equation)
+    heat_cn_twice.solve()
+
+    assert not heat_cn.time_dependent
+    assert len(pde.FinitDifference.factorization_cache) == 1
+    assert heat_cn_twice._A_solver is heat_cn._A_solver
+    assert np.allclose(heat_cn_twice.grid, 2 * heat_cn.grid)
+
+
+def test_time_dependent_coefficients(inputs):
+    # A bump at a single time step: every step's matrix is used.
+    heat_equation = pde.HeatEquation(
+        alpha=1.0, max_time=1.0, max_x=1.0, dx=0.1, dt=0.01,
+        boundary_conditions=(0, 0), initial_condition=inputs["function"])
+    lambda_t = lambda x, i: np.repeat(-2.0 if i == 37 else -0.5, x.size)
+    beta_t = lambda x, i: 1 - 2 * lambda_t(x, i)
+    coefficients = {"alpha": lambda_t, "beta": beta_t, "gamma": lambda_t}
+    grids = [
+        pde.BTCS(pde=heat_equation, time_dependent=t, **coefficients).solve()
+        for t in (None, True, False)
+    ]
+
+    assert pde.BTCS(pde=heat_equation, **coefficients).time_dependent is None
+    assert not pde.HeatEquationBTCS(pde=inputs["pde"]).time_dependent
+    assert np.allclose(grids[0], grids[1])
+    assert not np.allclose(grids[0], grids[2])
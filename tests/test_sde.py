@@ -16,14 +16,494 @@ def inputs():
 
 def test_expected_value_euler(inputs):
     gbm_sv = inputs["gbm_sv"]
-    gbm_sv_euler = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000)
+    gbm_sv_euler = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000, seed=0)
     value = gbm_sv_euler.expected_value(call_payoff, K=gbm_sv.K, DF=np.exp(-0.05))
 
     assert value < 1.4 and value > 1.0
 
 def test_expected_value_milstein(inputs):
     gbm_sv = inputs["gbm_sv"]
-    gbm_sv_milstein = sde.MilsteinScheme(sde=gbm_sv, dt = 1/252, number_sim=1000)
+    gbm_sv_milstein = sde.MilsteinScheme(sde=gbm_sv, dt = 1/252, number_sim=1000, seed=0)
     value = gbm_sv_milstein.expected_value(call_payoff, K=gbm_sv.K, DF=np.exp(-0.05))
 
     assert value < 1.4 and value > 1.0
+
+def terminal_call_payoff(paths, K, DF):
+    return np.maximum(paths["terminal"] - K, 0).mean() * DF
+
+def test_stream(inputs):
+    gbm_sv = inputs["gbm_sv"]
+    reducers = {
+        "terminal": sde.TerminalValue(),
+        "max": sde.RunningMax(),
+        "min": sde.RunningMin(),
+        "mean": sde.RunningMean(),
+        "barrier": sde.BarrierHit(12),
+    }
+
+    X = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000, seed=0).solve()
+    gbm_sv_euler = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000, seed=0)
+    chunks = list(gbm_sv_euler.stream(reducers))
+
+    assert len(chunks) == 1
+    assert np.allclose(chunks[0]["terminal"], X[:, -1])
+    assert np.allclose(chunks[0]["max"], X.max(axis=1))
+    assert np.allclose(chunks[0]["min"], X.min(axis=1))
+    assert np.allclose(chunks[0]["mean"], X.mean(axis=1))
+    assert np.array_equal(chunks[0]["barrier"], (X >= 12).any(axis=1))
+
+    sizes = [chunk["terminal"].size for chunk in gbm_sv_euler.stream(reducers, chunk_size=300)]
+
+    assert sizes == [300, 300, 300, 100]
+
+def test_streaming_expected_value(inputs):
+    gbm_sv = inputs["gbm_sv"]
+    gbm_sv_euler = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000, seed=0)
+    value = gbm_sv_euler.expected_value(call_payoff, K=gbm_sv.K, DF=np.exp(-0.05))
+
+    gbm_sv_euler = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000, seed=0)
+    streaming_value = gbm_sv_euler.expected_value(
+        terminal_call_payoff,
+        K=gbm_sv.K,
+        DF=np.exp(-0.05),
+        reducers={"terminal": sde.TerminalValue()},
+    )
+
+    assert gbm_sv_euler.simulations is None
+    assert np.isclose(value, streaming_value)
+
+    chunked_value = gbm_sv_euler.expected_value(
+        terminal_call_payoff,
+        K=gbm_sv.K,
+        DF=np.exp(-0.05),
+        reducers={"terminal": sde.TerminalValue()},
+        chunk_size=250,
+    )
+
+    assert chunked_value < 1.4 and chunked_value > 1.0
+
+def terminal_call(paths, K):
+    return np.maximum(paths["terminal"] - K, 0)
+
+def test_running_moments():
+    samples = np.random.default_rng(0).standard_normal((1000, 2)) + 1e6
+    moments = sde.RunningMoments()
+    for batch in np.array_split(samples, 7):
+        moments.update(batch)
+    merged = sde.RunningMoments().update(samples[:300]).merge(
+        sde.RunningMoments().update(samples[300:])
+    )
+
+    for result in (moments, merged):
+        assert result.count == 1000
+        assert np.allclose(result.mean, samples.mean(axis=0))
+        assert np.allclose(result.variance, samples.var(axis=0, ddof=1))
+        assert np.allclose(result.std_error, np.sqrt(samples.var(axis=0, ddof=1) / 1000))
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_monte_carlo(inputs, executor):
+    gbm_sv = inputs["gbm_sv"]
+    results = []
+    for workers in (1, 3):
+        scheme = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000, seed=42)
+        engine = sde.ParallelMonteCarlo(scheme, chunk_size=300, workers=workers, executor=executor)
+        results.append(engine.run(terminal_call, {"terminal": sde.TerminalValue()}, K=gbm_sv.K))
+
+    assert results[0].count == 1000
+    assert results[0].mean == results[1].mean
+    assert results[0].variance == results[1].variance
+    assert results[0].mean * np.exp(-0.05) < 1.4 and results[0].mean * np.exp(-0.05) > 1.0
+
+def test_brownian_increments(tmp_path):
+    increments = sde.BrownianIncrements(
+        dt=1/252, steps=251, paths=1000, seed=0, memory_budget=8*1000*10
+    )
+    draws = np.array([dW.copy() for dW in increments])
+
+    assert increments.block_steps == 10
+    assert draws.shape == (251, 1000)
+    assert np.allclose(draws, np.random.default_rng(0).standard_normal((251, 1000)) / np.sqrt(252))
+    # Seeded increments replay the same noise on every pass.
+    assert np.array_equal(draws, [dW.copy() for dW in increments])
+
+    filename = str(tmp_path / "increments.npy")
+    stored = sde.BrownianIncrements(dt=1/252, steps=251, paths=1000, seed=0, filename=filename)
+    list(stored)
+
+    assert np.array_equal(np.array(list(sde.BrownianIncrements.from_file(filename, dt=1/252))), draws)
+
+def test_replay_increments(inputs, tmp_path):
+    gbm_sv = inputs["gbm_sv"]
+    increments = sde.BrownianIncrements(
+        dt=1/252, steps=251, paths=1000, seed=0, filename=str(tmp_path / "increments.npy")
+    )
+    euler = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=1000)
+    milstein = sde.MilsteinScheme(sde=gbm_sv, dt = 1/252, number_sim=1000)
+    X_euler = euler.solve(increments=increments)
+    X_milstein = milstein.solve(increments=increments)
+
+    assert np.array_equal(X_euler, euler.solve(increments=increments))
+    # On the same noise, the schemes' paths stay close.
+    assert np.abs(X_euler[:, -1] - X_milstein[:, -1]).mean() < 0.05
+
+    # Increments that don't fit the grid are refused before simulating.
+    for steps, paths in ((250, 1000), (252, 1000), (251, 999)):
+        with pytest.raises(SystemExit):
+            euler.solve(increments=sde.BrownianIncrements(dt=1/252, steps=steps, paths=paths, seed=0))
+
+@pytest.mark.parametrize(
+    "variance_reduction, factor",
+    [(None, 1), ("antithetic", 1.5), ("moment_matching", 1.5), ("control_variate", 4)],
+)
+def test_variance_reduction(inputs, variance_reduction, factor):
+    gbm_sv = inputs["gbm_sv"]
+    reducers = {"terminal": sde.TerminalValue()}
+    control = None
+    if variance_reduction == "control_variate":
+        # GBM with the base volatility, over the 251 steps of the grid.
+        gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+        control = sde.ControlVariate(
+            scheme=sde.EulerMaruyamaScheme(sde=gbm, dt = 1/252, number_sim=4000),
+            payoff=terminal_call,
+            mean=gbm.call_expectation(K=10, t=251/252),
+            reducers=reducers,
+        )
+    gbm_sv_euler = sde.EulerMaruyamaScheme(sde=gbm_sv, dt = 1/252, number_sim=4000, seed=1)
+    estimate = gbm_sv_euler.monte_carlo(
+        terminal_call,
+        reducers,
+        K=gbm_sv.K,
+        variance_reduction=variance_reduction,
+        control=control,
+        chunk_size=1000,
+    )
+    value = estimate.value * np.exp(-0.05)
+
+    assert estimate.paths == 4000
+    assert value < 1.4 and value > 1.0
+    assert estimate.variance_reduction_factor >= factor
+    assert estimate.std_error < 0.03
+
+def test_sobol():
+    points = sde.Sobol(3).points(0, 4)
+    # The centres of the 2^-32 cells of 0, 1/2, 3/4 and 1/4 (Gray code order).
+    assert np.allclose(points[:, 0], [0, 0.5, 0.75, 0.25], atol=1e-9)
+    assert np.allclose(points[:, 1], [0, 0.5, 0.25, 0.75], atol=1e-9)
+    assert np.array_equal(sde.Sobol(3).points(2, 2), points[2:])
+
+    for scramble in (None, "digital_shift", "owen"):
+        points = sde.Sobol(1100, scramble=scramble, seed=0).points(0, 256)
+        # The first 2^m points of a (scrambled) Sobol sequence are in
+        # distinct intervals of size 2^-m in every dimension.
+        assert all(np.unique((points[:, j] * 256).astype(int)).size == 256 for j in range(1024))
+        assert points.min() > 0 and points.max() < 1
+
+@pytest.mark.parametrize("construction", ["brownian_bridge", "pca", "incremental"])
+def test_quasi_random_increments(construction):
+    increments = sde.QuasiRandomIncrements(
+        sde.Sobol(13, scramble="owen", seed=0), dt=0.1, steps=13, paths=4096, construction=construction
+    )
+    W = np.cumsum([dW.copy() for dW in increments], axis=0)
+    t = np.arange(1, 14) * 0.1
+
+    assert np.allclose(np.cov(W), np.minimum.outer(t, t), atol=0.02)
+
+@pytest.mark.parametrize("quasi_random", ["sobol", "halton"])
+def test_quasi_monte_carlo(quasi_random):
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    scheme = sde.EulerMaruyamaScheme(
+        sde=gbm, dt=1/64, number_sim=16*1024, seed=0, quasi_random=quasi_random,
+        scramble="owen" if quasi_random == "sobol" else "digital_shift",
+    )
+    estimate = scheme.monte_carlo(terminal_call, {"terminal": sde.TerminalValue()}, K=10, chunk_size=1024)
+
+    # Randomized QMC estimates of a smooth payoff are far tighter than the
+    # plain ones over the same paths, and close to the (63 step) exact value.
+    assert estimate.variance_reduction_factor > 100
+    assert abs(estimate.value - gbm.call_expectation(K=10, t=63/64)) < 0.02
+
+def test_coupled_paths():
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    increments = sde.BrownianIncrements(dt=1/8, steps=8, paths=100, seed=0)
+    draws = np.array([dW.copy() for dW in increments])
+    reducers = {"terminal": sde.TerminalValue(), "max": sde.RunningMax()}
+    fine, coarse = sde.MilsteinScheme(sde=gbm, dt=1/8, number_sim=100, exact=False).reduce_coupled_paths(
+        100, reducers, increments=increments
+    )
+
+    X = np.full(100, 10.0)
+    for step, dW in enumerate(draws, start=1):
+        X = X + 0.05 * X / 8 + 0.2 * X * dW + 0.5 * 0.2 * 0.2 * X * (dW**2 - 1/8)
+    h_X = np.full(100, 10.0)
+    h_max = h_X.copy()
+    for dW in draws[0::2] + draws[1::2]:
+        h_X = h_X + 0.05 * h_X / 4 + 0.2 * h_X * dW + 0.5 * 0.2 * 0.2 * h_X * (dW**2 - 1/4)
+        h_max = np.maximum(h_max, h_X)
+
+    assert np.allclose(fine["terminal"], X)
+    assert np.allclose(coarse["terminal"], h_X)
+    assert np.allclose(coarse["max"], h_max)
+
+@pytest.mark.parametrize("scheme", [sde.EulerMaruyamaScheme, sde.MilsteinScheme])
+def test_multilevel_monte_carlo(scheme):
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    mlmc = sde.MultilevelMonteCarlo(scheme, gbm, seed=0, exact=False)
+    estimate = mlmc.estimate(terminal_call, {"terminal": sde.TerminalValue()}, 0.005, K=10)
+
+    assert abs(estimate.value - gbm.call_expectation(K=10, t=1)) < 3 * 0.005
+    assert estimate.std_error <= 0.005 / np.sqrt(2) * 1.01
+    assert len(estimate.levels) >= 3
+    # Most of the paths are on the cheap coarse levels.
+    assert estimate.paths_per_level == sorted(estimate.paths_per_level, reverse=True)
+    assert estimate.paths_per_level[0] > 10 * estimate.paths_per_level[-1]
+
+def test_correlated_increments():
+    correlation = [[1, 0.5, 0.2], [0.5, 1, 0.3], [0.2, 0.3, 1]]
+    cholesky = np.linalg.cholesky(correlation)
+    increments = sde.BrownianIncrements(
+        dt=0.01, steps=50, paths=20000, seed=0, dimension=3, cholesky=cholesky,
+        memory_budget=8*20000*3*7,
+    )
+    draws = np.array([dW.copy() for dW in increments])
+
+    assert draws.shape == (50, 20000, 3)
+    assert np.allclose(np.cov(draws.reshape(-1, 3).T) / 0.01, correlation, atol=0.02)
+
+    qmc = sde.QuasiRandomIncrements(
+        sde.Sobol(24, scramble="owen", seed=0), dt=0.01, steps=8, paths=4096,
+        dimension=3, cholesky=cholesky,
+    )
+    draws = np.array([dW.copy() for dW in qmc])
+
+    assert draws.shape == (8, 4096, 3)
+    assert np.allclose(np.cov(draws.reshape(-1, 3).T) / 0.01, correlation, atol=0.02)
+
+@pytest.mark.parametrize("scheme", [sde.EulerMaruyamaScheme, sde.MilsteinScheme])
+def test_multi_asset(scheme):
+    basket = sde.CorrelatedGBM(
+        mu=[0.05, 0.03, 0.01], sigma=[0.2, 0.3, 0.1], X0=[10, 20, 30], T=1,
+        correlation=[[1, 0.5, 0.2], [0.5, 1, 0.3], [0.2, 0.3, 1]],
+    )
+    X = scheme(sde=basket, dt=1/100, number_sim=20000, seed=1).solve()
+
+    assert X.shape == (20000, 100, 3)
+    assert np.allclose(X[:, -1].mean(axis=0), [10, 20, 30] * np.exp(np.array([0.05, 0.03, 0.01]) * 0.99), rtol=0.01)
+    log_returns = np.log(X[:, -1] / X[:, 0])
+    assert np.isclose(np.corrcoef(log_returns.T)[0, 1], 0.5, atol=0.03)
+
+    heston = sde.Heston(mu=0.05, kappa=2, theta=0.04, xi=0.3, rho=-0.7, X0=[100, 0.04], T=1)
+    terminal = next(scheme(sde=heston, dt=1/200, number_sim=20000, seed=2).stream({"terminal": sde.TerminalValue()}))["terminal"]
+
+    assert terminal.shape == (20000, 2)
+    assert np.isclose(terminal[:, 0].mean(), 100 * np.exp(0.05 * 0.995), rtol=0.01)
+    assert np.isclose(terminal[:, 1].mean(), 0.04, rtol=0.05)
+
+def test_adaptive_milstein():
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    increments = sde.BrownianIncrements(dt=1/16, steps=15, paths=5000, seed=0)
+    W = sum(dW.copy() for dW in increments)
+    exact = 10 * np.exp((0.05 - 0.2**2 / 2) * 15/16 + 0.2 * W)
+
+    # Without error control, the steps of the grid: Milstein.
+    milstein = sde.MilsteinScheme(sde=gbm, dt=1/16, number_sim=5000, exact=False).solve(
+        increments=increments
+    )
+    adaptive = sde.AdaptiveMilsteinScheme(sde=gbm, dt=1/16, number_sim=5000, tol=np.inf, exact=False)
+    assert np.allclose(adaptive.solve(increments=increments), milstein)
+    assert adaptive.evaluations == 15 * 5000
+
+    errors, evaluations = [], []
+    for tol in (1e-3, 1e-4):
+        adaptive = sde.AdaptiveMilsteinScheme(
+            sde=gbm, dt=1/16, number_sim=5000, seed=1, tol=tol, exact=False
+        )
+        X = adaptive.solve(increments=increments)
+        errors.append(np.abs(X[:, -1] - exact).mean())
+        evaluations.append(adaptive.evaluations)
+
+    assert errors[1] < errors[0] / 4 and errors[0] < np.abs(milstein[:, -1] - exact).mean()
+    assert evaluations[1] > evaluations[0] > 15 * 5000
+    # The bridge only depends on the increments: replays and workers agree.
+    assert np.array_equal(adaptive.solve(increments=increments), X)
+    means = []
+    for workers in (1, 3):
+        adaptive = sde.AdaptiveMilsteinScheme(
+            sde=gbm, dt=1/16, number_sim=3000, seed=2, tol=1e-3, exact=False
+        )
+        engine = sde.ParallelMonteCarlo(adaptive, chunk_size=1000, workers=workers)
+        means.append(engine.run(terminal_call, {"terminal": sde.TerminalValue()}, K=10).mean)
+    assert means[0] == means[1]
+
+    heston = sde.Heston(mu=0.05, kappa=2, theta=0.04, xi=0.3, rho=-0.7, X0=[100, 0.04], T=1)
+    adaptive = sde.AdaptiveMilsteinScheme(sde=heston, dt=1/16, number_sim=10000, seed=0, tol=1e-3)
+    terminal = next(adaptive.stream({"terminal": sde.TerminalValue()}))["terminal"]
+
+    assert np.isclose(terminal[:, 0].mean(), 100 * np.exp(0.05 * 15/16), rtol=0.01)
+    assert np.isclose(terminal[:, 1].mean(), 0.04, rtol=0.05)
+
+@pytest.mark.parametrize(
+    "scheme, strong_order, weak_order",
+    [
+        (sde.EulerMaruyamaScheme, 0.5, 1),
+        (sde.MilsteinScheme, 1, 1),
+        (sde.DerivativeFreeMilsteinScheme, 1, 1),
+        (sde.RosslerSRKScheme, 1, 1),
+        (sde.PlatenWeakScheme, 1, 2),
+    ],
+)
+def test_convergence_orders(scheme, strong_order, weak_order):
+    gbm = sde.GBM(mu=0.05, sigma=0.5, X0=1, T=1)
+    strong, weak = [], []
+    for steps in (4, 8):
+        increments = sde.BrownianIncrements(dt=1/steps, steps=steps, paths=100000, seed=0)
+        W = sum(dW.copy() for dW in increments)
+        exact = np.exp(0.05 - 0.5**2 / 2 + 0.5 * W)
+        X = scheme(sde=gbm, dt=1/steps, number_sim=100000, exact=False).reduce_paths(
+            100000, {"terminal": sde.TerminalValue()}, increments=increments
+        )["terminal"]
+        strong.append(np.abs(X - exact).mean())
+        # E[X^2] - E[X_T^2] on the same noise, without the sampling error.
+        weak.append(abs((X**2 - exact**2).mean()))
+
+    assert np.log2(strong[0] / strong[1]) > strong_order - 0.25
+    assert np.log2(weak[0] / weak[1]) > weak_order - 0.25
+
+def test_exact_transition(inputs):
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    increments = sde.BrownianIncrements(dt=1/16, steps=15, paths=1000, seed=0)
+    W = np.cumsum([dW.copy() for dW in increments], axis=0).T
+    t = np.arange(1, 16) / 16
+    X = sde.EulerMaruyamaScheme(sde=gbm, dt=1/16, number_sim=1000).solve(increments=increments)
+
+    assert np.allclose(X[:, 1:], 10 * np.exp((0.05 - 0.2**2 / 2) * t + 0.2 * W))
+
+    # Only terminal values: one draw per path, unbiased on the coarsest grid.
+    scheme = sde.EulerMaruyamaScheme(sde=gbm, dt=1/2, number_sim=200000, seed=0)
+    estimate = scheme.monte_carlo(terminal_call, {"terminal": sde.TerminalValue()}, K=10, chunk_size=50000)
+    assert abs(estimate.value - gbm.call_expectation(K=10, t=1/2)) < 3 * estimate.std_error
+
+    observed = sde.MilsteinScheme(sde=gbm, dt=1/4, number_sim=100000, seed=1).observe([0.1, 0.3, 0.75])
+    assert observed.shape == (100000, 3)
+    assert np.allclose(np.log(observed / 10).var(axis=0), 0.2**2 * np.array([0.1, 0.3, 0.75]), rtol=0.02)
+
+    gbm_sv = inputs["gbm_sv"]
+    scheme = sde.EulerMaruyamaScheme(sde=gbm_sv, dt=1/252, number_sim=1000, seed=2)
+    assert not scheme.exact
+    X = sde.EulerMaruyamaScheme(sde=gbm_sv, dt=1/252, number_sim=1000, seed=2).solve()
+    assert np.allclose(scheme.observe([10/252, 100/252]), X[:, [10, 100]])
+
+def test_sequential_monte_carlo():
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    reducers = {"terminal": sde.TerminalValue()}
+    scheme = sde.EulerMaruyamaScheme(sde=gbm, dt=1/2, number_sim=5000, seed=0)
+    estimate = scheme.monte_carlo(terminal_call, reducers, K=10, atol=0.02)
+    low, high = estimate.confidence_interval()
+
+    assert estimate.paths % 5000 == 0 and estimate.paths >= 10000
+    assert estimate.half_width() <= 0.02
+    assert np.isclose(high - low, 2 * 1.959964 * estimate.std_error)
+    assert low < gbm.call_expectation(K=10, t=1/2) < high
+
+    estimate = scheme.monte_carlo(terminal_call, reducers, K=10, rtol=0.01, variance_reduction="antithetic")
+    assert estimate.half_width() <= 0.01 * estimate.value
+
+    with pytest.warns(UserWarning):
+        estimate = scheme.monte_carlo(terminal_call, reducers, K=10, atol=1e-6, max_paths=20000)
+    assert estimate.paths == 20000
+
+    moments = sde.RunningMoments()
+    moments.update(np.random.default_rng(0).normal(size=10000))
+    low, high = moments.confidence_interval(0.99)
+    assert np.isclose(high - low, 2 * 2.575829 * moments.std_error)
+
+def test_greeks():
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    scheme = sde.EulerMaruyamaScheme(sde=gbm, dt=1/20, number_sim=100000, seed=0)
+    t = 19/20
+    d1 = (0.05 + 0.2**2 / 2) * t / (0.2 * math.sqrt(t))
+    d2 = d1 - 0.2 * math.sqrt(t)
+    normal_cdf = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    normal_pdf = lambda x: math.exp(-x**2 / 2) / math.sqrt(2 * math.pi)
+
+    call = scheme.greeks(
+        lambda X, K: np.maximum(X - K, 0),
+        ("X0", "sigma"),
+        K=10,
+        payoff_derivative=lambda X, K: (X > K).astype(float),
+    )
+    assert abs(call["value"].value - gbm.call_expectation(K=10, t=t)) < 0.02
+    assert abs(call["X0"].value - math.exp(0.05 * t) * normal_cdf(d1)) < 0.01
+    assert abs(call["sigma"].value - 10 * math.exp(0.05 * t) * normal_pdf(d1) * math.sqrt(t)) < 0.05
+
+    # Likelihood ratios for the digital, on the same paths.
+    digital = scheme.greeks(lambda X, K: (X > K).astype(float), ("X0", "sigma"), K=10)
+    assert abs(digital["X0"].value - normal_pdf(d2) / (10 * 0.2 * math.sqrt(t))) < 4 * digital["X0"].std_error
+    assert abs(digital["sigma"].value + normal_pdf(d2) * d1 / 0.2) < 4 * digital["sigma"].std_error
+
+def test_exact_path_dependent_reducers():
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    scheme = sde.EulerMaruyamaScheme(sde=gbm, dt=1/50, number_sim=1000, seed=0)
+    reducers = {"max": sde.RunningMax(), "mean": sde.RunningMean(), "hit": sde.BarrierHit(12)}
+    results = next(scheme.stream(reducers))
+
+    assert scheme.exact
+    assert results["max"].shape == (1000,)
+    assert np.all(results["max"] >= results["mean"])
+    # Exact on the grid, with as many steps as the scheme's.
+    X = sde.EulerMaruyamaScheme(sde=gbm, dt=1/50, number_sim=1000, seed=0).solve()
+    assert np.allclose(results["max"], X.max(axis=1))
+    assert np.array_equal(results["hit"], (X >= 12).any(axis=1))
+
+def test_quasi_random_scramble():
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    reducers = {"max": sde.RunningMax()}
+    assert sde.EulerMaruyamaScheme(sde=gbm, dt=1/16, quasi_random="sobol").scramble == "owen"
+    halton = sde.EulerMaruyamaScheme(sde=gbm, dt=1/16, number_sim=256, seed=0, quasi_random="halton")
+    assert halton.scramble == "digital_shift"
+    assert next(halton.stream(reducers))["max"].shape == (256,)
+
+    # Unscrambled chunks take consecutive points, with no error estimate.
+    scheme = sde.EulerMaruyamaScheme(
+        sde=gbm, dt=1/16, number_sim=2048, quasi_random="sobol", scramble=None
+    )
+    chunks = [chunk["max"] for chunk in scheme.stream(reducers, chunk_size=1024)]
+    assert not np.array_equal(chunks[0], chunks[1])
+    # Point 0 (the corner of the cube) is skipped: no outlier path.
+    fresh = sde.EulerMaruyamaScheme(sde=gbm, dt=1/16, number_sim=64, quasi_random="sobol", scramble=None)
+    increments = np.array([dW.copy() for dW in fresh.brownian_increments()])
+    assert np.abs(increments).max() < 5 * math.sqrt(1/16)
+    estimate = scheme.monte_carlo(terminal_call, {"terminal": sde.TerminalValue()}, K=10, chunk_size=1024)
+    assert estimate.paths == 2048 and np.isnan(estimate.std_error)
+    assert abs(estimate.value - gbm.call_expectation(K=10, t=15/16)) < 0.02
+
+def test_greeks_delta_only():
+    # An sde without coefficient derivatives still has a delta: for the
+    # Ornstein-Uhlenbeck dX = -X dt + 0.3 dW, the Euler tangent is (1 - dt)^n.
+    class OrnsteinUhlenbeck(sde.SDE):
+        def b_derivative(self, X, t):
+            return 0
+
+    ou = OrnsteinUhlenbeck(a=lambda X, t: -X, b=lambda X, t: 0.3 + 0 * X, X0=1.0, T=1)
+    scheme = sde.EulerMaruyamaScheme(sde=ou, dt=1/100, number_sim=10000, seed=0)
+    greeks = scheme.greeks(lambda X: X, payoff_derivative=lambda X: np.ones_like(X))
+
+    assert np.isclose(greeks["X0"].value, (1 - 1/100) ** 99)
+
+@pytest.mark.parametrize("exact", [True, False])
+def test_greeks_daily_grid(exact):
+    gbm = sde.GBM(mu=0.05, sigma=0.2, X0=10, T=1)
+    scheme = sde.EulerMaruyamaScheme(sde=gbm, dt=1/252, number_sim=50000, seed=0, exact=exact)
+    t = 251/252
+    d1 = (0.05 + 0.2**2 / 2) * t / (0.2 * math.sqrt(t))
+    d2 = d1 - 0.2 * math.sqrt(t)
+    normal_pdf = lambda x: math.exp(-x**2 / 2) / math.sqrt(2 * math.pi)
+    digital = scheme.greeks(lambda X, K: (X > K).astype(float), ("X0", "sigma"), K=10)
+
+    assert abs(digital["X0"].value - normal_pdf(d2) / (10 * 0.2 * math.sqrt(t))) < 4 * digital["X0"].std_error
+    assert abs(digital["sigma"].value + normal_pdf(d2) * d1 / 0.2) < 4 * digital["sigma"].std_error
+    # The exact transition's scores don't depend on the grid, the Euler
+    # ones' variance grows like 1 / dt.
+    if exact:
+        assert digital["X0"].std_error < 0.002 and digital["sigma"].std_error < 0.03
+    else:
+        assert digital["X0"].std_error > 0.01